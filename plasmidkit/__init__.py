@@ -1,27 +1,43 @@
 from __future__ import annotations
 
+from .annotate.incremental import Edit
+from .annotate.intervals import FeatureIndex
+from .annotate.table import FeatureTable
 from .api import (
     add_registry,
     annotate,
     annotate_and_score,
+    annotate_and_score_many,
+    annotate_incremental,
+    annotate_many,
     export_gff3,
     export_json,
     export_minimal_genbank,
     load_record,
+    reannotate,
     score,
+    score_many,
     set_cache_dir,
     set_offline,
 )
 
 __all__ = [
+    "Edit",
+    "FeatureIndex",
+    "FeatureTable",
     "add_registry",
     "annotate",
     "annotate_and_score",
+    "annotate_and_score_many",
+    "annotate_incremental",
+    "annotate_many",
     "export_gff3",
     "export_json",
     "export_minimal_genbank",
     "load_record",
+    "reannotate",
     "score",
+    "score_many",
     "set_cache_dir",
     "set_offline",
 ]
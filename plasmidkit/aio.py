@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, TypeVar
+
+from Bio.SeqRecord import SeqRecord
+
+from . import api, parallel
+from .annotate.types import Feature
+
+__all__ = ["AsyncAnnotator", "annotate", "score", "annotate_and_score", "get_default_annotator"]
+
+T = TypeVar("T")
+
+_EXECUTOR_KINDS = ("thread", "process")
+
+
+class AsyncAnnotator:
+    """Runs plasmidkit calls on a bounded executor without blocking the event loop.
+
+    At most ``max_concurrency`` calls (default: one per core) run at once;
+    further calls wait their turn without holding an executor slot. With
+    ``executor="thread"`` work shares the process and its loaded databases;
+    Prodigal releases the GIL but motif scanning does not, so CPU-heavy
+    services should use ``executor="process"``, whose workers each load
+    ``db`` once on start-up.
+
+    Cancelling a call that is still waiting, or queued in the executor,
+    drops it. A call that has already started runs to completion in the
+    background and its result is discarded; its slot is freed only then,
+    so the limit always reflects the work actually running.
+    """
+
+    def __init__(
+        self,
+        db: str = "engineered-core@1.0.0",
+        max_concurrency: Optional[int] = None,
+        executor: str = "thread",
+    ):
+        if executor not in _EXECUTOR_KINDS:
+            raise ValueError(f"executor must be one of {_EXECUTOR_KINDS}, not {executor!r}")
+        self.db = db
+        self.max_concurrency = parallel.resolve_jobs(max_concurrency)
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._semaphores: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+        self._closed = False
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AsyncAnnotator is closed")
+            if self._executor is None:
+                if self.executor_kind == "process":
+                    self._executor = parallel.make_executor(self.max_concurrency, self.db)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix="plasmidkit"
+                    )
+            return self._executor
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable[[], T]) -> T:
+        """Run ``func`` on the executor within the concurrency limit.
+
+        With a process executor ``func`` and its result must be picklable.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        await semaphore.acquire()
+        try:
+            future: Future = self._get_executor().submit(func)
+        except BaseException:
+            semaphore.release()
+            raise
+        # Free the slot when the work really ends, not when the caller stops waiting
+        future.add_done_callback(partial(_release, loop, semaphore))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    async def annotate(
+        self,
+        record: SeqRecord | str | Path,
+        detectors: Iterable[str] | None = None,
+        is_sequence: Optional[bool] = None,
+    ) -> List[Feature]:
+        detector_list = list(detectors) if detectors else None
+        return await self.run(
+            partial(
+                api.annotate, record, db=self.db, detectors=detector_list, is_sequence=is_sequence
+            )
+        )
+
+    async def score(
+        self,
+        record: SeqRecord | str | Path,
+        annotations: Sequence[Feature] | None = None,
+        is_sequence: Optional[bool] = None,
+    ) -> Mapping[str, object]:
+        features = list(annotations) if annotations is not None else None
+        return await self.run(
+            partial(api.score, record, annotations=features, db=self.db, is_sequence=is_sequence)
+        )
+
+    async def annotate_and_score(
+        self,
+        record: SeqRecord | str | Path,
+        detectors: Iterable[str] | None = None,
+        is_sequence: Optional[bool] = None,
+        timings: bool = False,
+        cache: bool = False,
+    ) -> Mapping[str, object]:
+        detector_list = list(detectors) if detectors else None
+        return await self.run(
+            partial(
+                api.annotate_and_score,
+                record,
+                db=self.db,
+                detectors=detector_list,
+                is_sequence=is_sequence,
+                timings=timings,
+                cache=cache,
+            )
+        )
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the executor down; queued calls are cancelled."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self) -> "AsyncAnnotator":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+def _release(
+    loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore, _future: Future
+) -> None:
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(semaphore.release)
+
+
+_DEFAULTS: Dict[str, AsyncAnnotator] = {}
+_DEFAULTS_LOCK = threading.Lock()
+
+
+def get_default_annotator(db: str = "engineered-core@1.0.0") -> AsyncAnnotator:
+    """Shared thread-backed annotator for ``db`` used by the module-level coroutines.
+
+    Its limit is ``PLASMIDKIT_ASYNC_CONCURRENCY`` (default: one call per core).
+    """
+    with _DEFAULTS_LOCK:
+        annotator = _DEFAULTS.get(db)
+        if annotator is None:
+            limit = int(os.environ.get("PLASMIDKIT_ASYNC_CONCURRENCY", "0"))
+            annotator = AsyncAnnotator(db, max_concurrency=limit or None)
+            _DEFAULTS[db] = annotator
+        return annotator
+
+
+async def annotate(
+    record: SeqRecord | str | Path,
+    db: str = "engineered-core@1.0.0",
+    detectors: Iterable[str] | None = None,
+    is_sequence: Optional[bool] = None,
+) -> List[Feature]:
+    """Async :func:`plasmidkit.api.annotate` on the default annotator for ``db``."""
+    return await get_default_annotator(db).annotate(
+        record, detectors=detectors, is_sequence=is_sequence
+    )
+
+
+async def score(
+    record: SeqRecord | str | Path,
+    annotations: Sequence[Feature] | None = None,
+    db: str = "engineered-core@1.0.0",
+    is_sequence: Optional[bool] = None,
+) -> Mapping[str, object]:
+    """Async :func:`plasmidkit.api.score` on the default annotator for ``db``."""
+    return await get_default_annotator(db).score(
+        record, annotations=annotations, is_sequence=is_sequence
+    )
+
+
+async def annotate_and_score(
+    record: SeqRecord | str | Path,
+    db: str = "engineered-core@1.0.0",
+    detectors: Iterable[str] | None = None,
+    is_sequence: Optional[bool] = None,
+    timings: bool = False,
+    cache: bool = False,
+) -> Mapping[str, object]:
+    """Async :func:`plasmidkit.api.annotate_and_score` on the default annotator for ``db``."""
+    return await get_default_annotator(db).annotate_and_score(
+        record, detectors=detectors, is_sequence=is_sequence, timings=timings, cache=cache
+    )
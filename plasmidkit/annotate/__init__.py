@@ -5,12 +5,29 @@ from typing import Iterable, List, Mapping, Optional
 
 from Bio.SeqRecord import SeqRecord
 
+from ..instrumentation import Instrumentation
 from .detectors import run_detectors
+from .incremental import AnnotationState, Edit, annotate_state, apply_edit
+from .intervals import FeatureIndex
 from .loader import load_record
+from .sequence import PreparedSequence, prepare
+from .table import FeatureTable
 from .types import Feature
 
 
-__all__ = ["annotate_record", "load_record", "Feature"]
+__all__ = [
+    "annotate_record",
+    "load_record",
+    "Feature",
+    "FeatureIndex",
+    "FeatureTable",
+    "PreparedSequence",
+    "prepare",
+    "AnnotationState",
+    "Edit",
+    "annotate_state",
+    "apply_edit",
+]
 
 
 def annotate_record(
@@ -18,7 +35,15 @@ def annotate_record(
     db: Mapping[str, object],
     detectors: Iterable[str] | None = None,
     is_sequence: Optional[bool] = None,
-) -> List[Feature]:
+    instrumentation: Optional[Instrumentation] = None,
+    as_table: bool = False,
+    sequence: Optional[PreparedSequence] = None,
+) -> List[Feature] | FeatureTable:
+    """Run ``detectors`` on ``record``.
+
+    ``sequence`` is the record's prepared form, when the caller already has it.
+    """
     normalized_record = record if isinstance(record, SeqRecord) else load_record(record, is_sequence=is_sequence)
-    sequence = str(normalized_record.seq)
-    return run_detectors(sequence, db, detectors)
+    if sequence is None:
+        sequence = prepare(str(normalized_record.seq))
+    return run_detectors(sequence, db, detectors, instrumentation, as_table=as_table)
@@ -1,25 +1,77 @@
 from __future__ import annotations
 
 from importlib import import_module
-from typing import Dict, Iterable, List, Mapping
+from typing import Dict, Iterable, List, Mapping, Optional
 
+from ...instrumentation import Instrumentation, measure
+from ..sequence import SequenceLike, prepare
+from ..table import FeatureTable
 from ..types import Feature
+from .motif_index import SectionSpec, get_motif_index, resolve_section
 
 
 _DEFAULT_ORDER = ["ori", "marker", "promoter", "terminator", "mcs", "orf_prodigal"]
 
 
-def get_detector(name: str):
+def _load_detector(name: str):
     module = import_module(f"plasmidkit.annotate.detectors.{name}")
     if not hasattr(module, "detect"):
         raise ValueError(f"Detector {name!r} does not define a detect() function")
-    return module.detect
+    return module
+
+
+def get_detector(name: str):
+    return _load_detector(name).detect
+
 
+def motif_sections(
+    detectors: Iterable[str] | None = None, db: Optional[Mapping[str, object]] = None
+) -> List[SectionSpec]:
+    """Motif sections read by the given (default: built-in) detectors, as configured by ``db``."""
+    order = list(detectors) if detectors else _DEFAULT_ORDER
+    return [
+        resolve_section(module.MOTIF_SECTION, db or {})
+        for module in map(_load_detector, order)
+        if hasattr(module, "MOTIF_SECTION")
+    ]
+
+
+def run_detectors(
+    sequence: SequenceLike,
+    db: Mapping[str, object],
+    detectors: Iterable[str] | None = None,
+    instrumentation: Optional[Instrumentation] = None,
+    as_table: bool = False,
+) -> List[Feature] | FeatureTable:
+    """Run ``detectors`` (default: the built-in set) on ``sequence``.
 
-def run_detectors(sequence: str, db: Mapping[str, object], detectors: Iterable[str] | None = None) -> List[Feature]:
+    Returns a list of features, or a columnar :class:`FeatureTable` when
+    ``as_table`` is set.
+    """
     order = list(detectors) if detectors else _DEFAULT_ORDER
+    modules = [_load_detector(name) for name in order]
+    # Every detector reads the same prepared views instead of re-deriving them
+    sequence = prepare(sequence)
+
+    # Motif detectors declare a MOTIF_SECTION; their seeds are scanned together in one pass
+    specs = [
+        resolve_section(module.MOTIF_SECTION, db)
+        for module in modules
+        if hasattr(module, "MOTIF_SECTION")
+    ]
+    motif_hits: Dict[object, list] = {}
+    if specs:
+        with measure(instrumentation, "detector", "motif_scan", len(sequence)) as timing:
+            motif_hits = get_motif_index(db).scan(sequence, specs)
+            timing.counters.update({spec.name: len(hits) for spec, hits in motif_hits.items()})
+
     features: List[Feature] = []
-    for name in order:
-        detector_fn = get_detector(name)
-        features.extend(detector_fn(sequence, db))
-    return features
+    for name, module in zip(order, modules):
+        with measure(instrumentation, "detector", name, len(sequence)) as timing:
+            if hasattr(module, "MOTIF_SECTION"):
+                found = module.from_hits(motif_hits[resolve_section(module.MOTIF_SECTION, db)], db)
+            else:
+                found = module.detect(sequence, db)
+            timing.features = len(found)
+        features.extend(found)
+    return FeatureTable.from_features(features) if as_table else features
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from typing import Dict
 
+from ..sequence import SequenceLike
 from .utils import gc_content
 
 
-def analyse(sequence: str) -> Dict[str, float]:
+def analyse(sequence: SequenceLike) -> Dict[str, float]:
     return {
         "length": float(len(sequence)),
         "gc": gc_content(sequence),
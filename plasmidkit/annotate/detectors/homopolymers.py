@@ -2,25 +2,19 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
 
-def analyse(sequence: str, min_run: int = 8) -> Dict[str, float]:
-    seq = sequence.upper()
-    longest = 0
-    total = 0
-    if not seq:
+from ..sequence import SequenceLike, prepare
+
+
+def analyse(sequence: SequenceLike, min_run: int = 8) -> Dict[str, float]:
+    """Longest run of one character and number of runs of at least ``min_run``."""
+    seq = prepare(sequence).array
+    if not seq.size:
         return {"longest": 0.0, "count": 0.0}
-    current = seq[0]
-    run = 1
-    for char in seq[1:]:
-        if char == current:
-            run += 1
-        else:
-            if run >= min_run:
-                longest = max(longest, run)
-                total += 1
-            current = char
-            run = 1
-    if run >= min_run:
-        longest = max(longest, run)
-        total += 1
-    return {"longest": float(longest), "count": float(total)}
+    # Run boundaries are where the character changes
+    starts = np.flatnonzero(seq[1:] != seq[:-1]) + 1
+    runs = np.diff(np.concatenate(([0], starts, [seq.size])))
+    long_runs = runs[runs >= min_run]
+    longest = int(long_runs.max()) if long_runs.size else 0
+    return {"longest": float(longest), "count": float(long_runs.size)}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+# 2-bit codes for A, C, G, T; every other byte (N, IUPAC, gaps) maps to INVALID
+INVALID = 4
+# Largest k whose 2-bit code fits in a uint64
+MAX_K = 32
+
+_LOOKUP = np.full(256, INVALID, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    _LOOKUP[_base] = _code
+    _LOOKUP[_base + 32] = _code  # lowercase
+
+
+def encode(sequence: str) -> np.ndarray:
+    """2-bit encode ``sequence`` as a ``uint8`` array (A=0, C=1, G=2, T=3, other=4)."""
+    raw = np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    return _LOOKUP[raw]
+
+
+def valid_windows(codes: np.ndarray, k: int) -> np.ndarray:
+    """Boolean mask of the ``len(codes) - k + 1`` windows made only of A/C/G/T."""
+    bad = np.concatenate(([0], np.cumsum(codes == INVALID, dtype=np.int64)))
+    return (bad[k:] - bad[:-k]) == 0
+
+
+def kmer_codes(codes: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling forward and reverse-complement k-mer codes for every window.
+
+    Both arrays are ``uint64`` of length ``len(codes) - k + 1``; windows
+    containing invalid bases get meaningless codes and must be masked with
+    :func:`valid_windows`. The reverse complement is computed arithmetically
+    (complement = 3 - code, read right to left), never by building strings.
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    count = len(codes) - k + 1
+    if count <= 0:
+        empty = np.zeros(0, dtype=np.uint64)
+        return empty, empty
+    clean = np.where(codes == INVALID, 0, codes).astype(np.uint64)
+    complement = np.uint64(3) - clean
+    forward = np.zeros(count, dtype=np.uint64)
+    reverse = np.zeros(count, dtype=np.uint64)
+    two = np.uint64(2)
+    for j in range(k):
+        forward <<= two
+        forward |= clean[j : j + count]
+        reverse |= complement[j : j + count] << np.uint64(2 * j)
+    return forward, reverse
+
+
+def _hash64(key: np.ndarray, mask: np.uint64) -> np.ndarray:
+    # Invertible integer mix (Thomas Wang's 64-bit hash, as used by minimap2) so
+    # low-complexity k-mers such as poly-A do not always win the minimum
+    key = (~key + (key << np.uint64(21))) & mask
+    key ^= key >> np.uint64(24)
+    key = (key + (key << np.uint64(3)) + (key << np.uint64(8))) & mask
+    key ^= key >> np.uint64(14)
+    key = (key + (key << np.uint64(2)) + (key << np.uint64(4))) & mask
+    key ^= key >> np.uint64(28)
+    return (key + (key << np.uint64(31))) & mask
+
+
+def minimizers(codes: np.ndarray, k: int, w: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Canonical (w, k)-minimizers of a 2-bit encoded sequence.
+
+    Every run of ``w`` consecutive k-mers contributes the one with the
+    smallest hashed canonical code (leftmost on ties), so two sequences
+    sharing ``w + k - 1`` bases on either strand share a minimizer.
+    K-mers with invalid bases, and palindromic ones whose strand is
+    undefined, are never chosen.
+
+    Returns ``(positions, hashes, reverse)``: start of each minimizer,
+    its hash, and whether its canonical form is the reverse complement.
+    """
+    if not 1 <= k < MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K - 1}")
+    forward, reverse = kmer_codes(codes, k)
+    if not len(forward):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool)
+    mask = np.uint64((1 << (2 * k)) - 1)
+    # Hashes stay below 4**k, so the all-ones value marks unusable k-mers
+    sentinel = np.uint64(np.iinfo(np.uint64).max)
+    hashes = _hash64(np.minimum(forward, reverse), mask)
+    hashes[~valid_windows(codes, k) | (forward == reverse)] = sentinel
+    w = max(1, min(w, len(hashes)))
+    windows = np.lib.stride_tricks.sliding_window_view(hashes, w)
+    positions = np.unique(windows.argmin(axis=1) + np.arange(len(windows)))
+    positions = positions[hashes[positions] != sentinel]
+    return positions.astype(np.int64), hashes[positions], (reverse < forward)[positions]
@@ -1,30 +1,37 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+from ..sequence import SequenceLike
 from ..types import Feature
-from .utils import find_motifs_fuzzy_tagged, calculate_motif_confidence
+from .motif_index import MotifHit, SectionSpec, get_motif_index, resolve_section
+from .utils import alignment_evidence, calculate_motif_confidence
 
 
-def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
+# Exact by default for restriction sites
+MOTIF_SECTION = SectionSpec("mcs_sites", max_mismatches=0, motif_key="sequence")
+
+
+def detect(sequence: SequenceLike, db: Dict[str, object]) -> List[Feature]:
+    section = resolve_section(MOTIF_SECTION, db)
+    return from_hits(get_motif_index(db).section(section).search(sequence), db)
+
+
+def from_hits(hits: List[MotifHit], db: Dict[str, object]) -> List[Feature]:
     features: List[Feature] = []
     sites = db.get("mcs_sites", [])
-    for site in sites:
+    hits_by_site: Dict[int, List[Tuple[int, str, str, int, int, str | None]]] = {}
+    for site_idx, pos, motif, strand, mismatches, *alignment in hits:
+        end, cigar = alignment if alignment else (pos + len(motif), None)
+        hits_by_site.setdefault(site_idx, []).append((pos, motif, strand, mismatches, end, cigar))
+    for site_idx, site in enumerate(sites):
         motif = site.get("sequence")
         if not motif:
             continue
-        hits = find_motifs_fuzzy_tagged(
-            sequence,
-            [motif],
-            max_mismatches=0,  # exact by default for restriction sites
-            circular=True,
-            include_rc=True,
-        )
         # Collapse strand duplicates: report one feature per span
         spans: set[tuple[int, int]] = set()
-        for pos, _motif, strand, mismatches in hits:
+        for pos, _motif, strand, mismatches, end, cigar in hits_by_site.get(site_idx, []):
             start = pos
-            end = pos + len(motif)
             span = (start, end)
             if span in spans:
                 continue
@@ -43,6 +50,7 @@ def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
                         "motif": motif,
                         "mismatches": mismatches,
                         "pct_identity": round((len(motif) - mismatches) / len(motif) * 100, 2),
+                        **alignment_evidence(mismatches, cigar),
                     },
                 )
             )
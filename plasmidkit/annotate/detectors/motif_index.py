@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+import bisect
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import edlib
+import numpy as np
+
+from ..sequence import SequenceLike, prepare
+
+# Optional dependency: pyahocorasick
+try:
+    import ahocorasick as _ahocorasick  # type: ignore
+
+    _HAS_AHOCORASICK = True
+except Exception:
+    _ahocorasick = None  # type: ignore
+    _HAS_AHOCORASICK = False
+
+# Seeds shorter than this produce too many candidates to be worth verifying
+MIN_SEED_LEN = 8
+# Largest edit distance an edit-distance section may allow
+MAX_EDITS = 3
+# Bases compared per NumPy batch of Hamming verification (bounds the gathered window matrix)
+VERIFY_CELLS = 1 << 20
+# Number of per-database indexes kept alive by get_motif_index()
+INDEX_CACHE_SIZE = 8
+
+_COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+# (entry_index, start, original_motif, strand, mismatches); edit-distance sections
+# append (end, cigar) since indels make the match length differ from the motif's
+MotifHit = Tuple[int, int, str, str, int]
+EditHit = Tuple[int, int, str, str, int, int, str]
+
+
+def clamp_mismatches(max_mismatches: int) -> int:
+    """Cap the mismatch budget to 0-2 for predictable seed counts."""
+    return 0 if max_mismatches <= 0 else 1 if max_mismatches == 1 else 2
+
+
+def hit_end(hit: MotifHit | EditHit) -> int:
+    """End (exclusive) of a hit; only edit-distance hits differ from start + motif length."""
+    return hit[5] if len(hit) > 5 else hit[1] + len(hit[2])
+
+
+def seed_spans(length: int, max_mismatches: int, merge: bool = True) -> List[Tuple[int, int]]:
+    """Split a pattern into (d+1) pigeonhole seeds as (offset, length) pairs.
+
+    Any match with at most ``d`` mismatches contains at least one seed exactly.
+    With ``merge``, seeds shorter than ``MIN_SEED_LEN`` are merged with their
+    neighbours, trading that guarantee for fewer candidates on short motifs.
+    """
+    num_seeds = max_mismatches + 1
+    base = length // num_seeds
+    extra = length % num_seeds
+    seeds: List[Tuple[int, int]] = []
+    offset = 0
+    for i in range(num_seeds):
+        seg_len = base + (1 if i < extra else 0)
+        if seg_len <= 0:
+            continue
+        seeds.append((offset, seg_len))
+        offset += seg_len
+    if not merge:
+        return seeds
+    merged: List[Tuple[int, int]] = []
+    i = 0
+    while i < len(seeds):
+        off, ln = seeds[i]
+        while ln < MIN_SEED_LEN and i + 1 < len(seeds):
+            n_off, n_ln = seeds[i + 1]
+            ln = (n_off + n_ln) - off
+            i += 1
+        merged.append((off, ln))
+        i += 1
+    return merged or seeds
+
+
+def _verify_hamming(
+    space_codes: np.ndarray, compiled: "CompiledMotifs", pattern_ids: List[int], starts: List[int]
+) -> List[Tuple[int, int, int]]:
+    """Verify seed candidates of one section in batches; returns (mismatches, pattern_idx, start).
+
+    Candidates are deduplicated (several seeds of a pattern often hit the
+    same start) and grouped by pattern length, so no window is padded to a
+    longer pattern. Each batch gathers one window per candidate from the
+    encoded search space, at most ``VERIFY_CELLS`` bases in all, and
+    compares it with the pattern rows. Windows running past the end of the
+    space are not matches.
+    """
+    matrix, lengths = compiled.pattern_codes()
+    space_len = len(space_codes)
+    candidate_ids = np.asarray(pattern_ids, dtype=np.int64)
+    keys = np.unique(candidate_ids * space_len + np.asarray(starts, dtype=np.int64))
+    ids, positions = np.divmod(keys, space_len)
+    candidate_lengths = lengths[ids]
+    fits = positions + candidate_lengths <= space_len
+    ids, positions, candidate_lengths = ids[fits], positions[fits], candidate_lengths[fits]
+    verified: List[Tuple[int, int, int]] = []
+    for length in np.unique(candidate_lengths).tolist():
+        same = candidate_lengths == length
+        group_ids, group_pos = ids[same], positions[same]
+        offsets = np.arange(length)
+        rows = max(1, VERIFY_CELLS // max(length, 1))
+        for lo in range(0, len(group_ids), rows):
+            batch_ids, batch_pos = group_ids[lo : lo + rows], group_pos[lo : lo + rows]
+            windows = space_codes[batch_pos[:, None] + offsets]
+            mismatches = (windows != matrix[batch_ids, :length]).sum(axis=1)
+            ok = mismatches <= compiled.max_mismatches
+            verified.extend(
+                zip(mismatches[ok].tolist(), batch_ids[ok].tolist(), batch_pos[ok].tolist())
+            )
+    return verified
+
+
+def _align_candidates(
+    space: str, seq_len: int, pattern: str, starts: List[int], max_edits: int
+) -> List[Tuple[int, int, int, str]]:
+    """Verify seed candidates of one pattern with edlib; returns (start, end, distance, cigar).
+
+    The seeds of one occurrence imply starts at most ``2 * max_edits``
+    apart, so candidates are clustered over spans that wide and each cluster
+    is aligned once (infix mode) on a window widened by the edit budget. Of
+    equally good locations the one closest to the motif's length, then the
+    leftmost, is reported; when neighbouring clusters find overlapping
+    matches only the better one is kept.
+    """
+    starts = sorted(set(starts))
+    clusters: List[List[int]] = [[starts[0], starts[0]]]
+    for start in starts[1:]:
+        if start - clusters[-1][0] <= 2 * max_edits:
+            clusters[-1][1] = start
+        else:
+            clusters.append([start, start])
+    aligned: List[Tuple[int, int, int, str]] = []
+    for low, high in clusters:
+        window_start = max(0, low - max_edits)
+        window = space[window_start : high + len(pattern) + max_edits]
+        result = edlib.align(pattern, window, mode="HW", task="locations", k=max_edits)
+        distance = result["editDistance"]
+        if distance < 0:
+            continue
+        begin, last = min(
+            result["locations"], key=lambda loc: (abs(loc[1] + 1 - loc[0] - len(pattern)), loc[0])
+        )
+        start, end = window_start + begin, window_start + last + 1
+        if start >= seq_len:
+            continue
+        if aligned and start < aligned[-1][1]:
+            if distance >= aligned[-1][2]:
+                continue
+            aligned.pop()
+        cigar = edlib.align(pattern, space[start:end], mode="NW", task="path")["cigar"]
+        aligned.append((start, end, distance, cigar))
+    return aligned
+
+
+@dataclass(frozen=True)
+class MotifPattern:
+    """One strand of one motif, ready to be verified against a sequence."""
+
+    entry: int
+    motif: str
+    strand: str
+    pattern: str
+    rank: int
+
+
+class CompiledMotifs:
+    """Seeds for a group of motif lists, compiled once and searched many times.
+
+    ``groups[i]`` holds the motifs of entry ``i``. Every motif is uppercased,
+    reverse-complemented and partitioned into pigeonhole seeds up front; seeds
+    shared by several patterns are swept only once per sequence.
+
+    With ``max_edits`` > 0 matches are scored by edit distance instead of
+    Hamming distance: ``max_edits + 1`` seeds still contain one exact seed
+    per match, and each candidate is aligned with edlib so small indels are
+    tolerated. These seeds are never merged, so short motifs get short seeds
+    (and more candidates) rather than missed matches.
+    """
+
+    def __init__(
+        self,
+        groups: Sequence[Sequence[str]],
+        max_mismatches: int = 2,
+        include_rc: bool = True,
+        max_edits: int = 0,
+    ):
+        self.max_mismatches = clamp_mismatches(max_mismatches)
+        self.max_edits = min(max(0, max_edits), MAX_EDITS)
+        self.include_rc = include_rc
+        self.patterns: List[MotifPattern] = []
+        self.seeds: Dict[str, List[Tuple[int, int]]] = {}
+        self._scanner: Optional[MotifScanner] = None
+        self._ranks: Optional[Dict[Tuple[int, str, str], int]] = None
+        self._codes: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        raw: List[Tuple[int, str, str, str, int]] = []
+        for entry_idx, motifs in enumerate(groups):
+            seen: set[str] = set()
+            for order, motif in enumerate(motifs):
+                if not motif or motif in seen:
+                    continue
+                seen.add(motif)
+                mu = motif.upper()
+                raw.append((entry_idx, motif, "+", mu, order))
+                if include_rc:
+                    raw.append((entry_idx, motif, "-", mu.translate(_COMPLEMENT)[::-1], order))
+
+        # Rank reproduces the tie-break order of per-entry searches merged by stable sort
+        ranked = sorted(range(len(raw)), key=lambda i: (raw[i][0], raw[i][2], raw[i][4]))
+        ranks = {idx: rank for rank, idx in enumerate(ranked)}
+        for i, (entry_idx, motif, strand, pattern, _order) in enumerate(raw):
+            self.patterns.append(MotifPattern(entry_idx, motif, strand, pattern, ranks[i]))
+            if self.max_edits:
+                spans = seed_spans(len(pattern), self.max_edits, merge=False)
+            else:
+                spans = seed_spans(len(pattern), self.max_mismatches)
+            for seed_off, seed_len in spans:
+                seed = pattern[seed_off : seed_off + seed_len]
+                if seed:
+                    self.seeds.setdefault(seed, []).append((i, seed_off))
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def pattern_codes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Patterns as ASCII rows of a zero-padded ``uint8`` matrix, plus their lengths."""
+        if self._codes is None:
+            lengths = np.array([len(p.pattern) for p in self.patterns], dtype=np.int64)
+            matrix = np.zeros((len(self.patterns), int(lengths.max(initial=0))), dtype=np.uint8)
+            for row, p in enumerate(self.patterns):
+                codes = np.frombuffer(p.pattern.encode("ascii", "replace"), dtype=np.uint8)
+                matrix[row, : len(p.pattern)] = codes
+            self._codes = (matrix, lengths)
+        return self._codes
+
+    def export_state(self, intern: Callable[[str], int]) -> Tuple[object, ...]:
+        """Flatten to plain tuples, storing every string as an ``intern`` index."""
+        patterns = [
+            (p.entry, intern(p.motif), p.strand == "-", intern(p.pattern), p.rank)
+            for p in self.patterns
+        ]
+        seeds = [
+            (intern(seed), [tuple(t) for t in targets]) for seed, targets in self.seeds.items()
+        ]
+        return (self.max_mismatches, self.include_rc, self.max_edits, patterns, seeds)
+
+    @classmethod
+    def from_state(cls, state: Sequence[object], strings: Sequence[str]) -> "CompiledMotifs":
+        max_mismatches, include_rc, max_edits, patterns, seeds = state
+        compiled = cls(
+            [], max_mismatches=max_mismatches, include_rc=include_rc, max_edits=max_edits
+        )
+        compiled.patterns = [
+            MotifPattern(entry, strings[motif], "-" if is_rc else "+", strings[pattern], rank)
+            for entry, motif, is_rc, pattern, rank in patterns
+        ]
+        compiled.seeds = {strings[seed]: [tuple(t) for t in targets] for seed, targets in seeds}
+        return compiled
+
+    def search(self, sequence: SequenceLike, circular: bool = True) -> List[MotifHit]:
+        """Return verified hits sorted by mismatches, motif length (desc), position.
+
+        Only starts inside the first copy of the (circularly doubled) sequence
+        are reported; matches may run past the origin. Edit-distance sections
+        report :data:`EditHit` tuples, with the edit distance as mismatches.
+        """
+        if self._scanner is None:
+            self._scanner = MotifScanner([self])
+        return self._scanner.scan(sequence, circular)[0]
+
+    def merge_hits(self, hits: List[MotifHit], extra: Iterable[MotifHit]) -> None:
+        """Insert ``extra`` into ``hits`` (already in :meth:`search` order), in place."""
+        if self._ranks is None:
+            self._ranks = {(p.entry, p.motif, p.strand): p.rank for p in self.patterns}
+        ranks = self._ranks
+
+        def order(h: MotifHit) -> Tuple[int, int, int, int]:
+            return (h[4], -len(h[2]), h[1], ranks[(h[0], h[2], h[3])])
+
+        for hit in extra:
+            bisect.insort(hits, hit, key=order)
+
+
+@dataclass(frozen=True)
+class SectionSpec:
+    """How a detector reads its motif section from the database.
+
+    ``max_edits`` > 0 switches the section to edit-distance matching (see
+    :class:`CompiledMotifs`); databases opt in per section with
+    ``"edit_distance": {"ori": 2}`` (see :func:`resolve_section`).
+    """
+
+    name: str
+    max_mismatches: int
+    motif_key: str = "motifs"
+    min_length: int = 0
+    include_rc: bool = True
+    max_edits: int = 0
+
+
+def resolve_section(spec: SectionSpec, db: Mapping[str, object]) -> SectionSpec:
+    """``spec`` with the database's edit-distance setting for its section applied."""
+    overrides = db.get("edit_distance") if isinstance(db, Mapping) else None
+    max_edits = overrides.get(spec.name) if isinstance(overrides, Mapping) else None
+    if not max_edits:
+        return spec
+    return replace(spec, max_edits=int(max_edits))
+
+
+class MotifScanner:
+    """Single-pass seed scan shared by several compiled motif sections.
+
+    All seeds of all sections go into one multi-pattern automaton
+    (``pyahocorasick`` when installed), so the sequence is walked once no
+    matter how many sections or motifs are involved. Without the automaton
+    each distinct seed is swept with ``str.find`` instead.
+    """
+
+    def __init__(self, sections: Sequence[CompiledMotifs]):
+        self.sections = list(sections)
+        targets: Dict[str, List[Tuple[int, int, int]]] = {}
+        max_len = 0
+        for section_idx, section in enumerate(self.sections):
+            for seed, seed_targets in section.seeds.items():
+                bucket = targets.setdefault(seed, [])
+                for pattern_idx, seed_off in seed_targets:
+                    bucket.append((section_idx, pattern_idx, seed_off))
+            for pattern in section.patterns:
+                # Insertions can make an edit-distance match longer than its motif
+                max_len = max(max_len, len(pattern.pattern) + section.max_edits)
+        self.max_pattern_len = max_len
+        self._targets = {seed: tuple(bucket) for seed, bucket in targets.items()}
+        self._automaton = None
+        if _HAS_AHOCORASICK and self._targets:
+            automaton = _ahocorasick.Automaton()
+            for seed, bucket in self._targets.items():
+                automaton.add_word(seed, (len(seed), bucket))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _seed_hits(self, space: str, end: int):
+        if self._automaton is not None:
+            for end_idx, (seed_len, bucket) in self._automaton.iter(space, 0, end):
+                yield end_idx - seed_len + 1, bucket
+            return
+        for seed, bucket in self._targets.items():
+            idx = space.find(seed, 0, end)
+            while idx != -1:
+                yield idx, bucket
+                idx = space.find(seed, idx + 1, end)
+
+    def scan(self, sequence: SequenceLike, circular: bool = True) -> List[List[MotifHit]]:
+        """Return the sorted hits of every section, in section order."""
+        results: List[List[MotifHit]] = [[] for _ in self.sections]
+        prepared = prepare(sequence)
+        if not len(prepared) or not self._targets:
+            return results
+        # Matches start inside the sequence, so the circular wrap only needs
+        # the longest pattern's worth of overhang
+        space = prepared.circular_view(self.max_pattern_len - 1) if circular else prepared.upper
+        seq_len = len(prepared)
+        space_len = len(space)
+        scan_end = min(space_len, seq_len + self.max_pattern_len)
+        sections = self.sections
+
+        # Seed hits only collect candidates; Hamming sections verify them in NumPy
+        # batches and edit-distance sections align them per pattern afterwards
+        hamming: List[Tuple[List[int], List[int]]] = [([], []) for _ in sections]
+        edits = [section.max_edits for section in sections]
+        candidates: List[Dict[int, List[int]]] = [{} for _ in sections]
+        for idx, bucket in self._seed_hits(space, scan_end):
+            for section_idx, pattern_idx, seed_off in bucket:
+                start = idx - seed_off
+                if edits[section_idx]:
+                    # Indels before the seed shift the real start by up to max_edits
+                    if -edits[section_idx] <= start < seq_len + edits[section_idx]:
+                        candidates[section_idx].setdefault(pattern_idx, []).append(start)
+                elif 0 <= start < seq_len:
+                    pattern_ids, starts = hamming[section_idx]
+                    pattern_ids.append(pattern_idx)
+                    starts.append(start)
+        space_codes = np.frombuffer(space.encode("ascii", "replace"), dtype=np.uint8)
+
+        for section_idx, section in enumerate(sections):
+            patterns = section.patterns
+            hits = results[section_idx]
+            if edits[section_idx]:
+                scored_edits = []
+                for pattern_idx, starts in candidates[section_idx].items():
+                    pattern = patterns[pattern_idx]
+                    for start, end, distance, cigar in _align_candidates(
+                        space, seq_len, pattern.pattern, starts, section.max_edits
+                    ):
+                        order = (distance, -len(pattern.motif), start, pattern.rank)
+                        scored_edits.append(order + (end, cigar, pattern))
+                scored_edits.sort(key=lambda item: item[:4])
+                for distance, _neg_len, start, _rank, end, cigar, pat in scored_edits:
+                    hits.append((pat.entry, start, pat.motif, pat.strand, distance, end, cigar))
+                continue
+            pattern_ids, starts = hamming[section_idx]
+            if not pattern_ids:
+                continue
+            verified = _verify_hamming(space_codes, section, pattern_ids, starts)
+            scored = [
+                (mm, -len(patterns[idx].motif), start, patterns[idx].rank, idx)
+                for mm, idx, start in verified
+            ]
+            scored.sort()
+            for mm, _neg_len, start, _rank, pattern_idx in scored:
+                pat = patterns[pattern_idx]
+                hits.append((pat.entry, start, pat.motif, pat.strand, mm))
+        return results
+
+
+class MotifIndex:
+    """Per-database cache of compiled motif sections.
+
+    Sections are compiled on first use, so a run restricted to a single
+    detector only pays for the sections that detector reads.
+    """
+
+    def __init__(self, db: Mapping[str, object]):
+        self.db = db
+        self._sections: Dict[SectionSpec, CompiledMotifs] = {}
+        self._scanners: Dict[Tuple[SectionSpec, ...], MotifScanner] = {}
+
+    def entries(self, name: str) -> List[Mapping[str, object]]:
+        return list(self.db.get(name, []) or [])
+
+    def section(self, spec: SectionSpec) -> CompiledMotifs:
+        compiled = self._sections.get(spec)
+        if compiled is None:
+            # Compiled databases ship ready-made sections for the built-in detectors
+            precompiled = getattr(self.db, "compiled_section", None)
+            compiled = precompiled(spec) if precompiled is not None else None
+            if compiled is None:
+                compiled = compile_section(self.entries(spec.name), spec)
+            self._sections[spec] = compiled
+        return compiled
+
+    def scanner(self, specs: Sequence[SectionSpec]) -> MotifScanner:
+        """Shared scanner over the distinct ``specs``, with sections in first-seen order."""
+        unique = tuple(dict.fromkeys(specs))
+        scanner = self._scanners.get(unique)
+        if scanner is None:
+            scanner = MotifScanner([self.section(spec) for spec in unique])
+            self._scanners[unique] = scanner
+        return scanner
+
+    def scan(
+        self, sequence: SequenceLike, specs: Sequence[SectionSpec]
+    ) -> Dict[SectionSpec, List[MotifHit]]:
+        """Scan ``sequence`` once for the seeds of every requested section."""
+        return dict(zip(dict.fromkeys(specs), self.scanner(specs).scan(sequence)))
+
+
+def compile_section(entries: Sequence[Mapping[str, object]], spec: SectionSpec) -> CompiledMotifs:
+    groups = [_entry_motifs(entry, spec.motif_key, spec.min_length) for entry in entries]
+    return CompiledMotifs(
+        groups,
+        max_mismatches=spec.max_mismatches,
+        include_rc=spec.include_rc,
+        max_edits=spec.max_edits,
+    )
+
+
+def _entry_motifs(entry: Mapping[str, object], motif_key: str, min_length: int) -> List[str]:
+    value = entry.get(motif_key)
+    if isinstance(value, str):
+        value = [value]
+    if not value:
+        return []
+    return [m for m in value if isinstance(m, str) and len(m) >= min_length]
+
+
+_INDEX_CACHE: "OrderedDict[int, Tuple[Mapping[str, object], MotifIndex]]" = OrderedDict()
+
+
+def get_motif_index(db: Mapping[str, object]) -> MotifIndex:
+    """Return the compiled index for ``db``, building it on first use.
+
+    Indexes are keyed by the identity of the database mapping, so artifacts
+    reused across records share one index. The mapping is treated as
+    read-only once indexed.
+    """
+    key = id(db)
+    cached = _INDEX_CACHE.get(key)
+    if cached is not None and cached[0] is db:
+        _INDEX_CACHE.move_to_end(key)
+        return cached[1]
+    index = MotifIndex(db)
+    _INDEX_CACHE[key] = (db, index)
+    while len(_INDEX_CACHE) > INDEX_CACHE_SIZE:
+        _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def clear_motif_indexes() -> None:
+    _INDEX_CACHE.clear()
@@ -1,45 +1,213 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 import pyrodigal
 
 
+from ...cache import manager
+from ..sequence import SequenceLike, prepare
 from ..types import Feature
 
+# Number of per-database model resolutions kept by _model_for_db()
+MODEL_CACHE_SIZE = 8
 
-def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
 
-    # Pyrodigal recommends passing bytes for performance
-    seq_bytes = sequence.upper().encode("ascii", "ignore")
+def _settings(db: Mapping[str, object]) -> Tuple[int, int, int]:
     # Balanced sensitivity by default; tunable via DB
-    min_len_aa = int(db.get("orf_min_aa", 50)) if isinstance(db, dict) else 50
-    min_len_nt = int(db.get("orf_min_nt", 150)) if isinstance(db, dict) else 150
+    min_len_aa = int(db.get("orf_min_aa", 50)) if isinstance(db, Mapping) else 50
+    min_len_nt = int(db.get("orf_min_nt", 150)) if isinstance(db, Mapping) else 150
+    genetic_code = int(db.get("orf_genetic_code", 11)) if isinstance(db, Mapping) else 11
+    return min_len_aa, min_len_nt, genetic_code
 
+
+def get_gene_finder(
+    min_gene: int, genetic_code: int = 11, model: Optional[str] = None
+) -> "pyrodigal.GeneFinder":
+    """Return the shared finder for this configuration.
+
+    Finders are immutable once built and ``find_genes`` is thread-safe, so one
+    instance serves every record (and every thread) with the same settings.
+    With a trained ``model`` the finder runs in single mode, which scores one
+    model per sequence instead of every metagenomic bin.
+    """
+    return _gene_finder(
+        min_gene, genetic_code, manager.prodigal_model_path(model) if model is not None else None
+    )
+
+
+@lru_cache(maxsize=16)
+def _gene_finder(
+    min_gene: int, genetic_code: int, model_path: Optional[Path]
+) -> "pyrodigal.GeneFinder":
+    # Keyed by the model's path, so changing the cache directory never serves a stale model
+    if model_path is not None:
+        return pyrodigal.GeneFinder(
+            _load_training_info(model_path), meta=False, closed=False, min_gene=min_gene
+        )
     # Use Prodigal in metagenomic mode for plasmids lacking training signal; prefer bacterial code 11.
     # Support multiple pyrodigal versions by trying both parameter names.
     try:
-        orf_finder = pyrodigal.GeneFinder(
+        return pyrodigal.GeneFinder(
             meta=True,
             closed=False,
-            genetic_code=11,
-            min_gene=min_len_nt,
+            genetic_code=genetic_code,
+            min_gene=min_gene,
         )
     except TypeError:
-        # Older versions may not support genetic_code/min_gene/translation_table
-        try:
-            orf_finder = pyrodigal.GeneFinder(
-                meta=True,
-                closed=False,
-                translation_table=11,
-                min_gene=min_len_nt,
-            )
-        except TypeError:
-            try:
-                orf_finder = pyrodigal.GeneFinder(meta=True, closed=False, min_gene=min_len_nt)
-            except TypeError:
-                orf_finder = pyrodigal.GeneFinder(meta=True, closed=False)
-    genes = orf_finder.find_genes(seq_bytes)
+        pass
+    # Older versions may not support genetic_code/min_gene/translation_table
+    try:
+        return pyrodigal.GeneFinder(
+            meta=True,
+            closed=False,
+            translation_table=genetic_code,
+            min_gene=min_gene,
+        )
+    except TypeError:
+        pass
+    try:
+        return pyrodigal.GeneFinder(meta=True, closed=False, min_gene=min_gene)
+    except TypeError:
+        return pyrodigal.GeneFinder(meta=True, closed=False)
+
+
+def _encode(sequence: SequenceLike) -> bytes:
+    # Pyrodigal recommends passing bytes for performance; strings and prepared
+    # sequences share one length-preserving encoding, so coordinates agree
+    return prepare(sequence).upper_bytes
+
+
+def _content_model_name(encoded: Sequence[bytes], genetic_code: int) -> str:
+    digest = hashlib.sha256(str(genetic_code).encode("ascii"))
+    for seq in encoded:
+        digest.update(b">")
+        digest.update(seq)
+    return f"trained-{digest.hexdigest()[:16]}"
+
+
+def train_model(
+    sequences: Iterable[str], name: Optional[str] = None, genetic_code: int = 11
+) -> str:
+    """Train a single-mode Prodigal model and persist it in the cache directory.
+
+    ``sequences`` are reference backbones from the target host(s); Prodigal
+    joins them with linkers and needs at least 20 kb in total. Without a
+    ``name`` the model is named after the content of its training set.
+    Returns the model name to reference from a database's ``orf_model``.
+    """
+    encoded = [_encode(sequence) for sequence in sequences]
+    if not encoded:
+        raise ValueError("At least one training sequence is required")
+    if name is None:
+        name = _content_model_name(encoded, genetic_code)
+    training_info = pyrodigal.GeneFinder(meta=False, closed=False).train(
+        *encoded, translation_table=genetic_code
+    )
+    path = manager.prodigal_model_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        training_info.dump(handle)
+    os.replace(tmp_path, path)
+    _load_training_info.cache_clear()
+    _gene_finder.cache_clear()
+    _MODEL_CACHE.clear()
+    return name
 
+
+@lru_cache(maxsize=16)
+def _load_training_info(path: Path) -> "pyrodigal.TrainingInfo":
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Prodigal model {path.stem!r} not found in {path.parent}; train it with train_model()"
+        )
+    with open(path, "rb") as handle:
+        return pyrodigal.TrainingInfo.load(handle)
+
+
+# (db, cache dir, genetic code, model name, model path), keyed by id(db)
+_ModelCacheEntry = Tuple[Mapping[str, object], Path, int, Optional[str], Optional[Path]]
+_MODEL_CACHE: "OrderedDict[int, _ModelCacheEntry]" = OrderedDict()
+
+
+def _model_for_db(
+    db: Mapping[str, object], genetic_code: int
+) -> Tuple[Optional[str], Optional[Path]]:
+    """Name and path of the single-mode model selected by ``db``, resolved once per database.
+
+    The resolution is remembered per database object (like
+    ``get_motif_index``) and redone only when the cache directory changes,
+    so training sequences are hashed once rather than for every record.
+    """
+    key = id(db)
+    cache_dir = manager.current_cache_dir()
+    cached = _MODEL_CACHE.get(key)
+    if (
+        cached is not None
+        and cached[0] is db
+        and cached[1] == cache_dir
+        and cached[2] == genetic_code
+    ):
+        _MODEL_CACHE.move_to_end(key)
+        return cached[3], cached[4]
+    name = _resolve_model(db, genetic_code)
+    path = manager.prodigal_model_path(name) if name is not None else None
+    _MODEL_CACHE[key] = (db, cache_dir, genetic_code, name, path)
+    while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+        _MODEL_CACHE.popitem(last=False)
+    return name, path
+
+
+def model_identity(db: Mapping[str, object]) -> str:
+    """Identity of the single-mode model file selected by ``db``, or ``""`` in meta mode.
+
+    Combines the model's path, size and modification time, so retraining a
+    model or switching cache directory changes it. Used in result cache keys.
+    """
+    _min_aa, _min_nt, genetic_code = _settings(db)
+    _name, path = _model_for_db(db, genetic_code)
+    if path is None:
+        return ""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return f"{path}:missing"
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _resolve_model(db: Mapping[str, object], genetic_code: int) -> Optional[str]:
+    """Name of the single-mode model selected by ``db["orf_model"]``, training it if needed.
+
+    ``{"mode": "single", "name": ...}`` selects a model trained earlier;
+    ``{"mode": "single", "training_sequences": [...]}`` trains (once) on the
+    sequences shipped with the database. Anything else keeps meta mode.
+    """
+    config = db.get("orf_model") if isinstance(db, Mapping) else None
+    if not isinstance(config, Mapping) or config.get("mode", "single") != "single":
+        return None
+    training = config.get("training_sequences") or []
+    name = config.get("name")
+    if name is None:
+        if not training:
+            return None
+        name = _content_model_name([_encode(seq) for seq in training], genetic_code)
+    if training and not manager.prodigal_model_path(name).exists():
+        train_model(training, name=name, genetic_code=genetic_code)
+    return name
+
+
+def _to_features(
+    genes, min_len_aa: int, min_len_nt: int, model: Optional[str] = None
+) -> List[Feature]:
+    evidence: Dict[str, object] = {"min_aa": min_len_aa, "min_nt": min_len_nt}
+    if model is not None:
+        evidence["model"] = model
     features: List[Feature] = []
     for g in genes:
         # Derive coordinates robustly across pyrodigal versions
@@ -62,9 +230,31 @@ def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
                 strand=strand,
                 method="pyrodigal",
                 confidence=0.7,
-                evidence={"min_aa": min_len_aa, "min_nt": min_len_nt},
+                evidence=dict(evidence),
             )
         )
     return features
 
 
+def detect(sequence: SequenceLike, db: Dict[str, object]) -> List[Feature]:
+    min_len_aa, min_len_nt, genetic_code = _settings(db)
+    model, model_path = _model_for_db(db, genetic_code)
+    genes = _gene_finder(min_len_nt, genetic_code, model_path).find_genes(_encode(sequence))
+    return _to_features(genes, min_len_aa, min_len_nt, model)
+
+
+def detect_many(
+    sequences: Iterable[SequenceLike], db: Dict[str, object], threads: Optional[int] = None
+) -> List[List[Feature]]:
+    """Predict ORFs for many sequences concurrently, one feature list per input.
+
+    pyrodigal releases the GIL while predicting, so a thread pool sharing one
+    finder scales across cores without per-process memory or DB copies.
+    """
+    min_len_aa, min_len_nt, genetic_code = _settings(db)
+    model, model_path = _model_for_db(db, genetic_code)
+    finder = _gene_finder(min_len_nt, genetic_code, model_path)
+    encoded = [_encode(sequence) for sequence in sequences]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        predictions = list(pool.map(finder.find_genes, encoded))
+    return [_to_features(genes, min_len_aa, min_len_nt, model) for genes in predictions]
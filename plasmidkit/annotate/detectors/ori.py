@@ -2,65 +2,64 @@ from __future__ import annotations
 
 from typing import Dict, List, Tuple
 
+from ..sequence import SequenceLike
+from ..intervals import DisjointIntervals
 from ..types import Feature
-from .utils import find_motifs_fuzzy_tagged, calculate_motif_confidence
+from .motif_index import MotifHit, SectionSpec, get_motif_index, resolve_section
+from .utils import alignment_evidence, calculate_motif_confidence
 
 
-def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
-    features: List[Feature] = []
-    ori_entries = db.get("ori", [])
+# Biological heuristics:
+# - Filter out trivially short motifs (e.g., single bases) that create many false positives
+# - Prefer the longest, non-overlapping matches per ori entry
+# - Optionally respect provided length_range to downweight/skip absurd hits
 
-    # Biological heuristics:
-    # - Filter out trivially short motifs (e.g., single bases) that create many false positives
-    # - Prefer the longest, non-overlapping matches per ori entry
-    # - Optionally respect provided length_range to downweight/skip absurd hits
+MIN_MOTIF_LEN = 12  # typical ori sub-motifs (RNAI, AT-rich region) are longer than ~10bp
+MAX_MISMATCHES = 1  # keep ori tolerance tight (0-1 mismatches)
 
-    MIN_MOTIF_LEN = 12  # typical ori sub-motifs (RNAI, AT-rich region) are longer than ~10bp
-    MAX_MISMATCHES = 1  # keep ori tolerance tight (0-1 mismatches)
+MOTIF_SECTION = SectionSpec("ori", max_mismatches=MAX_MISMATCHES, min_length=MIN_MOTIF_LEN)
 
-    for entry in ori_entries:
-        raw_motifs: List[str] = entry.get("motifs", [])
-        length_range: List[int] = entry.get("length_range", [])
 
-        # Filter motifs by length
-        motifs = [m for m in raw_motifs if isinstance(m, str) and len(m) >= MIN_MOTIF_LEN]
-        if not motifs:
-            continue
+def detect(sequence: SequenceLike, db: Dict[str, object]) -> List[Feature]:
+    section = resolve_section(MOTIF_SECTION, db)
+    return from_hits(get_motif_index(db).section(section).search(sequence), db)
+
 
-        # Find fuzzy tagged hits (position, motif, strand, mismatches)
-        raw_hits = find_motifs_fuzzy_tagged(
-            sequence,
-            motifs,
-            max_mismatches=MAX_MISMATCHES,
-            circular=True,
-            include_rc=True,
-        )
-        hits: List[Tuple[int, str, str, int]] = raw_hits
-        if not hits:
+def from_hits(hits: List[MotifHit], db: Dict[str, object]) -> List[Feature]:
+    features: List[Feature] = []
+    ori_entries = db.get("ori", [])
+
+    # Group fuzzy tagged hits (position, motif, strand, mismatches, end, cigar) per entry
+    hits_by_entry: Dict[int, List[Tuple[int, str, str, int, int, str | None]]] = {}
+    for entry_idx, pos, motif, strand, mismatches, *alignment in hits:
+        end, cigar = alignment if alignment else (pos + len(motif), None)
+        hits_by_entry.setdefault(entry_idx, []).append((pos, motif, strand, mismatches, end, cigar))
+
+    for entry_idx, entry in enumerate(ori_entries):
+        length_range: List[int] = entry.get("length_range", [])
+        entry_hits = hits_by_entry.get(entry_idx)
+        if not entry_hits:
             continue
 
         # Sort hits by fewest mismatches, then motif length desc, then position
-        hits_sorted = sorted(hits, key=lambda t: (t[3], -len(t[1]), t[0]))
+        hits_sorted = sorted(entry_hits, key=lambda t: (t[3], -len(t[1]), t[0]))
 
         # Greedily select non-overlapping longest matches
-        selected: List[Tuple[int, str, str, int]] = []
-        occupied: List[Tuple[int, int]] = []  # list of [start, end)
-        for pos, motif, strand, mismatches in hits_sorted:
+        selected: List[Tuple[int, str, str, int, int, str | None]] = []
+        occupied = DisjointIntervals()
+        for pos, motif, strand, mismatches, end, cigar in hits_sorted:
             start = pos
-            end = pos + len(motif)
-            overlaps = any(not (end <= s or start >= e) for s, e in occupied)
-            if overlaps:
+            if occupied.overlaps(start, end):
                 continue
             # If length_range is provided, ensure candidate span size is plausible
             if length_range and len(motif) < min(length_range) * 0.05:  # motific chunk should be >=5% of ori span
                 continue
-            selected.append((pos, motif, strand, mismatches))
-            occupied.append((start, end))
+            selected.append((pos, motif, strand, mismatches, end, cigar))
+            occupied.add(start, end)
 
         # Emit features for selected hits only
-        for pos, motif, strand, mismatches in selected:
+        for pos, motif, strand, mismatches, end, cigar in selected:
             start = pos
-            end = pos + len(motif)
             confidence = calculate_motif_confidence(len(motif), mismatches, MAX_MISMATCHES)
             features.append(
                 Feature(
@@ -78,6 +77,7 @@ def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
                         "mismatches": mismatches,
                         "max_mismatches": MAX_MISMATCHES,
                         "pct_identity": round((len(motif) - mismatches) / len(motif) * 100, 2),
+                        **alignment_evidence(mismatches, cigar),
                     },
                 )
             )
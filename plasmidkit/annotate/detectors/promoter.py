@@ -2,42 +2,45 @@ from __future__ import annotations
 
 from typing import Dict, List
 
+from ..sequence import SequenceLike
+from ..intervals import DisjointIntervals
 from ..types import Feature
-from .utils import find_motifs_fuzzy_tagged, calculate_motif_confidence
+from .motif_index import MotifHit, SectionSpec, get_motif_index, resolve_section
+from .utils import alignment_evidence, calculate_motif_confidence
 
 
-def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
+MAX_MISMATCHES = 1
+MOTIF_SECTION = SectionSpec("promoters", max_mismatches=MAX_MISMATCHES)
+
+
+def detect(sequence: SequenceLike, db: Dict[str, object]) -> List[Feature]:
+    section = resolve_section(MOTIF_SECTION, db)
+    return from_hits(get_motif_index(db).section(section).search(sequence), db)
+
+
+def from_hits(hits: List[MotifHit], db: Dict[str, object]) -> List[Feature]:
     features: List[Feature] = []
     promoter_entries = db.get("promoters", [])
-    MAX_MISMATCHES = 1
     # Collect hits across all entries first
-    all_hits: list[tuple[int, str, str, int, str]] = []  # pos, motif, strand, mm, id
-    for entry in promoter_entries:
-        motifs = entry.get("motifs", [])
-        entry_id = entry.get("id", "promoter")
-        hits = find_motifs_fuzzy_tagged(
-            sequence,
-            motifs,
-            max_mismatches=MAX_MISMATCHES,
-            circular=True,
-            include_rc=True,
-        )
-        for pos, motif, strand, mismatches in hits:
-            all_hits.append((pos, motif, strand, mismatches, entry_id))
+    # pos, motif, strand, mm, id, end, cigar
+    all_hits: list[tuple[int, str, str, int, str, int, str | None]] = []
+    for entry_idx, pos, motif, strand, mismatches, *alignment in hits:
+        entry_id = promoter_entries[entry_idx].get("id", "promoter")
+        end, cigar = alignment if alignment else (pos + len(motif), None)
+        all_hits.append((pos, motif, strand, mismatches, entry_id, end, cigar))
 
     # Prefer fewer mismatches, longer motifs, then position
     all_hits.sort(key=lambda t: (t[3], -len(t[1]), t[0]))
 
     # Greedy non-overlapping selection across entries; collapse strand duplicates
-    occupied: list[tuple[int, int]] = []
+    occupied = DisjointIntervals()
     seen_spans: set[tuple[int, int]] = set()
-    for pos, motif, strand, mismatches, entry_id in all_hits:
+    for pos, motif, strand, mismatches, entry_id, end, cigar in all_hits:
         start = pos
-        end = pos + len(motif)
         span = (start, end)
         if span in seen_spans:
             continue
-        if any(not (end <= s or start >= e) for s, e in occupied):
+        if occupied.overlaps(start, end):
             continue
         confidence = calculate_motif_confidence(len(motif), mismatches, MAX_MISMATCHES)
         features.append(
@@ -55,9 +58,10 @@ def detect(sequence: str, db: Dict[str, object]) -> List[Feature]:
                     "mismatches": mismatches,
                     "max_mismatches": MAX_MISMATCHES,
                     "pct_identity": round((len(motif) - mismatches) / len(motif) * 100, 2),
+                    **alignment_evidence(mismatches, cigar),
                 },
             )
         )
-        occupied.append(span)
+        occupied.add(start, end)
         seen_spans.add(span)
     return features
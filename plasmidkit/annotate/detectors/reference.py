@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import edlib
+import numpy as np
+
+from ..intervals import DisjointIntervals
+from ..sequence import SequenceLike, prepare
+from ..types import Feature
+from . import kmers
+from .utils import reverse_complement
+
+# Full-length reference detector:
+# - Index the "sequence" of every ori/marker/promoter/terminator entry by (w, k)-minimizers
+# - Look up the query's minimizers, chain collinear anchors per reference and strand
+# - Verify each chain once with a banded edlib alignment of the whole reference
+# Runs in roughly linear time in the query length, instead of aligning every
+# reference against every plasmid. Not part of the default detector set.
+
+# Sections holding full-length references, with the feature type each produces
+REFERENCE_SECTIONS = {
+    "ori": "rep_origin",
+    "markers": "marker",
+    "promoters": "promoter",
+    "terminators": "terminator",
+}
+# Minimizer k-mer length (odd, so no k-mer is its own reverse complement) and window;
+# at 90% identity about a quarter of 13-mers survive, enough to anchor ~50 bp features
+K = 13
+W = 8
+# References shorter than this are left to the motif detectors
+MIN_REFERENCE_LEN = 50
+# Identity over the whole reference a match must reach; databases may set "reference_min_identity"
+MIN_IDENTITY = 0.9
+# Minimizers occurring more often than this across all references are too repetitive to anchor on
+MAX_OCCURRENCES = 256
+# Chaining: predecessors tried per anchor and the largest gap between chained anchors
+CHAIN_LOOKBACK = 50
+MAX_CHAIN_GAP = 500
+# Number of per-database indexes kept alive by get_reference_index()
+INDEX_CACHE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class Reference:
+    """One full-length database sequence."""
+
+    section: str
+    entry: int
+    id: str
+    feature_type: str
+    sequence: str
+
+
+@dataclass(frozen=True)
+class ReferenceMatch:
+    """A verified occurrence of a reference; ``end`` is exclusive and may pass the origin."""
+
+    reference: Reference
+    start: int
+    end: int
+    strand: str
+    edit_distance: int
+    anchors: int
+
+    @property
+    def identity(self) -> float:
+        return 1.0 - self.edit_distance / len(self.reference.sequence)
+
+
+class ReferenceIndex:
+    """Minimizer index over the full-length sequences of a database."""
+
+    def __init__(self, db: Mapping[str, object], k: int = K, w: int = W):
+        self.k = k
+        self.w = w
+        self.references: List[Reference] = []
+        hashes: List[np.ndarray] = []
+        owners: List[np.ndarray] = []
+        positions: List[np.ndarray] = []
+        reverse: List[np.ndarray] = []
+        for section, feature_type in REFERENCE_SECTIONS.items():
+            for entry_idx, entry in enumerate(db.get(section, []) or []):
+                sequence = entry.get("sequence") if isinstance(entry, Mapping) else None
+                if not isinstance(sequence, str) or len(sequence) < MIN_REFERENCE_LEN:
+                    continue
+                ref_idx = len(self.references)
+                sequence = sequence.upper()
+                name = str(entry.get("id", section))
+                self.references.append(Reference(section, entry_idx, name, feature_type, sequence))
+                pos, hashed, rev = kmers.minimizers(kmers.encode(sequence), k, w)
+                hashes.append(hashed)
+                owners.append(np.full(len(pos), ref_idx, dtype=np.int64))
+                positions.append(pos)
+                reverse.append(rev)
+        self.max_length = max((len(ref.sequence) for ref in self.references), default=0)
+
+        if not self.references:
+            self._hashes = np.zeros(0, dtype=np.uint64)
+            self._owners = self._positions = np.zeros(0, dtype=np.int64)
+            self._reverse = np.zeros(0, dtype=bool)
+            return
+        all_hashes = np.concatenate(hashes)
+        order = np.argsort(all_hashes, kind="stable")
+        all_hashes = all_hashes[order]
+        _unique, counts = np.unique(all_hashes, return_counts=True)
+        keep = np.repeat(counts <= MAX_OCCURRENCES, counts)
+        self._hashes = all_hashes[keep]
+        self._owners = np.concatenate(owners)[order][keep]
+        self._positions = np.concatenate(positions)[order][keep]
+        self._reverse = np.concatenate(reverse)[order][keep]
+
+    def __len__(self) -> int:
+        return len(self.references)
+
+    def search(
+        self, sequence: SequenceLike, min_identity: float = MIN_IDENTITY, circular: bool = True
+    ) -> List[ReferenceMatch]:
+        """All occurrences of references at ``min_identity`` or better, best first.
+
+        Overlapping occurrences of different references are all reported;
+        :func:`detect` keeps the best one per region and feature type.
+        """
+        prepared = prepare(sequence)
+        n = len(prepared)
+        if not n or not self.references:
+            return []
+        space = prepared.circular_view(self.max_length - 1) if circular else prepared.upper
+        matches: List[ReferenceMatch] = []
+        for (ref_idx, is_rev), (q, r) in self._anchors(space).items():
+            ref = self.references[ref_idx]
+            length = len(ref.sequence)
+            max_edits = edit_budget(length, min_identity)
+            pattern = reverse_complement(ref.sequence) if is_rev else ref.sequence
+            verified: List[int] = []
+            for q_first, r_first, anchors in _chain(q, r, self.k, max_edits):
+                # Project the chain onto the whole reference; indels move the ends
+                # by at most max_edits
+                projected = q_first - r_first
+                if any(abs(projected - done) <= max_edits for done in verified):
+                    continue
+                verified.append(projected)
+                lo = max(0, projected - max_edits)
+                hi = min(len(space), projected + length + max_edits)
+                result = edlib.align(
+                    pattern, space[lo:hi], mode="HW", task="locations", k=max_edits
+                )
+                distance = result["editDistance"]
+                if distance < 0:
+                    continue
+                begin, last = min(
+                    result["locations"], key=lambda loc: (abs(loc[1] + 1 - loc[0] - length), loc[0])
+                )
+                start = lo + begin
+                if start >= n:
+                    continue
+                strand = "-" if is_rev else "+"
+                matches.append(ReferenceMatch(ref, start, lo + last + 1, strand, distance, anchors))
+        matches.sort(
+            key=lambda m: (-m.identity, -len(m.reference.sequence), m.start, m.reference.id)
+        )
+        return matches
+
+    def _anchors(self, space: str) -> Dict[Tuple[int, bool], Tuple[List[int], List[int]]]:
+        """Shared minimizers as (query, oriented reference) positions per reference and strand.
+
+        On the reverse strand reference positions are taken on its reverse
+        complement, so every chain increases in both coordinates.
+        """
+        q_pos, q_hash, q_rev = kmers.minimizers(kmers.encode(space), self.k, self.w)
+        lo = np.searchsorted(self._hashes, q_hash, side="left")
+        hi = np.searchsorted(self._hashes, q_hash, side="right")
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            return {}
+        query_idx = np.repeat(np.arange(len(q_hash)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        target = np.repeat(lo, counts) + offsets
+        owners = self._owners[target]
+        is_rev = q_rev[query_idx] != self._reverse[target]
+        ref_pos = self._positions[target]
+        lengths = np.array([len(ref.sequence) for ref in self.references], dtype=np.int64)[owners]
+        ref_pos = np.where(is_rev, lengths - self.k - ref_pos, ref_pos)
+        query_pos = q_pos[query_idx]
+        order = np.lexsort((ref_pos, query_pos, is_rev, owners))
+        grouped: Dict[Tuple[int, bool], Tuple[List[int], List[int]]] = {}
+        for owner, rev, q, r in zip(
+            owners[order].tolist(),
+            is_rev[order].tolist(),
+            query_pos[order].tolist(),
+            ref_pos[order].tolist(),
+        ):
+            group = grouped.get((owner, rev))
+            if group is None:
+                group = grouped[(owner, rev)] = ([], [])
+            group[0].append(q)
+            group[1].append(r)
+        return grouped
+
+
+def edit_budget(length: int, min_identity: float) -> int:
+    """Most edits a ``length`` bp match may have and still reach ``min_identity``.
+
+    The small tolerance keeps float error from dropping the edit that lands
+    exactly on the threshold ((1 - 0.9) * 200 is 19.999...).
+    """
+    return max(0, math.floor((1.0 - min_identity) * length + 1e-9))
+
+
+def _chain(q: List[int], r: List[int], k: int, max_edits: int) -> List[Tuple[int, int, int]]:
+    """Collinear chains of anchors sorted by query position, best first.
+
+    Scoring follows minimap2: each anchor adds the bases it newly covers
+    and diagonal gaps cost linearly plus logarithmically; gaps wider than
+    the reference's edit budget are not bridged. Returns
+    ``(query start, reference start, anchors)`` per chain.
+    """
+    count = len(q)
+    score = [float(k)] * count
+    parent = [-1] * count
+    for i in range(count):
+        qi, ri = q[i], r[i]
+        best, best_j = float(k), -1
+        for j in range(i - 1, max(-1, i - 1 - CHAIN_LOOKBACK), -1):
+            dq = qi - q[j]
+            if dq > MAX_CHAIN_GAP:
+                break
+            dr = ri - r[j]
+            if dq <= 0 or dr <= 0:
+                continue
+            gap = abs(dq - dr)
+            if gap > max_edits:
+                continue
+            candidate = score[j] + min(dq, dr, k)
+            if gap:
+                candidate -= 0.01 * k * gap + 0.5 * math.log2(gap)
+            if candidate > best:
+                best, best_j = candidate, j
+        score[i], parent[i] = best, best_j
+
+    chains: List[Tuple[int, int, int]] = []
+    used = [False] * count
+    for end in sorted(range(count), key=lambda i: -score[i]):
+        if used[end]:
+            continue
+        i, first, anchors = end, end, 0
+        while i >= 0 and not used[i]:
+            used[i] = True
+            first, anchors = i, anchors + 1
+            i = parent[i]
+        chains.append((q[first], r[first], anchors))
+    return chains
+
+
+_INDEX_CACHE: "OrderedDict[int, Tuple[Mapping[str, object], ReferenceIndex]]" = OrderedDict()
+
+
+def get_reference_index(db: Mapping[str, object]) -> ReferenceIndex:
+    """Return the reference index for ``db``, building it on first use (see ``get_motif_index``)."""
+    key = id(db)
+    cached = _INDEX_CACHE.get(key)
+    if cached is not None and cached[0] is db:
+        _INDEX_CACHE.move_to_end(key)
+        return cached[1]
+    index = ReferenceIndex(db)
+    _INDEX_CACHE[key] = (db, index)
+    while len(_INDEX_CACHE) > INDEX_CACHE_SIZE:
+        _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def clear_reference_indexes() -> None:
+    _INDEX_CACHE.clear()
+
+
+def _min_identity(db: Mapping[str, object]) -> float:
+    value: Optional[object] = db.get("reference_min_identity")
+    return float(value) if isinstance(value, (int, float)) else MIN_IDENTITY
+
+
+def detect(sequence: SequenceLike, db: Dict[str, object]) -> List[Feature]:
+    matches = get_reference_index(db).search(sequence, _min_identity(db))
+    # Best match per region and feature type, like the motif detectors
+    occupied: Dict[str, DisjointIntervals] = {}
+    features: List[Feature] = []
+    for match in matches:
+        ref = match.reference
+        spans = occupied.setdefault(ref.feature_type, DisjointIntervals())
+        if spans.overlaps(match.start, match.end):
+            continue
+        spans.add(match.start, match.end)
+        length = len(ref.sequence)
+        features.append(
+            Feature(
+                type=ref.feature_type,
+                id=ref.id,
+                start=match.start,
+                end=match.end,
+                strand=match.strand,
+                method="reference_alignment",
+                confidence=round(match.identity, 4),
+                evidence={
+                    "section": ref.section,
+                    "reference_length": length,
+                    "edit_distance": match.edit_distance,
+                    "pct_identity": round(match.identity * 100, 2),
+                    "anchors": match.anchors,
+                },
+            )
+        )
+    features.sort(key=lambda f: (f.start, f.type))
+    return features
@@ -1,25 +1,240 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Dict
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
 
-from .utils import reverse_complement
+import numpy as np
 
+from ..sequence import SequenceLike, prepare
+from . import kmers
+from .suffix_array import adjacent_lcp, common_prefix, suffix_array
 
-def analyse(sequence: str, k: int = 12) -> Dict[str, float]:
-    seq = sequence.upper()
+# Default minimum length for repeats listed by find_repeats
+MIN_REPEAT_LENGTH = 20
+# Palindrome centres still open after this many bases are finished from suffix-array ranks
+EXPAND_STEPS = 32
+
+
+def analyse(sequence: SequenceLike, k: int = 12) -> Dict[str, float]:
+    """Count repeated k-mers and measure the longest palindrome.
+
+    ``repeat_bases`` is ``k * (copies - 1)`` summed over every k-mer seen more
+    than once; ``longest_palindrome`` is the length of the longest stretch
+    equal to its own reverse complement, or 0 if it is shorter than ``k``.
+    Windows are scored on a 2-bit encoding with NumPy; windows containing
+    non-ACGT characters are rare and handled as strings so the counts match
+    the plain string definition.
+    """
+    prepared = prepare(sequence)
+    seq = prepared.upper
+    if k > kmers.MAX_K or k < 1:
+        return _analyse_strings(seq, k)
+    count = len(seq) - k + 1
+    if count <= 0:
+        return {"repeat_bases": 0.0, "longest_palindrome": 0.0}
+
+    codes = prepared.codes
+    forward, reverse = kmers.kmer_codes(codes, k)
+    valid = kmers.valid_windows(codes, k)
+
+    _, counts = np.unique(forward[valid], return_counts=True)
+    repeated = counts[counts > 1]
+    total_repeat_bases = int((repeated - 1).sum()) * k
+
+    invalid = np.flatnonzero(~valid)
+    if invalid.size:
+        odd = Counter(seq[i : i + k] for i in invalid.tolist())
+        total_repeat_bases += sum((n - 1) * k for n in odd.values() if n > 1)
+
+    longest = longest_palindrome(codes)
+    return {
+        "repeat_bases": float(total_repeat_bases),
+        "longest_palindrome": float(longest if longest >= k else 0),
+    }
+
+
+def longest_palindrome(codes: np.ndarray) -> int:
+    """Length of the longest reverse-complement palindrome in 2-bit ``codes``.
+
+    All centres are extended together, one base per step, for up to
+    :data:`EXPAND_STEPS` bases; most centres stop within a few. Centres still
+    open (long palindromes, or self-complementary runs such as ``(AT)n``
+    where every other centre is open) are finished by :func:`_palindrome_arms`
+    from suffix arrays, so the cost no longer grows as n times the palindrome
+    length. Non-ACGT bases never pair.
+    """
+    codes = codes.astype(np.int16)
+    n = len(codes)
+    centres = np.arange(1, n, dtype=np.int64)
+    longest = 0
+    for step in range(EXPAND_STEPS):
+        left = centres - 1 - step
+        right = centres + step
+        inside = (left >= 0) & (right < n)
+        centres, left, right = centres[inside], left[inside], right[inside]
+        pairs = (codes[left] != kmers.INVALID) & (codes[right] == 3 - codes[left])
+        centres = centres[pairs]
+        if not centres.size:
+            return longest
+        longest = 2 * (step + 1)
+    return max(longest, 2 * int(_palindrome_arms(codes.astype(np.int64), centres).max()))
+
+
+def _palindrome_arms(codes: np.ndarray, centres: np.ndarray) -> np.ndarray:
+    """Arm length of each palindrome centre (between ``c - 1`` and ``c``).
+
+    An arm is the common prefix of the forward suffix at ``c`` and the
+    reverse-complement suffix reading leftwards from ``c - 1``. Rather than
+    sorting the whole sequence, windows around the centres are merged where
+    they overlap and sorted together in one suffix array; centres whose arm
+    reaches a window edge are retried with windows twice as wide.
+    """
+    n = len(codes)
+    arms = np.zeros(len(centres), dtype=np.int64)
+    pending = np.arange(len(centres))
+    radius = 4 * EXPAND_STEPS
+    while pending.size:
+        at = centres[pending]
+        lo, hi = np.maximum(at - radius, 0), np.minimum(at + radius, n)
+        first = np.flatnonzero(np.r_[True, lo[1:] > hi[:-1]])
+        segment = np.cumsum(np.r_[True, lo[1:] > hi[:-1]]) - 1
+        seg_lo, seg_hi = lo[first], np.maximum.reduceat(hi, first)
+        texts = [_strand_text(codes[a:b], circular=False)[0] for a, b in zip(seg_lo, seg_hi)]
+        offsets = np.cumsum([0] + [len(text) for text in texts])[:-1]
+        _sa, ranks = suffix_array(np.concatenate(texts))
+        # Each window's text is its forward strand, a terminator, then its reverse complement
+        local, width = at - seg_lo[segment], (seg_hi - seg_lo)[segment]
+        start = offsets[segment]
+        found = common_prefix(ranks, start + local, start + 2 * width + 1 - local)
+        arms[pending] = found
+        open_left = (found == local) & (seg_lo[segment] > 0)
+        open_right = (found == width - local) & (seg_hi[segment] < n)
+        pending = pending[open_left | open_right]
+        radius *= 2
+    return arms
+
+
+def find_repeats(
+    sequence: SequenceLike, min_length: int = MIN_REPEAT_LENGTH, circular: bool = True
+) -> Dict[str, object]:
+    """Longest direct and inverted repeats plus every repeat of ``min_length`` or more.
+
+    One suffix array is built over the sequence and its reverse complement;
+    for circular input it sorts rotations, so repeats may span the origin.
+    Any repeat shows up as suffixes sharing a prefix in that array, so the
+    LCP values give every maximal repeat in O(n log n). Direct repeats are
+    pairs of forward suffixes; inverted repeats pair a forward suffix with a
+    reverse-complement one, and include perfect palindromes.
+
+    Each listed repeat is ``{"type", "length", "positions"}`` where
+    ``positions`` holds the 0-based starts of both copies on the forward
+    strand. Lengths are capped at the sequence length.
+    """
+    prepared = prepare(sequence)
+    n = len(prepared)
+    result: Dict[str, object] = {
+        "longest_direct_repeat": 0.0,
+        "longest_inverted_repeat": 0.0,
+        "repeats": [],
+    }
+    if n < 2:
+        return result
+
+    text, period, reverse_start = _strand_text(prepared.codes.astype(np.int64), circular)
+    sa, ranks = suffix_array(text, period)
+    lcp = adjacent_lcp(sa, ranks, period)
+
+    # Direct: consecutive forward suffixes in suffix order; the LCP of two
+    # suffixes is the minimum adjacent LCP between them
+    rows = np.flatnonzero(sa < n)
+    direct_lengths = np.minimum.reduceat(np.append(lcp, 0), rows)[:-1]
+    first_direct, second_direct = sa[rows[:-1]], sa[rows[1:]]
+
+    # Inverted: neighbouring forward / reverse-complement suffixes
+    left, right = sa[:-1], sa[1:]
+    reverse_strand = (sa >= reverse_start) & (sa < reverse_start + n)
+    mixed = ((sa[:-1] < n) & reverse_strand[1:]) | (reverse_strand[:-1] & (sa[1:] < n))
+    first_inverted = np.minimum(left[mixed], right[mixed])
+    second_inverted = np.maximum(left[mixed], right[mixed])
+    inverted_lengths = lcp[mixed]
+
+    if direct_lengths.size:
+        result["longest_direct_repeat"] = float(direct_lengths.max())
+    if inverted_lengths.size:
+        result["longest_inverted_repeat"] = float(inverted_lengths.max())
+
+    found: Dict[Tuple[str, int, int], int] = {}
+    threshold = max(1, min_length)
+    candidates = [
+        ("direct", first_direct, second_direct, direct_lengths),
+        ("inverted", first_inverted, second_inverted, inverted_lengths),
+    ]
+    for kind, firsts, seconds, lengths in candidates:
+        keep = lengths >= threshold
+        pairs = zip(firsts[keep].tolist(), seconds[keep].tolist(), lengths[keep].tolist())
+        for a, b, length in pairs:
+            upstream = _previous(text, a, n, reverse_start, circular)
+            if upstream == _previous(text, b, n, reverse_start, circular):
+                continue  # not left-maximal; the repeat one base upstream covers it
+            mate = b if kind == "direct" else (n - (b - reverse_start) - length) % n
+            key = (kind, min(a, mate), max(a, mate))
+            found[key] = max(found.get(key, 0), length)
+
+    repeats: List[Dict[str, object]] = [
+        {"type": kind, "length": length, "positions": [first, second]}
+        for (kind, first, second), length in found.items()
+    ]
+    repeats.sort(key=lambda item: (-item["length"], item["type"], item["positions"]))
+    result["repeats"] = repeats
+    return result
+
+
+def _strand_text(codes: np.ndarray, circular: bool) -> Tuple[np.ndarray, Optional[int], int]:
+    """Forward strand then reverse complement as one integer text for :func:`suffix_array`.
+
+    Returns ``(text, period, reverse_start)``. Circular input is two cycles
+    of length ``n`` (sorted as rotations); linear input ends each strand
+    with its own terminator.
+    """
+    n = len(codes)
+    invalid = np.flatnonzero(codes == kmers.INVALID)
+    forward = codes.copy()
+    # Unique symbols for non-ACGT bases so they never extend a repeat
+    forward[invalid] = 6 + invalid
+    reverse = np.where(codes == kmers.INVALID, 0, 3 - codes)[::-1].copy()
+    reverse[n - 1 - invalid] = 6 + n + invalid
+    if circular:
+        return np.concatenate((forward, reverse)), n, n
+    return np.concatenate((forward, [4], reverse, [5])), None, n + 1
+
+
+def _previous(text: np.ndarray, position: int, n: int, reverse_start: int, circular: bool) -> int:
+    """Symbol before ``position`` within its strand, wrapping for circular input."""
+    base = 0 if position < n else reverse_start
+    offset = position - base
+    if offset == 0 and not circular:
+        return -1 - position
+    return int(text[base + (offset - 1) % n])
+
+
+def _analyse_strings(seq: str, k: int) -> Dict[str, float]:
     counts: Dict[str, int] = defaultdict(int)
     for i in range(len(seq) - k + 1):
         kmer = seq[i : i + k]
         counts[kmer] += 1
     total_repeat_bases = sum((count - 1) * k for count in counts.values() if count > 1)
-    longest_palindrome = 0
-    for i in range(len(seq) - k + 1):
-        kmer = seq[i : i + k]
-        rc = reverse_complement(kmer)
-        if rc == kmer:
-            longest_palindrome = max(longest_palindrome, k)
+    pairs = {"A": "T", "C": "G", "G": "C", "T": "A"}
+    longest = 0
+    for centre in range(1, len(seq)):
+        width = 0
+        while (
+            centre - 1 - width >= 0
+            and centre + width < len(seq)
+            and pairs.get(seq[centre - 1 - width]) == seq[centre + width]
+        ):
+            width += 1
+        longest = max(longest, 2 * width)
     return {
         "repeat_bases": float(total_repeat_bases),
-        "longest_palindrome": float(longest_palindrome),
+        "longest_palindrome": float(longest if longest >= k else 0),
     }
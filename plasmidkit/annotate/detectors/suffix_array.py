@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def _advance(positions: np.ndarray, step: np.ndarray, period: Optional[int]) -> np.ndarray:
+    """Index ``step`` characters after ``positions``, wrapping within each cycle."""
+    if period is None:
+        return positions + step
+    offset = positions % period
+    return positions - offset + (offset + step) % period
+
+
+def suffix_array(
+    text: np.ndarray, period: Optional[int] = None
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Suffix array of an integer ``text`` by prefix doubling.
+
+    With ``period`` the text is read as consecutive cycles of that length and
+    rotations are sorted instead of suffixes, which is how circular sequences
+    are handled without doubling them. Returns ``(sa, ranks)`` where
+    ``ranks[s][i]`` is the rank of the length ``2**s`` prefix starting at
+    ``i``. Each round is one O(n log n) sort and the number of rounds is
+    logarithmic in the longest repeat, not in ``n``. Rotations that are
+    still tied once ``2**s`` reaches the period are identical and keep an
+    arbitrary order.
+    """
+    n = len(text)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), []
+    _, inverse = np.unique(text, return_inverse=True)
+    rank = inverse.astype(np.int64).reshape(-1)
+    ranks = [rank]
+    positions = np.arange(n, dtype=np.int64)
+    h = 1
+    while rank.max() < n - 1 and (period is None or h < period):
+        if period is None:
+            second = np.full(n, -1, dtype=np.int64)
+            second[: n - h] = rank[h:]
+        else:
+            second = rank[_advance(positions, h, period)]
+        key = rank * (n + 1) + (second + 1)
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        dense = np.empty(n, dtype=np.int64)
+        dense[0] = 0
+        np.cumsum(sorted_key[1:] != sorted_key[:-1], out=dense[1:])
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = dense
+        ranks.append(rank)
+        h *= 2
+    sa = np.argsort(rank, kind="stable")
+    return sa, ranks
+
+
+def adjacent_lcp(
+    sa: np.ndarray, ranks: List[np.ndarray], period: Optional[int] = None
+) -> np.ndarray:
+    """Longest common prefix of each pair of neighbours ``sa[i], sa[i + 1]``."""
+    if len(sa) < 2:
+        return np.zeros(0, dtype=np.int64)
+    return common_prefix(ranks, sa[:-1], sa[1:], period)
+
+
+def common_prefix(
+    ranks: List[np.ndarray], left: np.ndarray, right: np.ndarray, period: Optional[int] = None
+) -> np.ndarray:
+    """Longest common prefix of the suffixes starting at each ``left[i], right[i]``.
+
+    Uses the doubling ranks: two suffixes share ``2**s`` characters exactly
+    when their rank at level ``s`` is equal, so the LCP is assembled from the
+    largest power of two downwards for all pairs at once. With ``period``
+    the values are capped at the period (identical rotations).
+    """
+    lcp = np.zeros(len(left), dtype=np.int64)
+    if not len(left):
+        return lcp
+    top = len(ranks) - 1
+    if period is None:
+        # Distinct negative sentinels past the end never compare equal
+        pad = -1 - np.arange(1 << top, dtype=np.int64)
+        ranks = [np.concatenate((rank, pad)) for rank in ranks]
+    for level in range(top, -1, -1):
+        rank = ranks[level]
+        equal = rank[_advance(left, lcp, period)] == rank[_advance(right, lcp, period)]
+        lcp += equal.astype(np.int64) << level
+    if period is not None:
+        np.minimum(lcp, period, out=lcp)
+    return lcp
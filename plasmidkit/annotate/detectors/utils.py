@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..sequence import PreparedSequence, SequenceLike, prepare
+from .motif_index import CompiledMotifs
 
 # Optional dependency: pyahocorasick
 try:
@@ -12,14 +15,21 @@ except Exception:
     _HAS_AHOCORASICK = False
 
 
-def find_motifs(sequence: str, motifs: Sequence[str], circular: bool = True) -> List[int]:
+def _search_space(prepared: PreparedSequence, motifs: Sequence[str], circular: bool) -> str:
+    # Hits must start inside the sequence, so the wrap needs one motif length at most
+    if not circular:
+        return prepared.upper
+    return prepared.circular_view(max((len(motif) for motif in motifs), default=1) - 1)
+
+
+def find_motifs(sequence: SequenceLike, motifs: Sequence[str], circular: bool = True) -> List[int]:
     # Use naive fallback for small motif sets; pyahocorasick for large sets
-    sequence_upper = sequence.upper()
+    prepared = prepare(sequence)
     hits: List[int] = []
-    if not sequence_upper:
+    if not len(prepared):
         return hits
-    search_space = sequence_upper + (sequence_upper if circular else "")
-    seq_len = len(sequence_upper)
+    search_space = _search_space(prepared, motifs, circular)
+    seq_len = len(prepared)
 
     if len(motifs) < 8:
         for motif in motifs:
@@ -66,12 +76,14 @@ def find_motifs(sequence: str, motifs: Sequence[str], circular: bool = True) ->
     return sorted(set(hits))
 
 
-def find_motifs_tagged(sequence: str, motifs: Sequence[str], circular: bool = True) -> List[Tuple[int, str]]:
-    sequence_upper = sequence.upper()
-    if not sequence_upper or not motifs:
+def find_motifs_tagged(
+    sequence: SequenceLike, motifs: Sequence[str], circular: bool = True
+) -> List[Tuple[int, str]]:
+    prepared = prepare(sequence)
+    if not len(prepared) or not motifs:
         return []
-    search_space = sequence_upper + (sequence_upper if circular else "")
-    seq_len = len(sequence_upper)
+    search_space = _search_space(prepared, motifs, circular)
+    seq_len = len(prepared)
 
     # Naive path for small motif sets
     if len(motifs) < 8:
@@ -121,7 +133,7 @@ def find_motifs_tagged(sequence: str, motifs: Sequence[str], circular: bool = Tr
 
 
 def find_motifs_fuzzy_tagged(
-    sequence: str,
+    sequence: SequenceLike,
     motifs: Sequence[str],
     max_mismatches: int = 2,
     circular: bool = True,
@@ -134,129 +146,67 @@ def find_motifs_fuzzy_tagged(
     exactly (forward and reverse-complement) to get candidate starts, then
     verify full Hamming distance at those starts. This avoids full sliding.
 
+    This compiles the motifs on every call; detectors scanning the same
+    database repeatedly should use ``motif_index.get_motif_index`` instead.
+
     Returns a list of tuples: (start_position, original_motif, strand, mismatches)
     where strand is "+" for forward and "-" for reverse-complement matches.
     """
-    sequence_upper = sequence.upper()
-    if not sequence_upper or not motifs:
+    if not len(sequence) or not motifs:
         return []
-    search_space = sequence_upper + (sequence_upper if circular else "")
-    seq_len = len(sequence_upper)
-
-    def reverse_complement_local(seq: str) -> str:
-        tbl = str.maketrans("ACGT", "TGCA")
-        return seq.translate(tbl)[::-1]
-
-    def hamming_at(space: str, start: int, pattern: str, limit: int) -> int | None:
-        mismatches = 0
-        plen = len(pattern)
-        # Bounds check first
-        if start < 0 or start + plen > len(space):
-            return None
-        for j in range(plen):
-            if space[start + j] != pattern[j]:
-                mismatches += 1
-                if mismatches > limit:
-                    return None
-        return mismatches
-
-    def iter_seed_hits(space: str, seed: str) -> List[int]:
-        pos_list: List[int] = []
-        start = 0
-        while True:
-            idx = space.find(seed, start)
-            if idx == -1:
-                break
-            pos_list.append(idx)
-            start = idx + 1
-        return pos_list
-
-    best: dict[Tuple[int, str, str], int] = {}
-
-    # Cap mismatches to small integer for performance guarantees
-    d = 0 if max_mismatches <= 0 else 1 if max_mismatches == 1 else 2
+    compiled = CompiledMotifs([motifs], max_mismatches=max_mismatches, include_rc=include_rc)
+    return [
+        (pos, motif, strand, mm)
+        for _entry, pos, motif, strand, mm in compiled.search(sequence, circular)
+    ]
 
-    for motif in motifs:
-        if not motif:
-            continue
-        mu = motif.upper()
-        mlen = len(mu)
-        if mlen == 0 or mlen > len(search_space):
-            continue
-
-        # Choose number of seeds = d+1, with minimum seed length
-        num_seeds = d + 1
-        # Avoid too-short seeds which create many candidates
-        min_seed_len = 8
-        # Compute seed spans (roughly equal partitions)
-        base = mlen // num_seeds
-        extra = mlen % num_seeds
-        seeds: List[Tuple[int, int]] = []  # list of (offset, length)
-        offset = 0
-        for i in range(num_seeds):
-            seg_len = base + (1 if i < extra else 0)
-            if seg_len <= 0:
-                continue
-            seeds.append((offset, seg_len))
-            offset += seg_len
-        # If any seed is too short, merge adjacent segments to reach min_seed_len where possible
-        merged: List[Tuple[int, int]] = []
-        i = 0
-        while i < len(seeds):
-            off, ln = seeds[i]
-            while ln < min_seed_len and i + 1 < len(seeds):
-                # merge with next
-                n_off, n_ln = seeds[i + 1]
-                ln = (n_off + n_ln) - off
-                i += 1
-            merged.append((off, ln))
-            i += 1
-        if merged:
-            seeds = merged
-
-        patterns: List[Tuple[str, str]] = [(mu, "+")]
-        rc = reverse_complement_local(mu) if include_rc else None
-        if rc is not None:
-            patterns.append((rc, "-"))
-
-        for pat, strand in patterns:
-            for seed_off, seed_len in seeds:
-                seed = pat[seed_off : seed_off + seed_len]
-                if not seed:
-                    continue
-                for hit in iter_seed_hits(search_space, seed):
-                    start_idx = hit - seed_off
-                    if start_idx >= seq_len:
-                        # Only record candidates starting in first copy for circular handling
-                        continue
-                    mm = hamming_at(search_space, start_idx, pat, d)
-                    if mm is None:
-                        continue
-                    key = (start_idx, motif, strand)
-                    prev = best.get(key)
-                    if prev is None or mm < prev:
-                        best[key] = mm
-
-    hits: List[Tuple[int, str, str, int]] = [
-        (pos, motif, strand, mm) for (pos, motif, strand), mm in best.items()
+
+def find_motifs_edit_tagged(
+    sequence: SequenceLike,
+    motifs: Sequence[str],
+    max_edits: int = 2,
+    circular: bool = True,
+    include_rc: bool = True,
+) -> List[Tuple[int, int, str, str, int, str]]:
+    """Fuzzy motif search by edit distance, tolerating small insertions and deletions.
+
+    Candidates come from the same pigeonhole seeds as
+    :func:`find_motifs_fuzzy_tagged` (``max_edits + 1`` per motif); each is
+    aligned with edlib in infix mode on a window around the seed.
+    ``max_edits`` is capped at ``motif_index.MAX_EDITS``.
+
+    Returns a list of tuples: (start, end, original_motif, strand, edit_distance, cigar)
+    with ``end`` exclusive. The CIGAR aligns the motif (as read on ``strand``)
+    to the matched bases in edlib's extended form: "I" marks a motif base
+    missing from the sequence, "D" an extra base in the sequence.
+    """
+    if not len(sequence) or not motifs or max_edits <= 0:
+        return []
+    compiled = CompiledMotifs([motifs], include_rc=include_rc, max_edits=max_edits)
+    return [
+        (pos, end, motif, strand, distance, cigar)
+        for _entry, pos, motif, strand, distance, end, cigar in compiled.search(sequence, circular)
     ]
-    hits.sort(key=lambda t: (t[3], -len(t[1]), t[0], t[2]))
-    return hits
 
 
-def gc_content(sequence: str) -> float:
-    sequence_upper = sequence.upper()
-    if not sequence_upper:
-        return 0.0
-    gc = sum(1 for base in sequence_upper if base in {"G", "C"})
-    return gc / len(sequence_upper)
+def gc_content(sequence: SequenceLike) -> float:
+    return prepare(sequence).gc_fraction
 
 
-def reverse_complement(sequence: str) -> str:
+def reverse_complement(sequence: SequenceLike) -> str:
+    if isinstance(sequence, PreparedSequence):
+        return sequence.reverse_complement
     complement = str.maketrans("ACGT", "TGCA")
     return sequence.upper().translate(complement)[::-1]
 
 
+def alignment_evidence(mismatches: int, cigar: Optional[str]) -> Dict[str, object]:
+    """Extra evidence for edit-distance hits (empty for Hamming hits)."""
+    if cigar is None:
+        return {}
+    return {"edit_distance": mismatches, "cigar": cigar}
+
+
 def calculate_motif_confidence(motif_length: int, mismatches: int, max_mismatches: int) -> float:
     """Calculate confidence score for a motif match using BLAST-like principles.
     
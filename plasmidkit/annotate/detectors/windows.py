@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+from ..sequence import SequenceLike, prepare
+from . import kmers
+
+# Defaults follow common synthesis vendor rules (GC 25-75% in any 50 bp window)
+WINDOW = 50
+GC_MIN = 0.25
+GC_MAX = 0.75
+# Bases in runs at least this long count towards homopolymer density
+HOMOPOLYMER_RUN = 4
+# k-mers recurring within one window length count towards local repeat content
+REPEAT_K = 8
+# Windows whose homopolymer or repeat fraction reaches this are flagged
+DENSITY_LIMIT = 0.5
+# Number of worst windows reported per metric
+WORST = 5
+
+
+def window_sums(prefix: np.ndarray, window: int, circular: bool = True) -> np.ndarray:
+    """Sum over every window of length ``window`` from a prefix-sum array.
+
+    ``prefix[i]`` is the total of the first ``i`` positions. Circular input
+    yields one window per start position, wrapping across the origin without
+    copying the sequence; linear input yields ``n - window + 1`` windows.
+    """
+    n = len(prefix) - 1
+    if not circular:
+        return prefix[window:] - prefix[:-window]
+    starts = np.arange(n, dtype=np.int64)
+    ends = starts + window
+    wrapped = np.maximum(ends - n, 0)
+    return prefix[np.minimum(ends, n)] - prefix[starts] + prefix[wrapped]
+
+
+def _prefix(indicator: np.ndarray) -> np.ndarray:
+    prefix = np.zeros(len(indicator) + 1, dtype=np.int64)
+    np.cumsum(indicator, out=prefix[1:])
+    return prefix
+
+
+def _homopolymer_bases(array: np.ndarray, min_run: int, circular: bool = False) -> np.ndarray:
+    """Boolean mask of bases inside runs of one character at least ``min_run`` long.
+
+    With ``circular`` a run ending at the last base continues into the first.
+    """
+    starts = np.concatenate(([0], np.flatnonzero(array[1:] != array[:-1]) + 1))
+    runs = np.diff(np.concatenate((starts, [array.size])))
+    long_runs = runs >= min_run
+    if circular and runs.size > 1 and array[0] == array[-1]:
+        long_runs[0] = long_runs[-1] = runs[0] + runs[-1] >= min_run
+    return np.repeat(long_runs, runs)
+
+
+def _local_repeat_bases(
+    codes: np.ndarray, k: int, window: int, circular: bool = False
+) -> np.ndarray:
+    """Boolean mask of bases covered by a k-mer that recurs less than ``window`` bases away.
+
+    With ``circular`` k-mers and distances wrap across the origin: the mask
+    is built over the sequence extended by its first ``window + k - 2``
+    bases, then folded back onto the original positions.
+    """
+    n = len(codes)
+    if circular and n:
+        extended = _local_repeat_bases(np.resize(codes, n + window + k - 2), k, window)
+        return np.bincount(np.flatnonzero(extended) % n, minlength=n) > 0
+    covered = np.zeros(n, dtype=bool)
+    if n < k:
+        return covered
+    forward, _ = kmers.kmer_codes(codes, k)
+    positions = np.flatnonzero(kmers.valid_windows(codes, k))
+    if positions.size < 2:
+        return covered
+    # Sorting by (code, position) puts each occurrence next to the previous one
+    order = np.lexsort((positions, forward[positions]))
+    codes_sorted = forward[positions][order]
+    positions_sorted = positions[order]
+    same = codes_sorted[1:] == codes_sorted[:-1]
+    close = same & (positions_sorted[1:] - positions_sorted[:-1] < window)
+    starts = np.unique(np.concatenate((positions_sorted[:-1][close], positions_sorted[1:][close])))
+    delta = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(delta, starts, 1)
+    np.add.at(delta, starts + k, -1)
+    return np.cumsum(delta[:-1]) > 0
+
+
+def _regions(flagged: np.ndarray, circular: bool) -> int:
+    """Number of runs of consecutive flagged window starts."""
+    if not flagged.size:
+        return 0
+    count = int(np.count_nonzero(flagged[1:] & ~flagged[:-1])) + int(flagged[0])
+    if circular and count > 1 and flagged[0] and flagged[-1]:
+        count -= 1  # the run wraps across the origin
+    return count
+
+
+def _worst(
+    scores: np.ndarray,
+    values: np.ndarray,
+    window: int,
+    n: int,
+    count: int,
+    key: str,
+    circular: bool,
+) -> List[Dict[str, float]]:
+    """Highest-scoring windows that do not overlap each other, worst first."""
+    # Overlap suppression rarely needs more than a couple of windows' worth of
+    # candidates per pick; only fall back to a full sort when it does
+    limit = min(scores.size, max(1, count) * window * 2)
+    while True:
+        if limit < scores.size:
+            candidates = np.argpartition(-scores, limit - 1)[:limit]
+            candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        else:
+            candidates = np.argsort(-scores, kind="stable")
+        picked: List[int] = []
+        for start in candidates.tolist():
+            if len(picked) >= count:
+                break
+            distances = [abs(start - other) for other in picked]
+            if any((min(d, n - d) if circular else d) < window for d in distances):
+                continue
+            picked.append(start)
+        if len(picked) >= count or limit >= scores.size:
+            break
+        limit = scores.size
+    return [
+        {"start": start, "end": start + window, key: round(float(values[start]), 4)}
+        for start in picked
+    ]
+
+
+def analyse(
+    sequence: SequenceLike,
+    window: int = WINDOW,
+    gc_min: float = GC_MIN,
+    gc_max: float = GC_MAX,
+    circular: bool = True,
+    worst: int = WORST,
+) -> Dict[str, object]:
+    """Local GC, homopolymer and repeat content over every ``window``-bp window.
+
+    Each metric is a prefix sum over a per-base indicator, so all windows
+    cost O(n) together. ``*_regions`` count runs of consecutive failing
+    windows (GC outside ``[gc_min, gc_max]``; homopolymer or local repeat
+    fraction of at least ``DENSITY_LIMIT``). ``worst_*`` list the worst
+    non-overlapping windows; for circular input ``end`` may exceed the
+    length when a window spans the origin.
+    """
+    prepared = prepare(sequence)
+    n = len(prepared)
+    result: Dict[str, object] = {
+        "window": 0,
+        "gc_min": 0.0,
+        "gc_max": 0.0,
+        "gc_regions": 0,
+        "homopolymer_max": 0.0,
+        "homopolymer_regions": 0,
+        "repeat_max": 0.0,
+        "repeat_regions": 0,
+        "worst_gc": [],
+        "worst_homopolymer": [],
+        "worst_repeat": [],
+    }
+    if n == 0:
+        return result
+    window = min(window, n)
+    circular = circular and window < n
+
+    gc = window_sums(prepared.gc_prefix, window, circular) / window
+    homopolymer_bases = _homopolymer_bases(prepared.array, HOMOPOLYMER_RUN, circular)
+    repeat_bases = _local_repeat_bases(prepared.codes, REPEAT_K, window, circular)
+    homopolymer = window_sums(_prefix(homopolymer_bases), window, circular) / window
+    repeat = window_sums(_prefix(repeat_bases), window, circular) / window
+
+    gc_failing = (gc < gc_min) | (gc > gc_max)
+    result.update(
+        {
+            "window": window,
+            "gc_min": round(float(gc.min()), 4),
+            "gc_max": round(float(gc.max()), 4),
+            "gc_regions": _regions(gc_failing, circular),
+            "homopolymer_max": round(float(homopolymer.max()), 4),
+            "homopolymer_regions": _regions(homopolymer >= DENSITY_LIMIT, circular),
+            "repeat_max": round(float(repeat.max()), 4),
+            "repeat_regions": _regions(repeat >= DENSITY_LIMIT, circular),
+            "worst_gc": _worst(np.abs(gc - 0.5), gc, window, n, worst, "gc", circular),
+            "worst_homopolymer": _worst(
+                homopolymer, homopolymer, window, n, worst, "fraction", circular
+            ),
+            "worst_repeat": _worst(repeat, repeat, window, n, worst, "fraction", circular),
+        }
+    )
+    return result
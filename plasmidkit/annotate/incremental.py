@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from Bio.Data import CodonTable
+
+from .detectors import _DEFAULT_ORDER, _load_detector
+from .detectors.motif_index import MotifHit, SectionSpec, get_motif_index, resolve_section
+from .sequence import PreparedSequence, SequenceLike, prepare
+from .types import Feature
+
+_ORF_DETECTOR = "orf_prodigal"
+# Bases around an ORF that Prodigal reads when scoring it (start context, RBS)
+ORF_CONTEXT = 25
+_COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+@dataclass(frozen=True)
+class Edit:
+    """Replace ``deleted`` bases at 0-based ``position`` with ``inserted``.
+
+    Positions refer to the sequence the edit is applied to. Deletions may
+    not run past the end of the sequence.
+    """
+
+    position: int
+    deleted: int = 0
+    inserted: str = ""
+
+    @property
+    def delta(self) -> int:
+        return len(self.inserted) - self.deleted
+
+
+@dataclass
+class AnnotationState:
+    """Annotation of one sequence plus what is needed to update it after edits.
+
+    Besides the features this keeps the raw motif hits of every section, so
+    :func:`apply_edit` can shift the hits an edit leaves intact, rescan only
+    around the edit and re-select features exactly as a full run would.
+    """
+
+    sequence: PreparedSequence
+    db: Mapping[str, object] = field(repr=False)
+    detectors: List[str]
+    features: List[Feature]
+    hits: Dict[SectionSpec, List[MotifHit]] = field(repr=False)
+    by_detector: List[List[Feature]] = field(repr=False)
+    # Whether the last update re-ran the ORF detector (always true for a fresh annotation)
+    orfs_recomputed: bool = True
+
+
+def annotate_state(
+    sequence: SequenceLike, db: Mapping[str, object], detectors: Iterable[str] | None = None
+) -> AnnotationState:
+    """Annotate ``sequence`` like ``run_detectors``, keeping state for incremental updates."""
+    prepared = prepare(sequence)
+    order = list(detectors) if detectors else list(_DEFAULT_ORDER)
+    modules = [_load_detector(name) for name in order]
+    specs = [
+        resolve_section(module.MOTIF_SECTION, db)
+        for module in modules
+        if hasattr(module, "MOTIF_SECTION")
+    ]
+    hits = get_motif_index(db).scan(prepared, specs) if specs else {}
+    by_detector = [
+        (
+            module.from_hits(hits[resolve_section(module.MOTIF_SECTION, db)], db)
+            if hasattr(module, "MOTIF_SECTION")
+            else module.detect(prepared, db)
+        )
+        for module in modules
+    ]
+    return AnnotationState(prepared, db, order, _flatten(by_detector), hits, by_detector)
+
+
+def apply_edits(state: AnnotationState, edits: Sequence[Edit]) -> AnnotationState:
+    """Apply ``edits`` one after another; each uses the coordinates left by the previous one."""
+    for edit in edits:
+        state = apply_edit(state, edit)
+    return state
+
+
+def apply_edit(state: AnnotationState, edit: Edit) -> AnnotationState:
+    """Annotation of ``state.sequence`` after ``edit``, without rescanning the whole sequence.
+
+    Motif hits clear of the edit are shifted. The sequence is rescanned only
+    in a window reaching one longest-motif length either side of the
+    inserted bases, and detectors re-select features from the merged hits,
+    so motif features equal those of a full run. Prodigal runs again only if
+    the edit touches a predicted ORF (or its start context) or leaves an open
+    reading frame long enough for a gene across the edit; otherwise ORFs are
+    shifted. Other detectors without a motif section run in full, as do
+    edit-distance sections: an indel-tolerant match can align equally well at
+    neighbouring starts, and which one is reported depends on context a
+    window cannot see.
+    """
+    n = len(state.sequence)
+    position, deleted, inserted = edit.position, edit.deleted, edit.inserted
+    if not 0 <= position <= n or deleted < 0 or position + deleted > n:
+        raise ValueError(f"Edit {edit!r} does not fit a sequence of length {n}")
+    text = state.sequence.text
+    sequence = prepare(text[:position] + inserted + text[position + deleted :])
+    db = state.db
+
+    hits = _update_hits(state, sequence, position, deleted, len(inserted))
+    orfs_recomputed = False
+    by_detector: List[List[Feature]] = []
+    for name, previous in zip(state.detectors, state.by_detector):
+        module = _load_detector(name)
+        if hasattr(module, "MOTIF_SECTION"):
+            by_detector.append(
+                module.from_hits(hits[resolve_section(module.MOTIF_SECTION, db)], db)
+            )
+        elif name == _ORF_DETECTOR and not _orfs_affected(
+            previous, sequence, position, deleted, len(inserted), db
+        ):
+            by_detector.append(
+                [_shift_orf(feature, position + deleted, edit.delta) for feature in previous]
+            )
+        else:
+            orfs_recomputed = orfs_recomputed or name == _ORF_DETECTOR
+            by_detector.append(module.detect(sequence, db))
+    return AnnotationState(
+        sequence,
+        db,
+        list(state.detectors),
+        _flatten(by_detector),
+        hits,
+        by_detector,
+        orfs_recomputed,
+    )
+
+
+def _flatten(by_detector: Sequence[List[Feature]]) -> List[Feature]:
+    return [feature for found in by_detector for feature in found]
+
+
+def _circular_slice(text: str, start: int, length: int) -> str:
+    n = len(text)
+    start %= n
+    if start + length <= n:
+        return text[start : start + length]
+    return text[start:] + text[: start + length - n]
+
+
+def _hit_survives(start: int, length: int, n: int, position: int, deleted: int) -> bool:
+    """Whether a hit spanning ``[start, start + length)`` (circularly) avoids the edit."""
+    end = start + length
+    if end <= n:
+        return end <= position or start >= position + deleted
+    # The hit wraps the origin: the edit must fall between its two parts
+    return end - n <= position and position + deleted <= start
+
+
+def _update_hits(
+    state: AnnotationState, sequence: PreparedSequence, position: int, deleted: int, inserted: int
+) -> Dict[SectionSpec, List[MotifHit]]:
+    index = get_motif_index(state.db)
+    updated: Dict[SectionSpec, List[MotifHit]] = {}
+    edit_specs = [spec for spec in state.hits if spec.max_edits]
+    if edit_specs:
+        updated.update(index.scan(sequence, edit_specs))
+    specs = [spec for spec in state.hits if not spec.max_edits]
+    if not specs:
+        return updated
+    scanner = index.scanner(specs)
+    n, new_n = len(state.sequence), len(sequence)
+    # New hits must overlap the inserted bases (or the junction of a pure deletion)
+    flank = max(scanner.max_pattern_len - 1, 0)
+    width = 2 * flank + inserted
+    if n == 0 or width >= new_n:
+        updated.update(index.scan(sequence, specs))
+        return updated
+
+    window_start = position - flank
+    fresh = scanner.scan(_circular_slice(sequence.upper, window_start, width), circular=False)
+    delta = inserted - deleted
+    for spec, section, window_hits in zip(specs, scanner.sections, fresh):
+        # Shifting keeps surviving hits in order, so new ones are merged in
+        kept: List[MotifHit] = []
+        for entry, start, motif, strand, mismatches in state.hits[spec]:
+            if _hit_survives(start, len(motif), n, position, deleted):
+                shifted = start + delta if start >= position + deleted else start
+                kept.append((entry, shifted, motif, strand, mismatches))
+        section.merge_hits(
+            kept,
+            [
+                (entry, (window_start + start) % new_n, motif, strand, mismatches)
+                for entry, start, motif, strand, mismatches in window_hits
+                if start < flank + inserted and start + len(motif) > flank
+            ],
+        )
+        updated[spec] = kept
+    return updated
+
+
+def _orf_span(feature: Feature) -> Tuple[int, int]:
+    # Prodigal coordinates are 1-based and inclusive
+    return feature.start - 1, feature.end
+
+
+def _shift_orf(feature: Feature, after: int, delta: int) -> Feature:
+    start, _end = _orf_span(feature)
+    if start < after or not delta:
+        return feature
+    begin, end = feature.start + delta, feature.end + delta
+    return replace(feature, start=begin, end=end, id=f"prodigal_orf_{begin}_{end}")
+
+
+def _orfs_affected(
+    previous: Sequence[Feature],
+    sequence: PreparedSequence,
+    position: int,
+    deleted: int,
+    inserted: int,
+    db: Mapping[str, object],
+) -> bool:
+    from .detectors import orf_prodigal
+
+    for feature in previous:
+        start, end = _orf_span(feature)
+        if start - ORF_CONTEXT < position + deleted and end + ORF_CONTEXT > position:
+            return True
+    min_len_aa, min_len_nt, genetic_code = orf_prodigal._settings(db)
+    table = CodonTable.unambiguous_dna_by_id.get(genetic_code)
+    if table is None:
+        return True
+    # Open stretch between stops, excluding the stop codon itself
+    min_open = max(min_len_nt, 3 * min_len_aa) - 3
+    # A pure deletion can only create an ORF across the new junction
+    region = (position, position + inserted) if inserted else (position - 1, position + 1)
+    return _open_frame_overlaps(sequence.upper, region, min_open, set(table.stop_codons))
+
+
+def _open_frame_overlaps(text: str, region: Tuple[int, int], min_open: int, stops: set) -> bool:
+    """Whether a stop-free stretch of ``min_open`` bases, in any of six frames, overlaps ``region``.
+
+    Only a window reaching ``min_open`` bases past the region is read; its
+    edges count as open, which errs towards re-running the gene caller.
+    """
+    lo = max(0, region[0] - min_open - 3)
+    hi = min(len(text), region[1] + min_open + 3)
+    window = text[lo:hi]
+    size = len(window)
+    forward = (max(region[0], 0) - lo, min(region[1], len(text)) - lo)
+    reverse = (size - forward[1], size - forward[0])
+    for strand, (first, last) in (
+        (window, forward),
+        (window.translate(_COMPLEMENT)[::-1], reverse),
+    ):
+        for frame in range(3):
+            open_start = frame
+            for codon in range(frame, size - 2, 3):
+                if strand[codon : codon + 3] in stops:
+                    if codon - open_start >= min_open and open_start < last and codon > first:
+                        return True
+                    open_start = codon + 3
+            if size - open_start >= min_open and open_start < last and size > first:
+                return True
+    return False
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import bisect
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .types import Feature
+
+
+class DisjointIntervals:
+    """Sorted set of non-overlapping half-open intervals with O(log n) overlap checks.
+
+    Used by detectors that greedily keep the best hit in each region: every
+    accepted span is disjoint from the ones before it, so a single bisect on
+    the starts finds the only interval that could overlap a candidate.
+    """
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._starts, self._ends)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Whether ``[start, end)`` overlaps any stored interval."""
+        idx = bisect.bisect_left(self._starts, end)
+        # Stored intervals are disjoint, so their ends increase with their starts
+        return idx > 0 and self._ends[idx - 1] > start
+
+    def add(self, start: int, end: int) -> None:
+        """Store ``[start, end)``, which must not overlap a stored interval."""
+        idx = bisect.bisect_left(self._starts, start)
+        self._starts.insert(idx, start)
+        self._ends.insert(idx, end)
+
+
+class FeatureIndex:
+    """Read-only index over annotated features for region, type and proximity queries.
+
+    Features are kept sorted by start in an implicit augmented interval tree
+    (the layout used by cgranges): the sorted array is read as a balanced
+    binary tree and every node stores the largest end in its subtree, so
+    overlap queries take O(log n + k) for k results. Coordinates are taken as
+    given; features crossing the origin keep ``end`` past the sequence length,
+    as the detectors report them.
+    """
+
+    def __init__(self, features: Iterable[Feature]):
+        self.features: List[Feature] = sorted(features, key=lambda f: (f.start, f.end))
+        self._starts = [feature.start for feature in self.features]
+        self._ends = [feature.end for feature in self.features]
+        self._max_end, self._root_level = _build_tree(self._ends)
+        # Running maximum of ends (and where it occurs) for nearest-feature queries to the left
+        self._prefix_end: List[Tuple[int, int]] = []
+        best = (-1, -1)
+        for idx, end in enumerate(self._ends):
+            if end > best[0]:
+                best = (end, idx)
+            self._prefix_end.append(best)
+        self._by_type: Dict[str, FeatureIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __iter__(self) -> Iterator[Feature]:
+        return iter(self.features)
+
+    def overlapping(self, start: int, end: int) -> List[Feature]:
+        """Features overlapping ``[start, end)``, ordered by start."""
+        return [self.features[idx] for idx in self._overlap_indices(start, end)]
+
+    def types(self) -> List[str]:
+        return sorted({feature.type for feature in self.features})
+
+    def of_type(self, feature_type: str) -> List[Feature]:
+        """Features of ``feature_type``, ordered by start."""
+        return list(self._typed(feature_type).features)
+
+    def has_type(self, feature_type: str) -> bool:
+        return bool(self._typed(feature_type).features)
+
+    def nearest(self, position: int, feature_type: Optional[str] = None) -> Optional[Feature]:
+        """Feature closest to ``position`` (distance 0 when it covers it), optionally of one type.
+
+        Ties go to the feature that starts first.
+        """
+        index = self._typed(feature_type) if feature_type is not None else self
+        if not index.features:
+            return None
+        covering = index._overlap_indices(position, position + 1)
+        if covering:
+            return index.features[covering[0]]
+        candidates: List[Tuple[int, int]] = []
+        right = bisect.bisect_left(index._starts, position)
+        if right < len(index.features):
+            candidates.append((index._starts[right] - position, right))
+        if right > 0:
+            # Nothing covers ``position``, so every feature starting before it ends at or before it
+            end, left = index._prefix_end[right - 1]
+            candidates.append((position - end, left))
+        _distance, idx = min(candidates, key=lambda c: (c[0], index._starts[c[1]]))
+        return index.features[idx]
+
+    def _typed(self, feature_type: str) -> "FeatureIndex":
+        index = self._by_type.get(feature_type)
+        if index is None:
+            index = FeatureIndex(f for f in self.features if f.type == feature_type)
+            self._by_type[feature_type] = index
+        return index
+
+    def _overlap_indices(self, start: int, end: int) -> List[int]:
+        count = len(self.features)
+        if not count:
+            return []
+        starts, ends, max_end = self._starts, self._ends, self._max_end
+        found: List[int] = []
+        # (node, level, left subtree done); traversal yields indices in sorted order
+        stack = [((1 << self._root_level) - 1, self._root_level, False)]
+        while stack:
+            node, level, left_done = stack.pop()
+            if level <= 3:
+                # Small subtree: scan it directly
+                first = node >> level << level
+                last = min(first + (1 << (level + 1)) - 1, count)
+                for idx in range(first, last):
+                    if starts[idx] >= end:
+                        break
+                    if ends[idx] > start:
+                        found.append(idx)
+            elif not left_done:
+                stack.append((node, level, True))
+                child = node - (1 << (level - 1))
+                # The left child may lie past the array end, in which case its subtree is partial
+                if child >= count or max_end[child] > start:
+                    stack.append((child, level - 1, False))
+            elif node < count and starts[node] < end:
+                if ends[node] > start:
+                    found.append(node)
+                stack.append((node + (1 << (level - 1)), level - 1, False))
+        return found
+
+
+def _build_tree(ends: List[int]) -> Tuple[List[int], int]:
+    """Subtree maxima of ``ends`` in implicit-tree order, and the root's level.
+
+    Node ``i`` sits at level ``k`` when ``i`` ends in exactly ``k`` one bits;
+    its children are ``i - 2**(k-1)`` and ``i + 2**(k-1)``.
+    """
+    count = len(ends)
+    max_end = list(ends)
+    if not count:
+        return max_end, 0
+    last_idx = (count - 1) & ~1
+    last = ends[last_idx]
+    level = 1
+    while 1 << level <= count:
+        half = 1 << (level - 1)
+        for idx in range((half << 1) - 1, count, half << 2):
+            right = max_end[idx + half] if idx + half < count else last
+            max_end[idx] = max(ends[idx], max_end[idx - half], right)
+        # Track the subtree max of the rightmost node at this level, for partial subtrees
+        last_idx = last_idx - half if (last_idx >> level) & 1 else last_idx + half
+        if last_idx < count and max_end[last_idx] > last:
+            last = max_end[last_idx]
+        level += 1
+    return max_end, level - 1
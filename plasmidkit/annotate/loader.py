@@ -21,33 +21,31 @@ def normalise_sequence(sequence: str) -> str:
     return "".join(filtered)
 
 
-def load_record(source: str | Path | SeqRecord, is_sequence: Optional[bool] = None) -> SeqRecord:
-    if isinstance(source, SeqRecord):
-        return source
+def _source_path(source: str | Path, is_sequence: Optional[bool]) -> Optional[Path]:
+    """Return the file to read for ``source``, or None if it is a raw sequence."""
     # Path objects are always treated as files
     if isinstance(source, Path):
-        if source.exists():
-            return next(SeqIO.parse(str(source), infer_format(source)))
         # If an explicit Path does not exist, fall back to sequence interpretation
-        return SeqRecord(Seq(normalise_sequence(str(source))), id="sequence")
-    if isinstance(source, str):
-        # If caller specifies interpretation, honor it
-        if is_sequence is True:
-            return SeqRecord(Seq(normalise_sequence(source)), id="sequence")
-        if is_sequence is False:
-            path = Path(source)
-            if path.exists():
-                return next(SeqIO.parse(str(path), infer_format(path)))
-            # Backward-compatible fallback: interpret as sequence if file not found
-            return SeqRecord(Seq(normalise_sequence(source)), id="sequence")
-        # Heuristic when not specified: long strings are likely raw sequences
-        if len(source) >= 1000:
-            return SeqRecord(Seq(normalise_sequence(source)), id="sequence")
-        # Otherwise prefer file if present, else interpret as sequence
-        path = Path(source)
-        if path.exists():
+        return source if source.exists() else None
+    # If caller specifies interpretation, honor it
+    if is_sequence is True:
+        return None
+    # Heuristic when not specified: long strings are likely raw sequences
+    if is_sequence is None and len(source) >= 1000:
+        return None
+    # Otherwise prefer file if present, else interpret as sequence (backward-compatible fallback)
+    path = Path(source)
+    return path if path.exists() else None
+
+
+def load_record(source: str | Path | SeqRecord, is_sequence: Optional[bool] = None) -> SeqRecord:
+    if isinstance(source, SeqRecord):
+        return source
+    if isinstance(source, (str, Path)):
+        path = _source_path(source, is_sequence)
+        if path is not None:
             return next(SeqIO.parse(str(path), infer_format(path)))
-        return SeqRecord(Seq(normalise_sequence(source)), id="sequence")
+        return SeqRecord(Seq(normalise_sequence(str(source))), id="sequence")
     raise TypeError(f"Unsupported source type: {type(source)!r}")
 
 
@@ -61,8 +59,20 @@ def infer_format(path: Path) -> str:
 
 
 def iter_records(source: str | Path | Iterable[str | Path | SeqRecord], is_sequence: Optional[bool] = None) -> Iterator[SeqRecord]:
-    if isinstance(source, (str, Path, SeqRecord)):
-        yield load_record(source, is_sequence=is_sequence)
-        return
-    for item in source:
-        yield load_record(item)
+    """Stream records from a record, sequence, file or iterable of those.
+
+    Unlike ``load_record``, files yield every record they contain, one at a
+    time, so multi-FASTA/GenBank inputs of any size can be processed lazily.
+    """
+    sources = [source] if isinstance(source, (str, Path, SeqRecord)) else source
+    for item in sources:
+        if isinstance(item, SeqRecord):
+            yield item
+            continue
+        if not isinstance(item, (str, Path)):
+            raise TypeError(f"Unsupported source type: {type(item)!r}")
+        path = _source_path(item, is_sequence)
+        if path is None:
+            yield load_record(item, is_sequence=True)
+        else:
+            yield from SeqIO.parse(str(path), infer_format(path))
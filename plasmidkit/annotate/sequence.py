@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Dict, Union
+
+import numpy as np
+
+from .detectors import kmers
+
+_COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+class PreparedSequence:
+    """A sequence plus the derived forms detectors and scoring rules need.
+
+    Each view (uppercase text, ASCII bytes, 2-bit codes, reverse complement,
+    GC prefix sums, circular overhang) is computed on first access and then
+    shared, so a record is upper-cased and encoded once however many
+    detectors read it. Detectors and analysis helpers accept either a plain
+    ``str`` or a ``PreparedSequence``; use :func:`prepare` to normalise.
+    """
+
+    def __init__(self, sequence: str):
+        self.text = str(sequence)
+        self._views: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"PreparedSequence(length={len(self.text)})"
+
+    @cached_property
+    def upper(self) -> str:
+        return self.text.upper()
+
+    @cached_property
+    def upper_bytes(self) -> bytes:
+        """ASCII bytes of :attr:`upper`; non-ASCII characters become ``?`` so offsets line up."""
+        return self.upper.encode("ascii", "replace")
+
+    @cached_property
+    def array(self) -> np.ndarray:
+        """Read-only ``uint8`` view of :attr:`upper_bytes`."""
+        return np.frombuffer(self.upper_bytes, dtype=np.uint8)
+
+    @cached_property
+    def codes(self) -> np.ndarray:
+        """2-bit encoding (see :func:`kmers.encode`)."""
+        return kmers.encode(self.upper)
+
+    @cached_property
+    def reverse_complement(self) -> str:
+        return self.upper.translate(_COMPLEMENT)[::-1]
+
+    @cached_property
+    def gc_prefix(self) -> np.ndarray:
+        """``gc_prefix[i]`` is the number of G/C bases in ``upper[:i]``."""
+        prefix = np.zeros(len(self.text) + 1, dtype=np.int64)
+        np.cumsum((self.codes == 1) | (self.codes == 2), out=prefix[1:])
+        return prefix
+
+    def gc_count(self, start: int = 0, end: int | None = None) -> int:
+        end = len(self.text) if end is None else end
+        return int(self.gc_prefix[end] - self.gc_prefix[start])
+
+    @cached_property
+    def gc_fraction(self) -> float:
+        if not self.text:
+            return 0.0
+        return self.gc_count() / len(self.text)
+
+    def circular_view(self, overhang: int) -> str:
+        """Uppercase sequence followed by its first ``overhang`` bases.
+
+        Circular matches starting in the sequence and at most ``overhang + 1``
+        long all fit in the view, without copying the whole sequence twice.
+        """
+        if overhang <= 0:
+            return self.upper
+        overhang = min(overhang, len(self.text))
+        view = self._views.get(overhang)
+        if view is None:
+            view = self.upper + self.upper[:overhang]
+            self._views[overhang] = view
+        return view
+
+
+SequenceLike = Union[str, PreparedSequence]
+
+
+def prepare(sequence: SequenceLike) -> PreparedSequence:
+    """Return ``sequence`` as a :class:`PreparedSequence`, reusing it if it already is one."""
+    if isinstance(sequence, PreparedSequence):
+        return sequence
+    return PreparedSequence(sequence)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+from .types import Feature
+
+_STRANDS = {"+": 1, "-": -1, ".": 0}
+_STRAND_NAMES = {1: "+", -1: "-", 0: "."}
+_CATEGORIES = ("type", "id", "method")
+
+# An evidence column is a NumPy array when every value is an int (or every
+# value a float); anything else stays a list, with strings interned
+EvidenceColumn = Union[np.ndarray, List[object]]
+
+
+class FeatureTable:
+    """Columnar, read-only collection of features.
+
+    Coordinates, strand and confidence are NumPy arrays; ``type``, ``id`` and
+    ``method`` are categorical (``int32`` codes into a vocabulary of interned
+    strings); evidence is stored one column per key, together with a code
+    per row naming the keys (in order) that row had. A table holds a few
+    arrays instead of one dataclass and dict per feature, which matters when
+    annotations for a whole library are kept in memory (see :meth:`concat`).
+
+    Iterating, indexing with an integer or :meth:`to_features` builds
+    :class:`Feature` objects on demand; :meth:`to_dicts` gives the same
+    output as ``[f.to_dict() for f in features]`` without building them.
+    """
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        strand: np.ndarray,
+        confidence: np.ndarray,
+        categories: Dict[str, Tuple[np.ndarray, List[str]]],
+        evidence_shapes: Tuple[np.ndarray, List[Tuple[str, ...]]],
+        evidence: Dict[str, EvidenceColumn],
+    ):
+        self.start = start
+        self.end = end
+        self.strand = strand
+        self.confidence = confidence
+        self._categories = categories
+        self._shapes = evidence_shapes
+        self._evidence = evidence
+
+    @classmethod
+    def from_features(cls, features: Iterable[Feature]) -> "FeatureTable":
+        rows = list(features)
+        count = len(rows)
+        try:
+            strand = np.fromiter((_STRANDS[f.strand] for f in rows), dtype=np.int8, count=count)
+        except KeyError as exc:
+            message = f"Unsupported strand {exc.args[0]!r}; expected '+', '-' or '.'"
+            raise ValueError(message) from None
+        categories = {
+            name: _encode_categorical([getattr(f, name) for f in rows]) for name in _CATEGORIES
+        }
+        shape_codes, shapes = _encode_categorical([tuple(f.evidence) for f in rows], intern=False)
+        columns: Dict[str, List[object]] = {}
+        for row, feature in enumerate(rows):
+            for key, value in feature.evidence.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * count
+                column[row] = value
+        evidence = {
+            key: _pack_column(column, shape_codes, shapes, key) for key, column in columns.items()
+        }
+        return cls(
+            np.fromiter((f.start for f in rows), dtype=np.int64, count=count),
+            np.fromiter((f.end for f in rows), dtype=np.int64, count=count),
+            strand,
+            np.fromiter((f.confidence for f in rows), dtype=np.float64, count=count),
+            categories,
+            (shape_codes, shapes),
+            evidence,
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence["FeatureTable"]) -> "FeatureTable":
+        """One table holding the rows of ``tables`` in order, with merged vocabularies."""
+        if not tables:
+            return cls.from_features([])
+        categories = {
+            name: _merge_categorical([t._categories[name] for t in tables]) for name in _CATEGORIES
+        }
+        shapes = _merge_categorical([t._shapes for t in tables], intern=False)
+        keys = list(dict.fromkeys(key for t in tables for key in t._evidence))
+        evidence: Dict[str, EvidenceColumn] = {}
+        for key in keys:
+            parts = [t._evidence.get(key) for t in tables]
+            arrays = all(isinstance(part, np.ndarray) for part in parts)
+            if arrays and len({part.dtype for part in parts}) == 1:
+                evidence[key] = np.concatenate(parts)
+            else:
+                merged: List[object] = []
+                for table, part in zip(tables, parts):
+                    if isinstance(part, np.ndarray):
+                        merged.extend(part.tolist())
+                    else:
+                        merged.extend(part or [None] * len(table))
+                evidence[key] = _pack_column(merged, *shapes, key)
+        return cls(
+            np.concatenate([t.start for t in tables]),
+            np.concatenate([t.end for t in tables]),
+            np.concatenate([t.strand for t in tables]),
+            np.concatenate([t.confidence for t in tables]),
+            categories,
+            shapes,
+            evidence,
+        )
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __repr__(self) -> str:
+        return f"FeatureTable(rows={len(self)}, types={self.vocabulary('type')})"
+
+    def column(self, name: str) -> List[str]:
+        """Decoded values of the categorical column ``name`` (``type``, ``id`` or ``method``)."""
+        codes, vocabulary = self._categories[name]
+        return [vocabulary[code] for code in codes.tolist()]
+
+    def vocabulary(self, name: str) -> List[str]:
+        return list(self._categories[name][1])
+
+    def codes(self, name: str) -> np.ndarray:
+        return self._categories[name][0]
+
+    def evidence_column(self, key: str) -> Tuple[EvidenceColumn, np.ndarray]:
+        """Values of evidence ``key`` and a mask of the rows that have it."""
+        shape_codes, shapes = self._shapes
+        has_key = np.array([key in shape for shape in shapes], dtype=bool)
+        present = has_key[shape_codes] if len(shapes) else np.zeros(len(self), dtype=bool)
+        column = self._evidence.get(key)
+        if column is None:
+            column = [None] * len(self)
+        return column, present
+
+    def mask(self, feature_type: str) -> np.ndarray:
+        """Boolean mask of the rows of ``feature_type``."""
+        codes, vocabulary = self._categories["type"]
+        if feature_type not in vocabulary:
+            return np.zeros(len(self), dtype=bool)
+        return codes == vocabulary.index(feature_type)
+
+    def of_type(self, feature_type: str) -> "FeatureTable":
+        return self.take(np.flatnonzero(self.mask(feature_type)))
+
+    def take(self, rows: Sequence[int] | np.ndarray) -> "FeatureTable":
+        """Sub-table of ``rows`` (indices or a boolean mask); vocabularies are shared."""
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64, copy=False)
+        picked = rows.tolist()
+        evidence = {
+            key: column[rows] if isinstance(column, np.ndarray) else [column[i] for i in picked]
+            for key, column in self._evidence.items()
+        }
+        return FeatureTable(
+            self.start[rows],
+            self.end[rows],
+            self.strand[rows],
+            self.confidence[rows],
+            {
+                name: (codes[rows], vocabulary)
+                for name, (codes, vocabulary) in self._categories.items()
+            },
+            (self._shapes[0][rows], self._shapes[1]),
+            evidence,
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Feature: ...
+
+    @overload
+    def __getitem__(self, index: slice | Sequence[int] | np.ndarray) -> "FeatureTable": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        if isinstance(index, (int, np.integer)):
+            row = range(len(self))[index]
+            return next(self._rows(row, row + 1))
+        return self.take(index)
+
+    def __iter__(self) -> Iterator[Feature]:
+        return self._rows(0, len(self))
+
+    def to_features(self) -> List[Feature]:
+        return list(self)
+
+    def to_dicts(self) -> List[Dict[str, object]]:
+        """``Feature.to_dict()`` of every row, built straight from the columns."""
+        return [_feature_dict(*fields) for fields in self._fields(0, len(self))]
+
+    def _rows(self, lo: int, hi: int) -> Iterator[Feature]:
+        for type_, id_, start, end, strand, method, confidence, evidence in self._fields(lo, hi):
+            yield Feature(type_, id_, start, end, strand, method, confidence, evidence)
+
+    def _fields(self, lo: int, hi: int) -> Iterator[Tuple[object, ...]]:
+        names = {
+            name: (codes[lo:hi].tolist(), vocabulary)
+            for name, (codes, vocabulary) in self._categories.items()
+        }
+        shape_codes, shapes = self._shapes
+        values = {
+            key: column[lo:hi].tolist() if isinstance(column, np.ndarray) else column[lo:hi]
+            for key, column in self._evidence.items()
+        }
+        types, ids, methods = (names[name] for name in _CATEGORIES)
+        for i, (start, end, strand, confidence, shape) in enumerate(
+            zip(
+                self.start[lo:hi].tolist(),
+                self.end[lo:hi].tolist(),
+                self.strand[lo:hi].tolist(),
+                self.confidence[lo:hi].tolist(),
+                shape_codes[lo:hi].tolist(),
+            )
+        ):
+            evidence = {key: values[key][i] for key in shapes[shape]}
+            yield (
+                types[1][types[0][i]],
+                ids[1][ids[0][i]],
+                start,
+                end,
+                _STRAND_NAMES[strand],
+                methods[1][methods[0][i]],
+                confidence,
+                evidence,
+            )
+
+
+def _feature_dict(
+    type_: str,
+    id_: str,
+    start: int,
+    end: int,
+    strand: str,
+    method: str,
+    confidence: float,
+    evidence: Dict,
+) -> Dict[str, object]:
+    data: Dict[str, object] = {
+        "type": type_,
+        "id": id_,
+        "start": start,
+        "end": end,
+        "strand": strand,
+        "method": method,
+        "confidence": confidence,
+    }
+    if evidence:
+        data["evidence"] = evidence
+    return data
+
+
+def _encode_categorical(values: Sequence[object], intern: bool = True) -> Tuple[np.ndarray, List]:
+    vocabulary: List = []
+    index: Dict[object, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for row, value in enumerate(values):
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(vocabulary)
+            vocabulary.append(sys.intern(value) if intern and isinstance(value, str) else value)
+        codes[row] = code
+    return codes, vocabulary
+
+
+def _merge_categorical(
+    parts: Sequence[Tuple[np.ndarray, List]], intern: bool = True
+) -> Tuple[np.ndarray, List]:
+    vocabulary: List = []
+    index: Dict[object, int] = {}
+    remapped: List[np.ndarray] = []
+    for codes, part_vocabulary in parts:
+        mapping = np.empty(len(part_vocabulary), dtype=np.int32)
+        for code, value in enumerate(part_vocabulary):
+            merged = index.get(value)
+            if merged is None:
+                merged = index[value] = len(vocabulary)
+                vocabulary.append(sys.intern(value) if intern and isinstance(value, str) else value)
+            mapping[code] = merged
+        remapped.append(mapping[codes] if len(codes) else codes.astype(np.int32))
+    return np.concatenate(remapped) if remapped else np.zeros(0, dtype=np.int32), vocabulary
+
+
+def _pack_column(
+    column: List[object], shape_codes: np.ndarray, shapes: List[Tuple[str, ...]], key: str
+) -> EvidenceColumn:
+    has_key = [key in shape for shape in shapes]
+    present = [value for value, shape in zip(column, shape_codes.tolist()) if has_key[shape]]
+    kinds = {type(value) for value in present}
+    if kinds == {int} and all(-(2**63) <= value < 2**63 for value in present):
+        return np.array([value if value is not None else 0 for value in column], dtype=np.int64)
+    if kinds == {float}:
+        return np.array([value if value is not None else 0.0 for value in column], dtype=np.float64)
+    return [sys.intern(value) if isinstance(value, str) else value for value in column]
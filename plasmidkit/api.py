@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List, Mapping, Sequence, Optional
+from typing import Callable, Iterable, Iterator, List, Mapping, Sequence, Optional, Tuple
 
 from Bio.SeqRecord import SeqRecord
 
+from . import parallel
 from .annotate import annotate_record, load_record
+from .annotate.detectors import orf_prodigal
+from .annotate.incremental import AnnotationState, Edit, annotate_state, apply_edits
+from .annotate.loader import iter_records
+from .annotate.sequence import PreparedSequence, prepare
+from .annotate.table import FeatureTable
 from .annotate.types import Feature
 from .cache import manager
+from .cache.results import ResultCache, get_result_cache, result_key
 from .exporters import export_gff3, export_json, export_minimal_genbank
+from .instrumentation import Instrumentation
 from .scoring.calculator import compute_score
 
 __all__ = [
@@ -16,6 +25,11 @@ __all__ = [
     "annotate",
     "score",
     "annotate_and_score",
+    "annotate_incremental",
+    "reannotate",
+    "annotate_many",
+    "score_many",
+    "annotate_and_score_many",
     "export_json",
     "export_gff3",
     "export_minimal_genbank",
@@ -31,9 +45,22 @@ def annotate(
     db: str = "engineered-core@1.0.0",
     detectors: Iterable[str] | None = None,
     is_sequence: Optional[bool] = None,
-) -> List[Feature]:
+    instrumentation: Optional[Instrumentation] = None,
+    as_table: bool = False,
+) -> List[Feature] | FeatureTable:
+    """Annotate one record.
+
+    With ``as_table`` the result is a columnar :class:`FeatureTable` instead of a list.
+    """
     artifacts = manager.get_artifacts(db)
-    return annotate_record(record, artifacts, detectors, is_sequence=is_sequence)
+    return annotate_record(
+        record,
+        artifacts,
+        detectors,
+        is_sequence=is_sequence,
+        instrumentation=instrumentation,
+        as_table=as_table,
+    )
 
 
 def score(
@@ -41,11 +68,25 @@ def score(
     annotations: Sequence[Feature] | None = None,
     db: str = "engineered-core@1.0.0",
     is_sequence: Optional[bool] = None,
+    instrumentation: Optional[Instrumentation] = None,
+    sequence: Optional[PreparedSequence] = None,
 ) -> Mapping[str, object]:
+    """Score one record, annotating it first unless ``annotations`` are given.
+
+    ``sequence`` is the record's :class:`PreparedSequence` when the caller
+    already built one (e.g. for annotation); it is prepared once otherwise.
+    """
     artifacts = manager.get_artifacts(db)
     normalized_record = record if isinstance(record, SeqRecord) else load_record(record, is_sequence=is_sequence)
-    features = list(annotations) if annotations is not None else annotate_record(normalized_record, artifacts, None)
-    return compute_score(normalized_record, features, artifacts)
+    if sequence is None:
+        sequence = prepare(str(normalized_record.seq))
+    if annotations is not None:
+        features = list(annotations)
+    else:
+        features = annotate_record(
+            normalized_record, artifacts, None, instrumentation=instrumentation, sequence=sequence
+        )
+    return compute_score(normalized_record, features, artifacts, instrumentation, sequence=sequence)
 
 
 def annotate_and_score(
@@ -53,17 +94,202 @@ def annotate_and_score(
     db: str = "engineered-core@1.0.0",
     detectors: Iterable[str] | None = None,
     is_sequence: Optional[bool] = None,
+    timings: bool = False,
+    cache: bool | ResultCache = False,
 ) -> Mapping[str, object]:
+    """Annotate and score one record; ``timings=True`` adds per-stage timings to the result.
+
+    With ``cache=True`` (or a :class:`ResultCache`) results are looked up in
+    and written to the on-disk result cache, keyed by sequence content, DB
+    identifier and hash, detector list, Prodigal model file and plasmidkit
+    version. Cache hits are marked ``"cached": True``. Timed runs always
+    recompute, but still store their result.
+    """
     normalized_record = record if isinstance(record, SeqRecord) else load_record(record, is_sequence=is_sequence)
-    annotations = annotate(normalized_record, db=db, detectors=detectors)
-    score_report = score(normalized_record, annotations=annotations, db=db)
-    return {
+    detector_list = list(detectors) if detectors else None
+    store: Optional[ResultCache] = None
+    key = ""
+    if cache:
+        store = cache if isinstance(cache, ResultCache) else get_result_cache()
+        key = result_key(
+            str(normalized_record.seq),
+            db,
+            manager.get_artifacts_sha256(db),
+            detector_list,
+            model=orf_prodigal.model_identity(manager.get_artifacts(db)),
+        )
+        cached = None if timings else store.get(key)
+        if cached is not None:
+            return {
+                "sequence_id": normalized_record.id,
+                "length": len(normalized_record.seq),
+                "annotations": cached["annotations"],
+                "score": cached["score"],
+                "db": db,
+                "cached": True,
+            }
+    instrumentation = Instrumentation() if timings else None
+    # One prepared sequence serves both the detectors and the scoring stages
+    sequence = prepare(str(normalized_record.seq))
+    annotations = annotate_record(
+        normalized_record,
+        manager.get_artifacts(db),
+        detector_list,
+        instrumentation=instrumentation,
+        sequence=sequence,
+    )
+    score_report = score(
+        normalized_record,
+        annotations=annotations,
+        db=db,
+        instrumentation=instrumentation,
+        sequence=sequence,
+    )
+    result = {
         "sequence_id": normalized_record.id,
         "length": len(normalized_record.seq),
         "annotations": [feature.to_dict() for feature in annotations],
         "score": score_report,
         "db": db,
     }
+    if store is not None:
+        store.put(key, {"annotations": result["annotations"], "score": score_report})
+    if instrumentation is not None:
+        result["timings"] = instrumentation.to_dict()
+    return result
+
+
+def annotate_incremental(
+    record: SeqRecord | str | Path,
+    db: str = "engineered-core@1.0.0",
+    detectors: Iterable[str] | None = None,
+    is_sequence: Optional[bool] = None,
+) -> AnnotationState:
+    """Annotate ``record`` and keep the state :func:`reannotate` needs.
+
+    The features are in the returned state's ``.features``.
+    """
+    normalized_record = (
+        record if isinstance(record, SeqRecord) else load_record(record, is_sequence=is_sequence)
+    )
+    return annotate_state(str(normalized_record.seq), manager.get_artifacts(db), detectors)
+
+
+def reannotate(previous: AnnotationState, edits: Edit | Sequence[Edit]) -> AnnotationState:
+    """Update ``previous`` after local edits instead of annotating the edited sequence from scratch.
+
+    Each :class:`Edit` replaces ``deleted`` bases at ``position`` with
+    ``inserted``, in the coordinates left by the edits before it. Only a
+    window around each edit is rescanned; see :func:`~plasmidkit.annotate.incremental.apply_edit`.
+    """
+    return apply_edits(previous, [edits] if isinstance(edits, Edit) else list(edits))
+
+
+RecordSource = SeqRecord | str | Path
+
+
+def _annotate_task(
+    record: SeqRecord, db: str, detectors: Optional[List[str]], as_table: bool = False
+) -> List[Feature] | FeatureTable:
+    return annotate(record, db=db, detectors=detectors, as_table=as_table)
+
+
+def _score_task(record: SeqRecord, db: str) -> Mapping[str, object]:
+    return score(record, db=db)
+
+
+def _annotate_and_score_task(
+    record: SeqRecord,
+    db: str,
+    detectors: Optional[List[str]],
+    timings: bool = False,
+    cache: bool = False,
+) -> Mapping[str, object]:
+    return annotate_and_score(record, db=db, detectors=detectors, timings=timings, cache=cache)
+
+
+def _map_records(
+    task: Callable[[SeqRecord], object],
+    records: RecordSource | Iterable[RecordSource],
+    db: str,
+    jobs: Optional[int],
+    ordered: bool,
+    is_sequence: Optional[bool],
+) -> Iterator[Tuple[SeqRecord, object]]:
+    stream = iter_records(records, is_sequence=is_sequence)
+    workers = parallel.resolve_jobs(jobs)
+    if workers == 1:
+        for record in stream:
+            yield record, task(record)
+        return
+    executor = parallel.make_executor(workers, db)
+    try:
+        yield from parallel.imap(task, stream, executor, workers, ordered=ordered)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def annotate_many(
+    records: RecordSource | Iterable[RecordSource],
+    db: str = "engineered-core@1.0.0",
+    detectors: Iterable[str] | None = None,
+    jobs: Optional[int] = None,
+    ordered: bool = True,
+    is_sequence: Optional[bool] = None,
+    as_table: bool = False,
+) -> Iterator[Tuple[SeqRecord, List[Feature] | FeatureTable]]:
+    """Annotate every record from ``records`` across ``jobs`` worker processes.
+
+    ``records`` may be a record, a path/sequence or an iterable of those; files
+    contribute all of their records. Each worker loads the database once.
+    ``jobs=None`` uses every core and ``jobs=1`` runs in-process. Yields
+    ``(record, features)`` pairs in input order, or as they finish when
+    ``ordered=False``. With ``as_table`` features come as a
+    :class:`FeatureTable`; ``FeatureTable.concat`` combines a library into
+    one table.
+    """
+    task = partial(
+        _annotate_task, db=db, detectors=list(detectors) if detectors else None, as_table=as_table
+    )
+    yield from _map_records(task, records, db, jobs, ordered, is_sequence)
+
+
+def score_many(
+    records: RecordSource | Iterable[RecordSource],
+    db: str = "engineered-core@1.0.0",
+    jobs: Optional[int] = None,
+    ordered: bool = True,
+    is_sequence: Optional[bool] = None,
+) -> Iterator[Tuple[SeqRecord, Mapping[str, object]]]:
+    """Parallel counterpart of :func:`score`; yields ``(record, report)`` pairs."""
+    task = partial(_score_task, db=db)
+    yield from _map_records(task, records, db, jobs, ordered, is_sequence)
+
+
+def annotate_and_score_many(
+    records: RecordSource | Iterable[RecordSource],
+    db: str = "engineered-core@1.0.0",
+    detectors: Iterable[str] | None = None,
+    jobs: Optional[int] = None,
+    ordered: bool = True,
+    is_sequence: Optional[bool] = None,
+    timings: bool = False,
+    cache: bool = False,
+) -> Iterator[Mapping[str, object]]:
+    """Parallel counterpart of :func:`annotate_and_score`; yields result mappings.
+
+    With ``cache=True`` every worker shares the on-disk result cache of the
+    current cache directory.
+    """
+    task = partial(
+        _annotate_and_score_task,
+        db=db,
+        detectors=list(detectors) if detectors else None,
+        timings=timings,
+        cache=cache,
+    )
+    for _record, result in _map_records(task, records, db, jobs, ordered, is_sequence):
+        yield result
 
 
 set_cache_dir = manager.set_cache_dir
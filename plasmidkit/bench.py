@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import platform
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+from .annotate.detectors import _DEFAULT_ORDER, get_detector, run_detectors
+from .annotate.detectors import gc_length, homopolymers, repeats, windows
+from .annotate.sequence import prepare
+from .cache import manager
+from .scoring import rules
+from .scoring.calculator import compute_score
+
+# Synthetic plasmid sizes from a small vector up to a megabase replicon
+DEFAULT_SIZES = (1_000, 5_000, 10_000, 50_000, 100_000, 1_000_000)
+# Relative slowdown (0.2 = 20%) above which compare() reports a regression
+DEFAULT_TOLERANCE = 0.2
+# Timings below this many seconds are too noisy to compare
+NOISE_FLOOR_S = 0.002
+
+_MOTIF_SECTIONS = ("ori", "markers", "promoters", "terminators")
+
+
+def synthetic_plasmid(length: int, db: Optional[Mapping[str, object]] = None, seed: int = 0) -> str:
+    """Deterministic random backbone of ``length`` bp with DB motifs planted in it.
+
+    About one motif per kilobase is taken from the motif sections of ``db``
+    (half of them reverse-complemented) so detectors do realistic work. The
+    same ``length``, ``db`` and ``seed`` always give the same sequence.
+    """
+    rng = random.Random(f"{seed}:{length}")
+    motifs = [
+        motif
+        for section in _MOTIF_SECTIONS
+        for entry in (db or {}).get(section, []) or []
+        for motif in entry.get("motifs", []) or []
+        if isinstance(motif, str) and len(motif) >= 12
+    ]
+    parts: List[str] = []
+    size = 0
+    while size < length:
+        chunk = "".join(rng.choice("ACGT") for _ in range(rng.randint(400, 1600)))
+        parts.append(chunk)
+        size += len(chunk)
+        if motifs:
+            motif = rng.choice(motifs).upper()
+            if rng.random() < 0.5:
+                motif = motif.translate(str.maketrans("ACGT", "TGCA"))[::-1]
+            parts.append(motif)
+            size += len(motif)
+    return "".join(parts)[:length]
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best = float("inf")
+    result: object = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _scoring_stages(
+    record: SeqRecord, features: Sequence, db: Mapping[str, object]
+) -> Dict[str, Callable[[], object]]:
+    sequence = prepare(str(record.seq))
+    return {
+        "gc_length": lambda: gc_length.analyse(sequence),
+        "repeats": lambda: repeats.analyse(sequence),
+        "homopolymers": lambda: homopolymers.analyse(sequence),
+        "windows": lambda: windows.analyse(sequence),
+        "forbidden_motifs": lambda: rules._forbidden_penalty(sequence, db),
+        "assembly": lambda: rules.assembly_components(record, features),
+    }
+
+
+def benchmark_record(
+    record: SeqRecord,
+    db: Mapping[str, object],
+    detectors: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+) -> Dict[str, object]:
+    """Time one record: each detector, each scoring stage and the full pipeline.
+
+    Timings are the best of ``repeat`` warm runs in seconds: one untimed
+    pass first compiles the motif index and loads models. Detectors are
+    timed one by one (each with its own scan); ``annotate`` is the combined
+    single-pass ``run_detectors``. Peak memory is measured by tracemalloc on
+    a separate full run, so tracing overhead does not skew the timings.
+    """
+    names = list(detectors) if detectors else list(_DEFAULT_ORDER)
+    sequence = str(record.seq)
+    compute_score(record, run_detectors(prepare(sequence), db, names), db)
+
+    detector_times: Dict[str, float] = {}
+    for name in names:
+        detect = get_detector(name)
+        detector_times[name], _ = _best_of(lambda: detect(prepare(sequence), db), repeat)
+
+    annotate_s, features = _best_of(lambda: run_detectors(prepare(sequence), db, names), repeat)
+    stage_times = {
+        stage: _best_of(func, repeat)[0]
+        for stage, func in _scoring_stages(record, features, db).items()
+    }
+    score_s, _ = _best_of(lambda: compute_score(record, features, db), repeat)
+
+    case: Dict[str, object] = {
+        "name": record.id,
+        "length": len(sequence),
+        "features": len(features),
+        "detectors": detector_times,
+        "scoring": stage_times,
+        "annotate": annotate_s,
+        "score": score_s,
+        "total": annotate_s + score_s,
+    }
+    if memory:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        prepared = prepare(sequence)
+        compute_score(record, run_detectors(prepared, db, names), db, sequence=prepared)
+        case["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        if not tracing:
+            tracemalloc.stop()
+    return case
+
+
+def run_benchmark(
+    db: str = "engineered-core@1.0.0",
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    records: Optional[Iterable[SeqRecord]] = None,
+    detectors: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    seed: int = 0,
+    progress: Optional[Callable[[Mapping[str, object]], None]] = None,
+) -> Dict[str, object]:
+    """Benchmark ``records`` (default: synthetic plasmids of each size in ``sizes``).
+
+    Returns a JSON-serialisable report with per-record cases, overall
+    throughput in records/s and bp/s of the full annotate+score pipeline,
+    and enough environment details to tell baselines apart. ``progress`` is
+    called with each case as soon as it is measured.
+    """
+    artifacts = manager.get_artifacts(db)
+    if records is None:
+        records = [
+            SeqRecord(Seq(synthetic_plasmid(size, artifacts, seed)), id=f"synthetic_{size}")
+            for size in sizes
+        ]
+    cases: List[Dict[str, object]] = []
+    for record in records:
+        case = benchmark_record(record, artifacts, detectors, repeat=repeat, memory=memory)
+        cases.append(case)
+        if progress is not None:
+            progress(case)
+    total_s = sum(float(case["total"]) for case in cases)
+    total_bp = sum(int(case["length"]) for case in cases)
+    return {
+        "plasmidkit": manager.package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "db": db,
+        "db_sha256": manager.get_artifacts_sha256(db),
+        "repeat": repeat,
+        "cases": cases,
+        "throughput": {
+            "records_per_s": len(cases) / total_s if total_s else 0.0,
+            "bp_per_s": total_bp / total_s if total_s else 0.0,
+        },
+    }
+
+
+def _metrics(case: Mapping[str, object]) -> Dict[str, float]:
+    flat = {key: float(case[key]) for key in ("annotate", "score", "total") if key in case}
+    for group in ("detectors", "scoring"):
+        for name, value in (case.get(group) or {}).items():
+            flat[f"{group}.{name}"] = float(value)
+    return flat
+
+
+def compare(
+    current: Mapping[str, object],
+    baseline: Mapping[str, object],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, object]]:
+    """Regressions of ``current`` against ``baseline``, matching cases by name.
+
+    A timing regresses when it is more than ``tolerance`` slower and the
+    difference exceeds ``NOISE_FLOOR_S``; peak memory regresses when it
+    grows by more than ``tolerance``.
+    """
+    baseline_cases = {case["name"]: case for case in baseline.get("cases", [])}
+    regressions: List[Dict[str, object]] = []
+    for case in current.get("cases", []):
+        reference = baseline_cases.get(case["name"])
+        if reference is None:
+            continue
+        old_metrics = _metrics(reference)
+        for metric, value in _metrics(case).items():
+            old = old_metrics.get(metric)
+            if old is None or value - old <= NOISE_FLOOR_S or value <= old * (1 + tolerance):
+                continue
+            regressions.append(
+                {
+                    "case": case["name"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": value,
+                    "ratio": value / old if old else float("inf"),
+                }
+            )
+        old_peak = reference.get("peak_memory_bytes")
+        peak = case.get("peak_memory_bytes")
+        if old_peak and peak and peak > old_peak * (1 + tolerance):
+            regressions.append(
+                {
+                    "case": case["name"],
+                    "metric": "peak_memory_bytes",
+                    "baseline": old_peak,
+                    "current": peak,
+                    "ratio": peak / old_peak,
+                }
+            )
+    return regressions
+
+
+def save_report(report: Mapping[str, object], path: Path) -> None:
+    path.write_text(json.dumps(report, indent=2), encoding="utf8")
+
+
+def load_report(path: Path) -> Dict[str, object]:
+    return json.loads(path.read_text(encoding="utf8"))
+
+
+def format_case(case: Mapping[str, object]) -> str:
+    slowest = max(
+        (case.get("detectors") or {}).items(), key=lambda item: item[1], default=("-", 0.0)
+    )
+    line = (
+        f"{case['name']}: {case['length']} bp, {case['features']} features, "
+        f"annotate {case['annotate']:.4f}s, score {case['score']:.4f}s, "
+        f"slowest detector {slowest[0]} {slowest[1]:.4f}s"
+    )
+    if "peak_memory_bytes" in case:
+        line += f", peak {case['peak_memory_bytes'] / 1e6:.1f} MB"
+    return line
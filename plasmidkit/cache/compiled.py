@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..annotate.detectors.motif_index import CompiledMotifs, SectionSpec, compile_section
+
+MAGIC = b"PKDB"
+FORMAT_VERSION = 3
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<4sHI")
+# Entry fields whose strings go through the per-section string table
+_MOTIF_KEYS = ("motifs", "sequence")
+
+
+class InvalidCompiledDatabase(ValueError):
+    """Raised when a compiled database file is unreadable or from another format."""
+
+
+def _spec_key(spec: SectionSpec) -> Tuple[str, int, int, bool, int]:
+    return (spec.motif_key, spec.max_mismatches, spec.min_length, spec.include_rc, spec.max_edits)
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self._index[value] = idx
+            self.strings.append(value)
+        return idx
+
+
+def _encode_section(value: object, specs: Sequence[SectionSpec]) -> Dict[str, object]:
+    is_entry_list = isinstance(value, list) and all(isinstance(item, dict) for item in value)
+    if not is_entry_list or not value:
+        return {"value": value}
+    table = _StringTable()
+    entries: List[Dict[str, object]] = []
+    encoded: List[Tuple[int, str]] = []
+    for entry_idx, entry in enumerate(value):
+        stored = dict(entry)
+        for key in _MOTIF_KEYS:
+            field = stored.get(key)
+            if isinstance(field, str):
+                stored[key] = table.intern(field)
+                encoded.append((entry_idx, key))
+            elif isinstance(field, list) and all(isinstance(item, str) for item in field):
+                stored[key] = [table.intern(item) for item in field]
+                encoded.append((entry_idx, key))
+        entries.append(stored)
+    compiled = {
+        _spec_key(spec): compile_section(value, spec).export_state(table.intern) for spec in specs
+    }
+    return {"strings": table.strings, "entries": entries, "encoded": encoded, "compiled": compiled}
+
+
+def _decode_entries(group: Mapping[str, object]) -> List[Dict[str, object]]:
+    strings = group["strings"]
+    entries = [dict(entry) for entry in group["entries"]]
+    for entry_idx, key in group["encoded"]:
+        field = entries[entry_idx][key]
+        entries[entry_idx][key] = (
+            strings[field] if isinstance(field, int) else [strings[i] for i in field]
+        )
+    return entries
+
+
+def write_compiled_db(
+    path: Path,
+    data: Mapping[str, object],
+    identifier: str,
+    source_sha256: str,
+    source_stamp: Optional[Tuple[int, int]],
+    specs: Sequence[SectionSpec],
+) -> Path:
+    """Write ``data`` as a compiled database, precompiling the given motif sections."""
+    blobs: List[bytes] = []
+    sections: Dict[str, List[int]] = {}
+    offset = 0
+    for name, value in data.items():
+        blob = marshal.dumps(_encode_section(value, [spec for spec in specs if spec.name == name]))
+        sections[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps(
+        {
+            "identifier": identifier,
+            "source_sha256": source_sha256,
+            "source_stamp": list(source_stamp) if source_stamp else None,
+            "python": list(sys.version_info[:2]),
+            "sections": sections,
+        }
+    ).encode("utf8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        handle.write(header)
+        for blob in blobs:
+            handle.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+class CompiledDatabase(Mapping[str, object]):
+    """Read-only database view over a memory-mapped compiled file.
+
+    Only the table of contents is parsed on open; each section is decoded
+    the first time it is accessed.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise InvalidCompiledDatabase(f"Empty compiled database: {self.path}") from exc
+        if len(self._map) < _PREAMBLE.size:
+            raise InvalidCompiledDatabase(f"Truncated compiled database: {self.path}")
+        magic, version, header_len = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise InvalidCompiledDatabase(f"Unsupported compiled database format: {self.path}")
+        header = json.loads(self._map[_PREAMBLE.size : _PREAMBLE.size + header_len])
+        # marshal output is only guaranteed stable within one Python version
+        if tuple(header.get("python", ())) != tuple(sys.version_info[:2]):
+            raise InvalidCompiledDatabase(
+                f"Compiled database built by another Python version: {self.path}"
+            )
+        self.identifier: str = header["identifier"]
+        self.source_sha256: str = header["source_sha256"]
+        stamp = header.get("source_stamp")
+        self.source_stamp: Optional[Tuple[int, int]] = tuple(stamp) if stamp else None
+        self._sections: Dict[str, List[int]] = header["sections"]
+        self._base = _PREAMBLE.size + header_len
+        self._groups: Dict[str, Dict[str, object]] = {}
+        self._values: Dict[str, object] = {}
+
+    def _group(self, name: str) -> Dict[str, object]:
+        group = self._groups.get(name)
+        if group is None:
+            offset, length = self._sections[name]
+            start = self._base + offset
+            group = marshal.loads(self._map[start : start + length])
+            self._groups[name] = group
+        return group
+
+    def __getitem__(self, name: str) -> object:
+        if name not in self._sections:
+            raise KeyError(name)
+        if name not in self._values:
+            group = self._group(name)
+            self._values[name] = group["value"] if "value" in group else _decode_entries(group)
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def compiled_section(self, spec: SectionSpec) -> Optional[CompiledMotifs]:
+        """Return the precompiled motifs for ``spec`` if they were stored."""
+        if spec.name not in self._sections:
+            return None
+        group = self._group(spec.name)
+        state = group.get("compiled", {}).get(_spec_key(spec))
+        if state is None:
+            return None
+        return CompiledMotifs.from_state(state, group["strings"])
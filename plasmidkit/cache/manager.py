@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Mapping, Optional, Tuple
 
 import importlib.resources as resources
+from importlib import metadata
 
 _CACHE_DIR = Path(os.environ.get("PLASMIDKIT_CACHE", Path.home() / ".cache" / "plasmidkit")).expanduser()
 _OFFLINE = bool(int(os.environ.get("PLASMIDKIT_OFFLINE", "0")))
 
 _REGISTRIES: Dict[str, "Registry"] = {}
 
+# Parsed databases kept in memory, most recently used last
+_ARTIFACT_CACHE_SIZE = int(os.environ.get("PLASMIDKIT_DB_CACHE_SIZE", "4"))
+_ARTIFACT_CACHE: "OrderedDict[str, _CachedArtifacts]" = OrderedDict()
+
 
 @dataclass
 class Artifact:
@@ -21,6 +28,13 @@ class Artifact:
     sha256: str | None = None
 
 
+@dataclass
+class _CachedArtifacts:
+    data: Mapping[str, object]
+    sha256: str
+    stamp: Tuple[int, int] | None
+
+
 class Registry:
     def __init__(self, name: str, manifest_path: Path):
         self.name = name
@@ -61,6 +75,11 @@ def get_cache_dir() -> Path:
     return _CACHE_DIR
 
 
+def current_cache_dir() -> Path:
+    """The configured cache directory, without creating it (cheap enough to check per record)."""
+    return _CACHE_DIR
+
+
 def set_offline(value: bool) -> None:
     global _OFFLINE
     _OFFLINE = bool(value)
@@ -70,24 +89,182 @@ def is_offline() -> bool:
     return _OFFLINE
 
 
-def load_builtin_db(name: str, version: str) -> Dict[str, object]:
-    resource_name = "engineered_core_signatures.json"
-    if name != "engineered-core" or version != "1.0.0":
+_BUILTIN_DBS = {("engineered-core", "1.0.0"): "engineered_core_signatures.json"}
+
+
+def _builtin_db_resource(name: str, version: str):
+    resource_name = _BUILTIN_DBS.get((name, version))
+    if resource_name is None:
         raise FileNotFoundError(f"No built-in database {name}@{version}")
-    with resources.files("plasmidkit.data").joinpath(resource_name).open("r", encoding="utf8") as handle:
+    return resources.files("plasmidkit.data").joinpath(resource_name)
+
+
+def _resource_stamp(resource) -> Tuple[int, int] | None:
+    # Packaged resources are plain files unless installed from a zip
+    if not isinstance(resource, Path):
+        return None
+    stat = resource.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def load_builtin_db(name: str, version: str) -> Dict[str, object]:
+    with _builtin_db_resource(name, version).open("r", encoding="utf8") as handle:
         return json.load(handle)
 
 
-def get_artifacts(identifier: str) -> Dict[str, object]:
+def _split_identifier(identifier: str) -> Tuple[str, str]:
     if "@" not in identifier:
         raise ValueError("Database identifier must include a version, e.g. name@1.0.0")
     name, version = identifier.split("@", 1)
+    return name, version
+
+
+def compiled_db_path(identifier: str) -> Path:
+    """Location of the compiled form of ``identifier`` in the cache directory."""
+    _split_identifier(identifier)
+    return get_cache_dir() / "db" / f"{identifier}.pkdb"
+
+
+def result_cache_path() -> Path:
+    """Location of the on-disk annotation result cache (see :mod:`.results`)."""
+    return get_cache_dir() / "results.sqlite"
+
+
+def package_version() -> str:
+    """Installed plasmidkit version, or ``"unknown"`` when running from a source tree."""
+    try:
+        return metadata.version("plasmidkit")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def prodigal_model_path(name: str) -> Path:
+    """Location of a trained Prodigal model in the cache directory."""
+    if not name or Path(name).name != name:
+        raise ValueError(f"Invalid model name: {name!r}")
+    return get_cache_dir() / "prodigal" / f"{name}.trn"
+
+
+def _open_compiled(identifier: str):
+    from .compiled import CompiledDatabase, InvalidCompiledDatabase
+
+    path = compiled_db_path(identifier)
+    if not path.exists():
+        return None
     try:
-        data = load_builtin_db(name, version)
+        return CompiledDatabase(path)
+    except (InvalidCompiledDatabase, OSError, KeyError, ValueError):
+        # Stale or foreign artifact: fall back to the source database
+        return None
+
+
+def get_artifacts(identifier: str, reload: bool = False) -> Mapping[str, object]:
+    """Return the parsed database for ``identifier``, memoized in-process.
+
+    The source file is stat'ed on every call; it is re-hashed only when its
+    mtime or size changed and re-parsed only when its content did. When a
+    fresh compiled database (``plasmidkit db compile``) exists in the cache
+    directory it is used instead, and its sections are decoded on demand.
+    The returned mapping is shared between callers and must not be mutated.
+    """
+    name, version = _split_identifier(identifier)
+    try:
+        resource = _builtin_db_resource(name, version)
+        stamp = _resource_stamp(resource)
     except FileNotFoundError as exc:  # pragma: no cover - placeholder for future registry support
         raise RuntimeError(str(exc)) from exc
+
+    cached = _ARTIFACT_CACHE.get(identifier)
+    if cached is not None and not reload and (stamp is None or cached.stamp == stamp):
+        _ARTIFACT_CACHE.move_to_end(identifier)
+        return cached.data
+
+    compiled = _open_compiled(identifier)
+    if compiled is not None and stamp is not None and compiled.source_stamp == stamp:
+        return _remember(identifier, compiled, compiled.source_sha256, stamp)
+
+    raw = resource.read_bytes()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    if cached is not None and not reload and cached.sha256 == sha256:
+        # Touched but unchanged: keep the parsed object (and anything compiled from it)
+        cached.stamp = stamp
+        _ARTIFACT_CACHE.move_to_end(identifier)
+        return cached.data
+    if compiled is not None and compiled.source_sha256 == sha256:
+        return _remember(identifier, compiled, sha256, stamp)
+    return _remember(identifier, json.loads(raw), sha256, stamp)
+
+
+def _remember(
+    identifier: str, data: Mapping[str, object], sha256: str, stamp: Tuple[int, int] | None
+) -> Mapping[str, object]:
+    _ARTIFACT_CACHE[identifier] = _CachedArtifacts(data=data, sha256=sha256, stamp=stamp)
+    _ARTIFACT_CACHE.move_to_end(identifier)
+    _evict_artifacts()
     return data
 
 
+def compile_artifacts(identifier: str) -> Path:
+    """Compile ``identifier`` into the cache directory and return the file path.
+
+    Motif seeds and reverse complements for the built-in detectors and the
+    forbidden-motif screen are precomputed, so later runs skip both JSON
+    parsing and seed compilation.
+    """
+    from ..annotate.detectors import motif_sections
+    from ..scoring.rules import FORBIDDEN_SECTION
+    from .compiled import write_compiled_db
+
+    name, version = _split_identifier(identifier)
+    try:
+        resource = _builtin_db_resource(name, version)
+        stamp = _resource_stamp(resource)
+    except FileNotFoundError as exc:  # pragma: no cover - placeholder for future registry support
+        raise RuntimeError(str(exc)) from exc
+    raw = resource.read_bytes()
+    data = json.loads(raw)
+    path = write_compiled_db(
+        compiled_db_path(identifier),
+        data,
+        identifier=identifier,
+        source_sha256=hashlib.sha256(raw).hexdigest(),
+        source_stamp=stamp,
+        specs=motif_sections(db=data) + [FORBIDDEN_SECTION],
+    )
+    clear_artifact_cache(identifier)
+    return path
+
+
+def get_artifacts_sha256(identifier: str) -> str:
+    """Content hash of the database behind ``identifier`` (loading it if needed)."""
+    get_artifacts(identifier)
+    return _ARTIFACT_CACHE[identifier].sha256
+
+
+def reload_artifacts(identifier: str) -> Mapping[str, object]:
+    """Force ``identifier`` to be re-read from its source."""
+    return get_artifacts(identifier, reload=True)
+
+
+def clear_artifact_cache(identifier: Optional[str] = None) -> None:
+    """Drop one (or every) in-process database."""
+    if identifier is None:
+        _ARTIFACT_CACHE.clear()
+    else:
+        _ARTIFACT_CACHE.pop(identifier, None)
+
+
+def set_artifact_cache_size(size: int) -> None:
+    """Bound the number of databases held in memory at once."""
+    global _ARTIFACT_CACHE_SIZE
+    _ARTIFACT_CACHE_SIZE = max(1, int(size))
+    _evict_artifacts()
+
+
+def _evict_artifacts() -> None:
+    while len(_ARTIFACT_CACHE) > _ARTIFACT_CACHE_SIZE:
+        _ARTIFACT_CACHE.popitem(last=False)
+
+
 def ensure_cache_ready() -> None:
     get_cache_dir()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from ..serialization import dumps, loads
+from . import manager
+
+# Upper bound on the stored (compressed) payload size before LRU eviction
+DEFAULT_MAX_BYTES = int(os.environ.get("PLASMIDKIT_RESULT_CACHE_BYTES", str(256 * 1024 * 1024)))
+# Seconds a process waits on another process's write lock before giving up
+_BUSY_TIMEOUT_S = 30.0
+# Bump when the stored payload layout changes
+_FORMAT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def result_key(
+    sequence: str,
+    db: str,
+    db_sha256: str,
+    detectors: Optional[Iterable[str]],
+    version: Optional[str] = None,
+    model: str = "",
+) -> str:
+    """Content address of one annotate+score result.
+
+    The sequence is upper-cased with whitespace removed, so records that
+    differ only in id, description or case share an entry. ``detectors`` is
+    kept in the given order (``None`` means the default set); ``version``
+    defaults to the installed plasmidkit version. ``model`` identifies the
+    single-mode Prodigal model file in use, if any.
+    """
+    normalized = "".join(str(sequence).split()).upper()
+    digest = hashlib.sha256()
+    for part in (
+        str(_FORMAT),
+        version if version is not None else manager.package_version(),
+        db,
+        db_sha256,
+        ",".join(detectors) if detectors else "default",
+        model,
+    ):
+        digest.update(part.encode("utf8"))
+        digest.update(b"\0")
+    digest.update(normalized.encode("ascii", "replace"))
+    return digest.hexdigest()
+
+
+def _encode(value: Mapping[str, object]) -> bytes:
+    return zlib.compress(dumps(value), 6)
+
+
+def _decode(blob: bytes) -> Dict[str, object]:
+    return loads(zlib.decompress(blob))
+
+
+class ResultCache:
+    """Size-bounded, content-addressed store of annotation results on disk.
+
+    Entries live in one SQLite file in write-ahead-log mode, so any number of
+    processes (e.g. ``annotate_and_score_many`` workers) can read and write it
+    at once; each thread uses its own connection. Values are compact zlib-compressed JSON; when their total size
+    exceeds ``max_bytes`` the least recently read entries are evicted.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path) if path is not None else manager.result_cache_path()
+        self.max_bytes = max(0, int(max_bytes))
+        self._reset()
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork; reopen in child processes
+        if self._pid != os.getpid():
+            self._reset()
+        # One connection per thread, so concurrent writers each get their own
+        # transaction and wait on SQLite's lock instead of colliding
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.path),
+                timeout=_BUSY_TIMEOUT_S,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        connection = self._connect()
+        row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        try:
+            return _decode(row[0])
+        except (zlib.error, ValueError):
+            # Truncated or foreign payload: treat as a miss and let it be rewritten
+            self.delete(key)
+            return None
+
+    def put(self, key: str, value: Mapping[str, object]) -> None:
+        blob = _encode(value)
+        if len(blob) > self.max_bytes:
+            return
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM results")
+
+    def stats(self) -> Dict[str, object]:
+        query = "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        entries, size = self._connect().execute(query).fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        """Close every thread's connection; the next call reopens one."""
+        if self._pid == os.getpid():
+            with self._lock:
+                for connection in self._connections:
+                    connection.close()
+        self._reset()
+
+
+_DEFAULT: Optional[ResultCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide cache in the current cache directory (see ``set_cache_dir``)."""
+    global _DEFAULT
+    path = manager.result_cache_path()
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None or _DEFAULT.path != path:
+            if _DEFAULT is not None:
+                _DEFAULT.close()
+            _DEFAULT = ResultCache(path)
+        return _DEFAULT
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import importlib
 import json
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, List, Mapping, Optional
 
 import typer
 
 from . import api
 from .cache import manager
+from .cache.results import get_result_cache
 from .exporters import export_gff3, export_json, export_minimal_genbank
+from .instrumentation import Instrumentation
+from .serialization import dumps_str, write_lines
+
+
+def _module_default(module: str, name: str) -> Callable[[], object]:
+    """Option default read from ``plasmidkit.<module>`` only when a command needs it.
+
+    Keeps modules used by a single command (e.g. the HTTP server) out of
+    every CLI invocation's start-up.
+    """
+    return lambda: getattr(importlib.import_module(f".{module}", __package__), name)
+
 
 app = typer.Typer(help="PlasmidKit command line interface")
+db_app = typer.Typer(help="Signature database maintenance")
+app.add_typer(db_app, name="db")
 
 
 @app.command()
@@ -21,23 +38,41 @@ def annotate(
     out_json: Optional[Path] = typer.Option(None, help="Write annotations+score JSON"),
     out_gff: Optional[Path] = typer.Option(None, help="Write annotations as GFF3"),
     out_gb: Optional[Path] = typer.Option(None, help="Write annotations as minimal GenBank"),
+    timings: bool = typer.Option(
+        False, "--timings", help="Include per-detector timings in the output"
+    ),
+    compact: bool = typer.Option(
+        True, "--compact/--pretty", help="Compact JSON, or indented for reading"
+    ),
+    jsonl: bool = typer.Option(
+        False, "--jsonl", help="Write one annotation per line instead of a single document"
+    ),
 ) -> None:
     record = api.load_record(input)
     detector_list = detectors.split(",") if detectors else None
-    annotations = api.annotate(record, db=db, detectors=detector_list)
+    instrumentation = Instrumentation() if timings else None
+    annotations = api.annotate(
+        record, db=db, detectors=detector_list, instrumentation=instrumentation
+    )
     result = {
         "sequence_id": record.id,
         "length": len(record.seq),
-        "annotations": [feature.to_dict() for feature in annotations],
+        "annotations": annotations,
         "db": db,
     }
+    if instrumentation is not None:
+        result["timings"] = instrumentation.to_dict()
     if out_json:
-        export_json(result, out_json)
+        export_json(annotations if jsonl else result, out_json, compact=compact, jsonl=jsonl)
     if out_gff:
         export_gff3(record, annotations, out_gff)
     if out_gb:
         export_minimal_genbank(record, annotations, out_gb)
-    typer.echo(json.dumps(result, indent=2))
+    if jsonl:
+        write_lines(annotations, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    else:
+        typer.echo(dumps_str(result, pretty=not compact))
 
 
 @app.command()
@@ -46,21 +81,197 @@ def score(
     db: str = typer.Option("engineered-core@1.0.0", help="Database identifier"),
     detectors: Optional[str] = typer.Option(None, help="Comma-separated detector list"),
     out_json: Optional[Path] = typer.Option(None, help="Write annotations+score JSON"),
+    timings: bool = typer.Option(
+        False, "--timings", help="Include per-detector and scoring timings in the output"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse and store results in the on-disk result cache"
+    ),
+    compact: bool = typer.Option(
+        True, "--compact/--pretty", help="Compact JSON, or indented for reading"
+    ),
 ) -> None:
     record = api.load_record(input)
     detector_list = detectors.split(",") if detectors else None
-    annotations = api.annotate(record, db=db, detectors=detector_list)
-    score = api.score(record, annotations=annotations, db=db)
-    result = {
-        "sequence_id": record.id,
-        "length": len(record.seq),
-        "annotations": [feature.to_dict() for feature in annotations],
-        "score": score,
-        "db": db,
-    }
+    result = api.annotate_and_score(
+        record, db=db, detectors=detector_list, timings=timings, cache=cache
+    )
     if out_json:
-        export_json(result, out_json)
-    typer.echo(json.dumps(result, indent=2))
+        export_json(result, out_json, compact=compact)
+    typer.echo(dumps_str(result, pretty=not compact))
+
+
+def _batch_results(
+    inputs: List[Path],
+    db: str,
+    detectors: Optional[List[str]],
+    jobs: int,
+    with_score: bool,
+    ordered: bool,
+    timings: bool = False,
+    cache: bool = False,
+) -> Iterator[Mapping[str, object]]:
+    if with_score:
+        yield from api.annotate_and_score_many(
+            inputs,
+            db=db,
+            detectors=detectors,
+            jobs=jobs,
+            ordered=ordered,
+            timings=timings,
+            cache=cache,
+        )
+        return
+    for record, features in api.annotate_many(
+        inputs, db=db, detectors=detectors, jobs=jobs, ordered=ordered
+    ):
+        yield {
+            "sequence_id": record.id,
+            "length": len(record.seq),
+            "annotations": features,
+            "db": db,
+        }
+
+
+@app.command()
+def batch(
+    inputs: List[Path] = typer.Argument(
+        ..., exists=True, dir_okay=False, help="Input FASTA/GenBank files"
+    ),
+    db: str = typer.Option("engineered-core@1.0.0", help="Database identifier"),
+    detectors: Optional[str] = typer.Option(None, help="Comma-separated detector list"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes (0 = all cores)"),
+    out: Optional[Path] = typer.Option(
+        None, help="Write JSON lines to this file instead of stdout"
+    ),
+    with_score: bool = typer.Option(
+        True, "--score/--no-score", help="Include the makeability score"
+    ),
+    ordered: bool = typer.Option(
+        True, "--ordered/--unordered", help="Keep input order in the output"
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Include per-stage timings in each line (with --score)"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse and store results in the on-disk result cache (with --score)"
+    ),
+) -> None:
+    """Annotate every record of every input, writing one JSON line per record."""
+    detector_list = detectors.split(",") if detectors else None
+    handle = out.open("wb") if out else sys.stdout.buffer
+    try:
+        results = _batch_results(
+            inputs, db, detector_list, jobs, with_score, ordered, timings, cache
+        )
+        count = write_lines(results, handle, flush=True)
+    finally:
+        if out:
+            handle.close()
+    if out:
+        typer.echo(f"Wrote {count} records to {out}", err=True)
+
+
+@app.command()
+def bench(
+    inputs: Optional[List[Path]] = typer.Argument(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="FASTA/GenBank files to time (default: synthetic plasmids)",
+    ),
+    db: str = typer.Option("engineered-core@1.0.0", help="Database identifier"),
+    sizes: Optional[str] = typer.Option(
+        None, help="Comma-separated synthetic plasmid sizes (bp) [default: 1 kb to 1 Mb]"
+    ),
+    detectors: Optional[str] = typer.Option(None, help="Comma-separated detector list"),
+    repeat: int = typer.Option(3, help="Runs per measurement; the fastest is kept"),
+    memory: bool = typer.Option(
+        True, "--memory/--no-memory", help="Measure peak memory with tracemalloc"
+    ),
+    out: Optional[Path] = typer.Option(None, help="Write the report JSON (e.g. a new baseline)"),
+    baseline: Optional[Path] = typer.Option(
+        None, exists=True, dir_okay=False, help="Compare against this report"
+    ),
+    tolerance: float = typer.Option(
+        default_factory=_module_default("bench", "DEFAULT_TOLERANCE"),
+        help="Allowed slowdown before flagging (0.2 = 20%)",
+    ),
+) -> None:
+    """Time detectors and scoring stages; exit with status 1 on regressions against --baseline."""
+    from . import bench as bench_suite
+    from .annotate.loader import iter_records
+
+    detector_list = detectors.split(",") if detectors else None
+    size_list = [int(size) for size in sizes.split(",") if size] if sizes else None
+    records = list(iter_records(inputs)) if inputs else None
+    report = bench_suite.run_benchmark(
+        db=db,
+        sizes=size_list or bench_suite.DEFAULT_SIZES,
+        records=records,
+        detectors=detector_list,
+        repeat=repeat,
+        memory=memory,
+        progress=lambda case: typer.echo(bench_suite.format_case(case), err=True),
+    )
+    throughput = report["throughput"]
+    typer.echo(
+        f"Throughput: {throughput['records_per_s']:.2f} records/s, "
+        f"{throughput['bp_per_s']:.0f} bp/s",
+        err=True,
+    )
+    if out:
+        bench_suite.save_report(report, out)
+    else:
+        typer.echo(json.dumps(report, indent=2))
+    if baseline:
+        regressions = bench_suite.compare(report, bench_suite.load_report(baseline), tolerance)
+        for item in regressions:
+            typer.echo(
+                f"REGRESSION {item['case']} {item['metric']}: "
+                f"{item['baseline']:.4g} -> {item['current']:.4g} ({item['ratio']:.2f}x)",
+                err=True,
+            )
+        if regressions:
+            raise typer.Exit(code=1)
+        typer.echo(f"No regressions against {baseline}", err=True)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on"),
+    port: int = typer.Option(8765, help="Port to listen on"),
+    db: str = typer.Option("engineered-core@1.0.0", help="Database identifier"),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Worker processes (0 = all cores)"),
+    queue_size: int = typer.Option(
+        default_factory=_module_default("server", "DEFAULT_QUEUE_SIZE"),
+        help="Records queued beyond one per worker before 503",
+    ),
+    timeout: float = typer.Option(
+        default_factory=_module_default("server", "DEFAULT_TIMEOUT_S"),
+        help="Seconds before a request is answered with 504",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Use the on-disk result cache for scored requests by default"
+    ),
+) -> None:
+    """Serve annotate/score/batch over local HTTP from a pool of warm workers."""
+    from . import server
+
+    server.serve(
+        host=host,
+        port=port,
+        db=db,
+        jobs=jobs,
+        queue_size=queue_size,
+        timeout=timeout,
+        cache=cache,
+        ready=lambda running: typer.echo(
+            f"Serving {db} on http://{host}:{running.server_address[1]} "
+            f"with {running.jobs} workers",
+            err=True,
+        ),
+    )
 
 
 @app.command()
@@ -71,19 +282,49 @@ def fetch(db: str = typer.Argument(..., help="Database identifier")) -> None:
 
 
 @app.command()
-def cache(action: str = typer.Argument(..., help="list or purge")) -> None:
+def cache(action: str = typer.Argument(..., help="list, purge or stats")) -> None:
     cache_dir = manager.get_cache_dir()
-    if action == "list":
+    if action == "stats":
+        typer.echo(json.dumps(get_result_cache().stats(), indent=2))
+    elif action == "list":
         files = sorted(cache_dir.glob("**/*"))
         for file in files:
             typer.echo(str(file))
     elif action == "purge":
+        get_result_cache().close()
         for file in cache_dir.glob("**/*"):
             if file.is_file():
                 file.unlink()
         typer.echo("Cache cleared")
     else:
-        raise typer.BadParameter("Action must be 'list' or 'purge'")
+        raise typer.BadParameter("Action must be 'list', 'purge' or 'stats'")
+
+
+@db_app.command("compile")
+def db_compile(
+    db: str = typer.Argument("engineered-core@1.0.0", help="Database identifier")
+) -> None:
+    path = manager.compile_artifacts(db)
+    typer.echo(f"Compiled {db} into {path}")
+
+
+@db_app.command("train-orf")
+def db_train_orf(
+    inputs: List[Path] = typer.Argument(
+        ..., exists=True, dir_okay=False, help="Reference backbone FASTA/GenBank files"
+    ),
+    name: Optional[str] = typer.Option(
+        None, help="Model name (default: derived from the training sequences)"
+    ),
+    genetic_code: int = typer.Option(11, help="Translation table"),
+) -> None:
+    """Train a single-mode Prodigal model for use via a database's orf_model."""
+    from .annotate.detectors import orf_prodigal
+    from .annotate.loader import iter_records
+
+    sequences = [str(record.seq) for record in iter_records(inputs)]
+    model = orf_prodigal.train_model(sequences, name=name, genetic_code=genetic_code)
+    typer.echo(f"Trained {model} into {manager.prodigal_model_path(model)}")
 
 
 @app.command()
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import Iterable, Mapping, Union
 
 from Bio import SeqIO
 from Bio.SeqRecord import SeqRecord
 
 from .annotate.types import Feature
+from .serialization import dumps, write_lines
 
 
-def export_json(data: Mapping[str, object], path: str | Path) -> None:
-    with Path(path).open("w", encoding="utf8") as handle:
-        json.dump(data, handle, indent=2, sort_keys=True)
+def export_json(
+    data: Union[Mapping[str, object], Iterable[object]],
+    path: str | Path,
+    compact: bool = True,
+    jsonl: bool = False,
+) -> None:
+    """Write ``data`` as JSON; features and feature tables may appear anywhere in it.
+
+    Output is compact by default; ``compact=False`` indents it and sorts keys.
+    With ``jsonl`` an iterable ``data`` (e.g. annotations, or batch results)
+    is written one item per line, and a mapping as a single line.
+    """
+    with Path(path).open("wb") as handle:
+        if jsonl:
+            write_lines([data] if isinstance(data, Mapping) else data, handle)
+        else:
+            handle.write(dumps(data, pretty=not compact, sort_keys=not compact))
 
 
 def export_gff3(record: SeqRecord, annotations: Iterable[Feature], path: str | Path) -> None:
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageTiming:
+    """Wall time and counters for one detector or scoring stage on one record."""
+
+    kind: str
+    name: str
+    seconds: float
+    length: int
+    features: Optional[int] = None
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        data: Dict[str, object] = {
+            "name": self.name,
+            "seconds": self.seconds,
+            "length": self.length,
+        }
+        if self.features is not None:
+            data["features"] = self.features
+        if self.counters:
+            data["counters"] = dict(self.counters)
+        return data
+
+
+class Instrumentation:
+    """Collects per-stage timings from ``run_detectors`` and ``compute_score``.
+
+    Use one instance per record. ``kind`` is ``"detector"`` or ``"scoring"``;
+    the combined motif scan is reported as detector ``motif_scan`` with the
+    number of hits per database section in its counters. ``callback`` is
+    called with every :class:`StageTiming` as it is recorded, e.g. to feed a
+    metrics system.
+    """
+
+    def __init__(self, callback: Optional[Callable[[StageTiming], None]] = None):
+        self.timings: List[StageTiming] = []
+        self.callback = callback
+
+    @contextmanager
+    def stage(self, kind: str, name: str, length: int) -> Iterator[StageTiming]:
+        timing = StageTiming(kind, name, 0.0, length)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - start
+            self.timings.append(timing)
+            if self.callback is not None:
+                self.callback(timing)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "detectors": [t.to_dict() for t in self.timings if t.kind == "detector"],
+            "scoring": [t.to_dict() for t in self.timings if t.kind == "scoring"],
+            "total_s": sum(t.seconds for t in self.timings),
+        }
+
+
+def measure(
+    instrumentation: Optional[Instrumentation], kind: str, name: str, length: int
+) -> ContextManager[StageTiming]:
+    """``instrumentation.stage(...)``, or a no-op when instrumentation is off."""
+    if instrumentation is None:
+        return nullcontext(StageTiming(kind, name, 0.0, length))
+    return instrumentation.stage(kind, name, length)
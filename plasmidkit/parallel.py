@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Deque, Iterable, Iterator, Optional, Set, Tuple, TypeVar
+
+from .cache import manager
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Tasks kept in flight per worker; bounds memory on very large inputs
+PREFETCH_PER_WORKER = 4
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Number of worker processes for ``jobs`` (None or <= 0 means every core)."""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+# Short synthetic sequence run once per worker to build indexes and gene finders up front
+_WARM_UP_SEQUENCE = "ATGAAACGCATTAGCACCACCATTACCACCACCATCACCATTACCACAGGTAACGGTGCGGGCTGA" * 8
+
+
+def init_worker(db: str, cache_dir: str, offline: bool, warm: bool = False) -> None:
+    """Process-pool initializer: mirror the parent's settings and load ``db`` once.
+
+    With ``warm`` a throwaway record is annotated and scored as well, so the
+    first real task does not pay for compiling motif sections, seed automata
+    and Prodigal finders.
+    """
+    manager.set_cache_dir(cache_dir)
+    manager.set_offline(offline)
+    manager.get_artifacts(db)
+    if warm:
+        from .api import annotate_and_score
+
+        annotate_and_score(_WARM_UP_SEQUENCE, db=db, is_sequence=True)
+
+
+def make_executor(jobs: int, db: str, warm: bool = False) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(db, str(manager.get_cache_dir()), manager.is_offline(), warm),
+    )
+
+
+def imap(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    executor: ProcessPoolExecutor,
+    jobs: int,
+    ordered: bool = True,
+) -> Iterator[Tuple[T, R]]:
+    """Yield ``(item, func(item))`` pairs computed on ``executor``.
+
+    At most ``jobs * PREFETCH_PER_WORKER`` items are pulled from ``items``
+    ahead of the consumer, so memory stays flat for unbounded inputs. With
+    ``ordered=False`` results are yielded as soon as they finish.
+    """
+    window = max(1, jobs * PREFETCH_PER_WORKER)
+    source = iter(items)
+    exhausted = False
+
+    def submit_next() -> Optional[Tuple[T, Future]]:
+        nonlocal exhausted
+        if exhausted:
+            return None
+        try:
+            item = next(source)
+        except StopIteration:
+            exhausted = True
+            return None
+        return item, executor.submit(func, item)
+
+    if ordered:
+        queue: Deque[Tuple[T, Future]] = deque()
+        while True:
+            while len(queue) < window:
+                task = submit_next()
+                if task is None:
+                    break
+                queue.append(task)
+            if not queue:
+                return
+            item, future = queue.popleft()
+            yield item, future.result()
+
+    pending: Set[Future] = set()
+    owners = {}
+    while True:
+        while len(pending) < window:
+            task = submit_next()
+            if task is None:
+                break
+            owners[task[1]] = task[0]
+            pending.add(task[1])
+        if not pending:
+            return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield owners.pop(future), future.result()
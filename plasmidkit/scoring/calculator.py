@@ -1,16 +1,29 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, Mapping, Sequence
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
 
 from Bio.SeqRecord import SeqRecord
 
+from ..annotate.sequence import PreparedSequence, prepare
 from ..annotate.types import Feature
+from ..instrumentation import Instrumentation, measure
 from . import rules
 
 
-def compute_score(record: SeqRecord, annotations: Sequence[Feature], db: Mapping[str, object]) -> Dict[str, object]:
-    synth = rules.synthesise_components(record, annotations, db)
-    assembly = rules.assembly_components(record, annotations)
+def compute_score(
+    record: SeqRecord,
+    annotations: Sequence[Feature],
+    db: Mapping[str, object],
+    instrumentation: Optional[Instrumentation] = None,
+    sequence: Optional[PreparedSequence] = None,
+) -> Dict[str, object]:
+    """Makeability score of ``record``; pass the ``sequence`` annotation prepared to reuse it."""
+    if sequence is None:
+        sequence = prepare(str(record.seq))
+    sites: Dict[str, List[int]] = {}
+    synth = rules.synthesise_components(record, annotations, db, sequence, instrumentation, sites)
+    with measure(instrumentation, "scoring", "assembly", len(record.seq)):
+        assembly = rules.assembly_components(record, annotations)
     components: Dict[str, float] = {}
     components.update(synth)
     components.update(assembly)
@@ -18,4 +31,5 @@ def compute_score(record: SeqRecord, annotations: Sequence[Feature], db: Mapping
     return {
         "total": round(total, 2),
         "components": {key: round(value, 2) for key, value in components.items()},
+        "forbidden_sites": sites,
     }
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Dict, Mapping, Sequence
+from typing import Dict, List, Mapping, Optional, Sequence
 
 from Bio.SeqRecord import SeqRecord
 
-from ..annotate.detectors import gc_length, homopolymers, repeats
+from ..annotate.detectors import gc_length, homopolymers, repeats, windows
+from ..annotate.detectors.motif_index import SectionSpec, get_motif_index
+from ..annotate.intervals import FeatureIndex
+from ..annotate.sequence import PreparedSequence, SequenceLike, prepare
 from ..annotate.types import Feature
+from ..instrumentation import Instrumentation, measure
 
 
 def _length_score(length: float) -> float:
@@ -52,15 +56,78 @@ def _homopolymer_penalty(count: float) -> float:
     return min(6.0, count * 2.0)
 
 
-def _forbidden_penalty(sequence: str, motifs: Sequence[Mapping[str, str]]) -> Dict[str, float]:
+def _local_gc_penalty(regions: float) -> float:
+    return min(6.0, regions * 1.0)
+
+
+def _local_density_penalty(regions: float) -> float:
+    return min(4.0, regions * 1.0)
+
+
+def _window_settings(db: Mapping[str, object]) -> Dict[str, float]:
+    # Vendor-specific limits can be set in the DB under "synthesis_window"
+    config = db.get("synthesis_window") if isinstance(db, Mapping) else None
+    config = config if isinstance(config, Mapping) else {}
+    return {
+        "window": int(config.get("size", windows.WINDOW)),
+        "gc_min": float(config.get("gc_min", windows.GC_MIN)),
+        "gc_max": float(config.get("gc_max", windows.GC_MAX)),
+    }
+
+
+# Forbidden sites are matched exactly, on both strands and across the origin
+FORBIDDEN_SECTION = SectionSpec("forbidden_motifs", max_mismatches=0, motif_key="sequence")
+
+
+def _forbidden_hits(sequence: SequenceLike, db: Mapping[str, object]) -> List[List[int]]:
+    """Sorted distinct site starts for each ``forbidden_motifs`` entry, in entry order.
+
+    All motifs and their reverse complements are compiled once per database
+    and found in a single automaton pass; a palindromic site matching on both
+    strands counts once.
+    """
+    index = get_motif_index(db)
+    sites: List[set] = [set() for _ in index.entries(FORBIDDEN_SECTION.name)]
+    hits = index.scan(sequence, [FORBIDDEN_SECTION])[FORBIDDEN_SECTION]
+    for entry, start, _motif, _strand, _mm in hits:
+        sites[entry].add(start)
+    return [sorted(positions) for positions in sites]
+
+
+def forbidden_sites(sequence: SequenceLike, db: Mapping[str, object]) -> Dict[str, List[int]]:
+    """Start positions (forward-strand coordinates) of every forbidden motif found, keyed by id."""
+    entries = get_motif_index(db).entries(FORBIDDEN_SECTION.name)
+    return _sites_by_id(entries, _forbidden_hits(sequence, db))
+
+
+def _sites_by_id(
+    entries: Sequence[Mapping[str, object]], hits: List[List[int]]
+) -> Dict[str, List[int]]:
+    found: Dict[str, List[int]] = {}
+    for entry, positions in zip(entries, hits):
+        if positions:
+            key = entry.get("id", entry.get("sequence", ""))
+            found[key] = sorted(set(found.get(key, [])) | set(positions))
+    return found
+
+
+def _forbidden_penalty(
+    sequence: SequenceLike,
+    db: Mapping[str, object],
+    sites: Optional[Dict[str, List[int]]] = None,
+) -> Dict[str, float]:
+    """Penalty per forbidden motif found; ``sites`` (if given) receives their positions."""
     penalties: Dict[str, float] = {}
-    seq_upper = sequence.upper()
+    entries = get_motif_index(db).entries(FORBIDDEN_SECTION.name)
+    hits = _forbidden_hits(sequence, db)
+    if sites is not None:
+        sites.update(_sites_by_id(entries, hits))
     total = 0.0
-    for entry in motifs:
-        motif = entry.get("sequence", "").upper()
+    for entry, positions in zip(entries, hits):
+        motif = str(entry.get("sequence", "")).upper()
         if not motif:
             continue
-        occurrences = seq_upper.count(motif)
+        occurrences = len(positions)
         if occurrences:
             penalty = min(9.0 - total, float(occurrences))
             total += penalty
@@ -72,11 +139,30 @@ def _forbidden_penalty(sequence: str, motifs: Sequence[Mapping[str, str]]) -> Di
     return penalties
 
 
-def synthesise_components(record: SeqRecord, annotations: Sequence[Feature], db: Mapping[str, object]) -> Dict[str, float]:
-    sequence = str(record.seq)
-    stats = gc_length.analyse(sequence)
-    repeat_stats = repeats.analyse(sequence)
-    homopolymer_stats = homopolymers.analyse(sequence)
+def synthesise_components(
+    record: SeqRecord,
+    annotations: Sequence[Feature],
+    db: Mapping[str, object],
+    sequence: Optional[PreparedSequence] = None,
+    instrumentation: Optional[Instrumentation] = None,
+    forbidden_sites: Optional[Dict[str, List[int]]] = None,
+) -> Dict[str, float]:
+    """Sequence-level score components.
+
+    ``forbidden_sites``, if given, receives the positions behind the
+    forbidden-motif penalties, keyed by motif id.
+    """
+    if sequence is None:
+        sequence = prepare(str(record.seq))
+    length = len(sequence)
+    with measure(instrumentation, "scoring", "gc_length", length):
+        stats = gc_length.analyse(sequence)
+    with measure(instrumentation, "scoring", "repeats", length):
+        repeat_stats = repeats.analyse(sequence)
+    with measure(instrumentation, "scoring", "homopolymers", length):
+        homopolymer_stats = homopolymers.analyse(sequence)
+    with measure(instrumentation, "scoring", "windows", length):
+        window_stats = windows.analyse(sequence, **_window_settings(db))
 
     components: Dict[str, float] = {}
     components["length"] = round(_length_score(stats["length"]), 2)
@@ -84,8 +170,14 @@ def synthesise_components(record: SeqRecord, annotations: Sequence[Feature], db:
     components["repeats"] = round(-_repeat_penalty(repeat_stats["repeat_bases"], stats["length"]), 2)
     components["palindromes"] = round(-_palindrome_penalty(repeat_stats["longest_palindrome"]), 2)
     components["homopolymers"] = round(-_homopolymer_penalty(homopolymer_stats["count"]), 2)
-
-    forbidden = _forbidden_penalty(sequence, db.get("forbidden_motifs", []))
+    components["local_gc"] = round(-_local_gc_penalty(window_stats["gc_regions"]), 2)
+    components["local_homopolymers"] = round(
+        -_local_density_penalty(window_stats["homopolymer_regions"]), 2
+    )
+    components["local_repeats"] = round(-_local_density_penalty(window_stats["repeat_regions"]), 2)
+
+    with measure(instrumentation, "scoring", "forbidden_motifs", length):
+        forbidden = _forbidden_penalty(sequence, db, forbidden_sites)
     for key, value in forbidden.items():
         components[key] = round(value, 2)
     return components
@@ -95,32 +187,32 @@ def _score_range(total: float, lower: float, upper: float) -> float:
     return max(lower, min(upper, total))
 
 
-def _ori_marker_scores(annotations: Sequence[Feature]) -> Dict[str, float]:
+def _ori_marker_scores(features: FeatureIndex) -> Dict[str, float]:
     components: Dict[str, float] = {}
-    ori_present = any(feature.type == "rep_origin" for feature in annotations)
-    marker_present = any(feature.type == "cds" for feature in annotations)
+    ori_present = features.has_type("rep_origin")
+    marker_present = features.has_type("cds")
     components["ori_recognition"] = 8.0 if ori_present else -10.0
     components["marker_recognition"] = 6.0 if marker_present else -8.0
-    promoter_present = any(feature.type == "promoter" for feature in annotations)
-    terminator_present = any(feature.type == "terminator" for feature in annotations)
+    promoter_present = features.has_type("promoter")
+    terminator_present = features.has_type("terminator")
     promoter_score = 4.0 if promoter_present else 0.0
     terminator_score = 3.0 if terminator_present else 0.0
     components["promoter_terminator"] = promoter_score + terminator_score
     return components
 
 
-def _mcs_score(annotations: Sequence[Feature]) -> float:
-    restriction_sites = [feature.id for feature in annotations if feature.type == "restriction_site"]
+def _mcs_score(features: FeatureIndex) -> float:
+    restriction_sites = [feature.id for feature in features.of_type("restriction_site")]
     counts = Counter(restriction_sites)
     unique_sites = sum(1 for count in counts.values() if count == 1)
     capped = min(unique_sites, 3)
     return capped * 2.0
 
 
-def _burden_penalty(length: float, annotations: Sequence[Feature]) -> float:
-    ori_ids = {feature.id for feature in annotations if feature.type == "rep_origin"}
-    promoter_ids = {feature.id for feature in annotations if feature.type == "promoter"}
-    payload = length - sum(feature.end - feature.start for feature in annotations if feature.type == "cds")
+def _burden_penalty(length: float, features: FeatureIndex) -> float:
+    ori_ids = {feature.id for feature in features.of_type("rep_origin")}
+    promoter_ids = {feature.id for feature in features.of_type("promoter")}
+    payload = length - sum(feature.end - feature.start for feature in features.of_type("cds"))
     penalty = 0.0
     high_copy = bool(ori_ids & {"ColE1", "pMB1", "p15A"})
     strong_promoter = bool(promoter_ids & {"T7", "CMV"})
@@ -131,11 +223,14 @@ def _burden_penalty(length: float, annotations: Sequence[Feature]) -> float:
     return penalty
 
 
-def assembly_components(record: SeqRecord, annotations: Sequence[Feature]) -> Dict[str, float]:
+def assembly_components(
+    record: SeqRecord, annotations: Sequence[Feature] | FeatureIndex
+) -> Dict[str, float]:
     sequence_length = float(len(record.seq))
-    components = _ori_marker_scores(annotations)
-    components["mcs_uniqueness"] = _mcs_score(annotations)
-    components["burden"] = _burden_penalty(sequence_length, annotations)
+    features = annotations if isinstance(annotations, FeatureIndex) else FeatureIndex(annotations)
+    components = _ori_marker_scores(features)
+    components["mcs_uniqueness"] = _mcs_score(features)
+    components["burden"] = _burden_penalty(sequence_length, features)
     return components
 
 
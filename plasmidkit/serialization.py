@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from typing import IO, Iterable, Union
+
+import numpy as np
+
+from .annotate.table import FeatureTable
+from .annotate.types import Feature
+
+# Optional dependency: orjson (the "fast" extra)
+try:
+    import orjson as _orjson  # type: ignore
+
+    _HAS_ORJSON = True
+except Exception:
+    _orjson = None  # type: ignore
+    _HAS_ORJSON = False
+
+if _HAS_ORJSON:
+    # Dataclasses go through _default so features keep the to_dict() layout
+    _BASE_OPTIONS = (
+        _orjson.OPT_PASSTHROUGH_DATACLASS | _orjson.OPT_SERIALIZE_NUMPY | _orjson.OPT_NON_STR_KEYS
+    )
+
+
+def _default(obj: object) -> object:
+    if isinstance(obj, Feature):
+        # The instance dict already holds to_dict()'s keys in the same order,
+        # so only features without evidence need a dict of their own
+        return obj.__dict__ if obj.evidence else obj.to_dict()
+    if isinstance(obj, FeatureTable):
+        return obj.to_dicts()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: object, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """UTF-8 JSON for ``obj``: compact by default, or indented by two spaces.
+
+    :class:`Feature` objects (and :class:`FeatureTable` rows) are written as
+    ``Feature.to_dict()`` would, so callers can pass annotations directly.
+    Uses orjson when installed and the standard library otherwise; both give
+    the same document, though number formatting may differ (``1e-5`` vs
+    ``1e-05``).
+    """
+    if _HAS_ORJSON:
+        option = _BASE_OPTIONS
+        if pretty:
+            option |= _orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        return _orjson.dumps(obj, default=_default, option=option)
+    if pretty:
+        text = json.dumps(obj, default=_default, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    else:
+        text = json.dumps(
+            obj, default=_default, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False
+        )
+    return text.encode("utf8")
+
+
+def dumps_str(obj: object, pretty: bool = False, sort_keys: bool = False) -> str:
+    return dumps(obj, pretty=pretty, sort_keys=sort_keys).decode("utf8")
+
+
+def loads(data: Union[bytes, str]) -> object:
+    return _orjson.loads(data) if _HAS_ORJSON else json.loads(data)
+
+
+def write_lines(items: Iterable[object], handle: IO[bytes], flush: bool = False) -> int:
+    """Write each of ``items`` as one compact JSON line (JSONL); returns the count.
+
+    With ``flush`` the handle is flushed after every line, for streaming output.
+    """
+    count = 0
+    for item in items:
+        handle.write(dumps(item))
+        handle.write(b"\n")
+        if flush:
+            handle.flush()
+        count += 1
+    return count
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from Bio import SeqIO
+from Bio.SeqRecord import SeqRecord
+
+from . import api, parallel
+from .annotate.detectors import get_detector
+from .annotate.loader import load_record
+from .cache import manager
+from .serialization import dumps, loads
+
+# Records accepted beyond one per worker before new requests are turned away with 503
+DEFAULT_QUEUE_SIZE = 64
+# Seconds a request may wait for its result before the server answers 504
+DEFAULT_TIMEOUT_S = 120.0
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class RequestError(ValueError):
+    """Raised for malformed requests; reported to the client as 400."""
+
+
+class ServerBusy(RuntimeError):
+    """Raised when too few worker slots are free for a request; reported as 503."""
+
+
+def _annotate_job(record: SeqRecord, db: str, detectors: Optional[List[str]]) -> Dict[str, object]:
+    features = api.annotate(record, db=db, detectors=detectors)
+    return {
+        "sequence_id": record.id,
+        "length": len(record.seq),
+        "annotations": features,
+        "db": db,
+    }
+
+
+def _score_job(
+    record: SeqRecord, db: str, detectors: Optional[List[str]], timings: bool, cache: bool
+) -> Mapping[str, object]:
+    return api.annotate_and_score(record, db=db, detectors=detectors, timings=timings, cache=cache)
+
+
+def _parse_records(payload: Mapping[str, object]) -> List[SeqRecord]:
+    """Records in a request payload.
+
+    ``sequence`` is raw DNA, ``record`` FASTA/GenBank text and ``records`` a
+    list of either.
+    """
+    if "records" in payload:
+        items = payload["records"]
+        if not isinstance(items, list):
+            raise RequestError("'records' must be a list")
+        records: List[SeqRecord] = []
+        for item in items:
+            records.extend(
+                _parse_records(item if isinstance(item, Mapping) else {"sequence": item})
+            )
+        return records
+    if isinstance(payload.get("sequence"), str):
+        record = load_record(payload["sequence"], is_sequence=True)
+        record.id = str(payload.get("id", record.id))
+        return [record]
+    if isinstance(payload.get("record"), str):
+        text = payload["record"]
+        fmt = "genbank" if text.lstrip().startswith("LOCUS") else "fasta"
+        records = list(SeqIO.parse(io.StringIO(text), fmt))
+        if not records:
+            raise RequestError(f"No {fmt} records found in 'record'")
+        return records
+    raise RequestError("Request needs 'sequence', 'record' or 'records'")
+
+
+class _Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.in_flight = 0
+        self.rejected = 0
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, endpoint: str, seconds: float, records: int, error: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            stats = self.endpoints.setdefault(
+                endpoint, {"requests": 0, "errors": 0, "records": 0, "total_s": 0.0, "max_s": 0.0}
+            )
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["records"] += records
+            stats["total_s"] += seconds
+            stats["max_s"] = max(stats["max_s"], seconds)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            endpoints = {}
+            for name, stats in self.endpoints.items():
+                mean_s = stats["total_s"] / stats["requests"] if stats["requests"] else 0.0
+                endpoints[name] = dict(stats, mean_s=mean_s)
+            return {
+                "uptime_s": time.time() - self.started,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+                "endpoints": endpoints,
+            }
+
+
+class PlasmidKitServer(ThreadingHTTPServer):
+    """HTTP front end to a pool of warm worker processes.
+
+    Each worker loads ``db`` and runs a throwaway annotation on start-up, so
+    requests only pay for their own work. Up to ``jobs + queue_size``
+    records are accepted at once (running or waiting for a worker), each
+    record of a batch counting separately; beyond that the server answers
+    503 so callers can back off.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        db: str = "engineered-core@1.0.0",
+        jobs: Optional[int] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: float = DEFAULT_TIMEOUT_S,
+        cache: bool = False,
+    ):
+        self.db = db
+        self.jobs = parallel.resolve_jobs(jobs)
+        self.queue_size = max(0, queue_size)
+        self.request_timeout = timeout
+        self.cache = cache
+        self.metrics = _Metrics()
+        self.capacity = self.jobs + self.queue_size
+        self._lock = threading.Lock()
+        self._pending = 0
+        manager.get_artifacts(db)
+        self.executor = parallel.make_executor(self.jobs, db, warm=True)
+        # Pools start workers on first use; do it now so no request pays for the warm-up
+        for future in [self.executor.submit(os.getpid) for _ in range(self.jobs)]:
+            future.result()
+        super().__init__(address, _Handler)
+
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return self._pending < self.capacity
+
+    def _release(self, count: int = 1) -> None:
+        with self._lock:
+            self._pending -= count
+
+    def run(self, jobs: Sequence[Tuple[object, ...]]) -> List[object]:
+        """Run ``(func, *args)`` jobs on the pool and return results in order.
+
+        Every job holds one slot until it finishes on the pool, even after the
+        request has timed out; raises :class:`ServerBusy` if too few are free.
+        """
+        if len(jobs) > self.capacity:
+            raise RequestError(
+                f"{len(jobs)} records exceed the server capacity of {self.capacity}; "
+                "split the batch"
+            )
+        with self._lock:
+            if self._pending + len(jobs) > self.capacity:
+                raise ServerBusy("Server busy")
+            self._pending += len(jobs)
+        futures: List[Future] = []
+        try:
+            for job in jobs:
+                futures.append(self.executor.submit(*job))
+                futures[-1].add_done_callback(lambda _future: self._release())
+        except BaseException:
+            self._release(len(jobs) - len(futures))
+            for future in futures:
+                future.cancel()
+            raise
+        deadline = time.monotonic() + self.request_timeout
+        try:
+            return [
+                future.result(timeout=max(0.0, deadline - time.monotonic())) for future in futures
+            ]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def health(self) -> Dict[str, object]:
+        return {
+            "status": "ok",
+            "db": self.db,
+            "db_sha256": manager.get_artifacts_sha256(self.db),
+            "version": manager.package_version(),
+            "workers": self.jobs,
+            "queue_size": self.queue_size,
+        }
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PlasmidKitServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - stdlib signature
+        # Per-request logging would dominate at high request rates; /metrics has the counts
+        pass
+
+    def _send(
+        self, status: int, body: Mapping[str, object], headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        data = dumps(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, self.server.health())
+        elif self.path == "/metrics":
+            metrics = self.server.metrics.snapshot()
+            metrics["workers"] = self.server.jobs
+            metrics["capacity"] = self.server.capacity
+            self._send(HTTPStatus.OK, metrics)
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        endpoint = self.path.strip("/")
+        if endpoint not in ("annotate", "score", "batch"):
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        header = self.headers.get("Content-Length")
+        if header is None:
+            # Without a length (e.g. a chunked body) the request cannot be read safely
+            self._send(HTTPStatus.LENGTH_REQUIRED, {"error": "Content-Length required"})
+            self.close_connection = True
+            return
+        if not (header.isascii() and header.strip().isdigit()):
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"Invalid Content-Length {header!r}"})
+            self.close_connection = True
+            return
+        length = int(header)
+        if length > MAX_BODY_BYTES:
+            self._send(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"},
+            )
+            self.close_connection = True
+            return
+        server = self.server
+        if not server.has_capacity():
+            # Turned away unread, so the connection cannot be reused
+            server.metrics.reject()
+            self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Server busy"},
+                {"Retry-After": "1", "Connection": "close"},
+            )
+            return
+        body = self.rfile.read(length)
+        server.metrics.begin()
+        start = time.perf_counter()
+        records: List[SeqRecord] = []
+        error = True
+        try:
+            status, result = self._handle(endpoint, body, records)
+            error = status != HTTPStatus.OK
+            busy = status == HTTPStatus.SERVICE_UNAVAILABLE
+            self._send(status, result, {"Retry-After": "1"} if busy else None)
+        finally:
+            server.metrics.end(endpoint, time.perf_counter() - start, len(records), error)
+
+    def _handle(
+        self, endpoint: str, body: bytes, records: List[SeqRecord]
+    ) -> Tuple[int, Mapping[str, object]]:
+        server = self.server
+        try:
+            payload = loads(body or b"{}")
+            if not isinstance(payload, Mapping):
+                raise RequestError("Request body must be a JSON object")
+            if payload.get("db", server.db) != server.db:
+                raise RequestError(f"This server only serves {server.db}")
+            records.extend(_parse_records(payload))
+            if endpoint != "batch" and len(records) != 1:
+                raise RequestError(f"/{endpoint} takes exactly one record; use /batch for several")
+            detectors = payload.get("detectors")
+            if detectors is not None:
+                if not (
+                    isinstance(detectors, list) and all(isinstance(name, str) for name in detectors)
+                ):
+                    raise RequestError("'detectors' must be a list of detector names")
+                for name in detectors:
+                    try:
+                        get_detector(name)
+                    except ImportError as exc:
+                        raise RequestError(f"Unknown detector {name!r}") from exc
+            with_score = endpoint == "score" or (endpoint == "batch" and payload.get("score", True))
+            if with_score:
+                options = (
+                    bool(payload.get("timings", False)),
+                    bool(payload.get("cache", server.cache)),
+                )
+                jobs = [(_score_job, record, server.db, detectors) + options for record in records]
+            else:
+                jobs = [(_annotate_job, record, server.db, detectors) for record in records]
+            results = server.run(jobs)
+        except ValueError as exc:  # RequestError, InvalidSequence, malformed JSON
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        except ServerBusy as exc:
+            server.metrics.reject()
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)}
+        except FutureTimeout:
+            message = f"No result within {server.request_timeout}s"
+            return HTTPStatus.GATEWAY_TIMEOUT, {"error": message}
+        except Exception as exc:  # worker failures are reported, not allowed to kill the handler
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+        if endpoint == "batch":
+            return HTTPStatus.OK, {"results": results}
+        return HTTPStatus.OK, results[0]
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    db: str = "engineered-core@1.0.0",
+    jobs: Optional[int] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    timeout: float = DEFAULT_TIMEOUT_S,
+    cache: bool = False,
+    ready: Optional[Callable[[PlasmidKitServer], None]] = None,
+) -> None:
+    """Serve until interrupted; ``ready`` is called with the server once it listens."""
+    server = PlasmidKitServer(
+        (host, port), db=db, jobs=jobs, queue_size=queue_size, timeout=timeout, cache=cache
+    )
+    try:
+        if ready is not None:
+            ready(server)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -239,3 +239,175 @@ def test_psc101_requires_rep_origin_overlap() -> None:
             break
 
     assert hit, "Expected a pSC101 rep_origin overlapping the CSV interval"
+
+
+def test_annotate_and_score_many_matches_single_record_api() -> None:
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    import plasmidkit as pk
+
+    fastas = _list_fasta_files()
+    expected = [pk.annotate_and_score(pk.load_record(path)) for path in fastas]
+    assert list(pk.annotate_and_score_many(fastas, jobs=2)) == expected
+    unordered = list(pk.annotate_and_score_many(fastas, jobs=2, ordered=False))
+    assert sorted(r["sequence_id"] for r in unordered) == sorted(r["sequence_id"] for r in expected)
+
+
+def test_async_annotator_limits_concurrency_and_cancels() -> None:
+    import asyncio
+    import sys
+    import threading
+    import time
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    import plasmidkit as pk
+    from plasmidkit import aio
+
+    record = pk.load_record(Path("tests/data/pUC19.fasta"))
+    expected = pk.annotate_and_score(record)
+    running = 0
+    peak = 0
+    guard = threading.Lock()
+
+    def slow() -> None:
+        nonlocal running, peak
+        with guard:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with guard:
+            running -= 1
+
+    async def main() -> None:
+        async with aio.AsyncAnnotator(max_concurrency=2) as annotator:
+            assert await annotator.annotate_and_score(record) == expected
+            await asyncio.gather(*(annotator.run(slow) for _ in range(6)))
+            assert peak == 2
+            # Calls waiting for a slot are dropped on cancellation
+            busy = [asyncio.ensure_future(annotator.run(slow)) for _ in range(2)]
+            queued = asyncio.ensure_future(annotator.run(slow))
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            await asyncio.gather(*busy)
+        assert (await aio.annotate(record))[0].to_dict() == expected["annotations"][0]
+
+    asyncio.run(main())
+
+
+def test_async_annotator_shares_result_cache_across_threads(tmp_path: Path) -> None:
+    import asyncio
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from plasmidkit import aio
+    from plasmidkit.cache import manager
+
+    sequences = [f"GAATTC{'A' * i}AAGCTTGGATCC" * 20 for i in range(40)]
+    previous = manager.get_cache_dir()
+    manager.set_cache_dir(tmp_path)
+    try:
+
+        async def main() -> list:
+            async with aio.AsyncAnnotator(max_concurrency=8) as annotator:
+                calls = [
+                    annotator.annotate_and_score(seq, ["mcs"], is_sequence=True, cache=True)
+                    for seq in sequences * 8
+                ]
+                return await asyncio.gather(*calls)
+
+        results = asyncio.run(main())
+    finally:
+        manager.set_cache_dir(previous)
+    assert any(result.get("cached") for result in results)
+    for index, result in enumerate(results):
+        first = results[index % len(sequences)]
+        assert result["annotations"] == first["annotations"]
+        assert result["score"] == first["score"]
+
+
+def test_feature_table_round_trips_annotations() -> None:
+    import pickle
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    import plasmidkit as pk
+
+    names = ("pUC19.fasta", "pSC101.fasta")
+    records = [pk.load_record(Path("tests/data") / name) for name in names]
+    features = [pk.annotate(record) for record in records]
+    tables = [table for _record, table in pk.annotate_many(records, jobs=1, as_table=True)]
+    for table, expected in zip(tables, features):
+        assert isinstance(table, pk.FeatureTable) and len(table) == len(expected)
+        assert table.to_dicts() == [f.to_dict() for f in expected]
+        assert [f.to_dict() for f in table] == [f.to_dict() for f in expected]
+        assert table[-1] == expected[-1]
+        assert table.of_type("CDS").to_dicts() == [f.to_dict() for f in expected if f.type == "CDS"]
+        assert pickle.loads(pickle.dumps(table)).to_dicts() == table.to_dicts()
+    library = pk.FeatureTable.concat(tables)
+    assert library.to_dicts() == [f.to_dict() for found in features for f in found]
+    assert library.start.dtype.kind == "i"
+    assert library.column("type")[: len(features[0])] == [f.type for f in features[0]]
+    expected_score = pk.score(records[0], annotations=features[0])
+    assert pk.score(records[0], annotations=tables[0]) == expected_score
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_serialization_writes_features_like_to_dict(
+    use_orjson: bool, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    import numpy as np
+
+    import plasmidkit as pk
+    from plasmidkit import serialization
+    from plasmidkit.annotate.types import Feature
+
+    if use_orjson and not serialization._HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialization, "_HAS_ORJSON", use_orjson)
+
+    record = pk.load_record(Path("tests/data/pUC19.fasta"))
+    features = pk.annotate(record) + [Feature("misc_feature", "bare", 3, 9)]
+    expected = [f.to_dict() for f in features]
+    table = pk.FeatureTable.from_features(features)
+    document = {"annotations": features, "table": table, "n": np.int64(7)}
+    encoded = serialization.dumps(document)
+    assert json.loads(encoded) == {"annotations": expected, "table": expected, "n": 7}
+    assert b"\n" not in encoded
+    assert serialization.loads(serialization.dumps(document, pretty=True)) == json.loads(encoded)
+
+    compact, pretty, lines = tmp_path / "a.json", tmp_path / "b.json", tmp_path / "c.jsonl"
+    pk.export_json({"annotations": features}, compact)
+    pk.export_json({"annotations": features}, pretty, compact=False)
+    pk.export_json(features, lines, jsonl=True)
+    assert json.loads(compact.read_text()) == {"annotations": expected}
+    assert json.loads(pretty.read_text()) == {"annotations": expected}
+    assert pretty.read_text().startswith('{\n  "annotations": [')
+    assert [json.loads(line) for line in lines.read_text().splitlines()] == expected
+
+
+def test_annotate_and_score_prepares_each_record_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    import plasmidkit as pk
+    from plasmidkit.annotate.sequence import PreparedSequence
+
+    record = pk.load_record(Path("tests/data/pUC19.fasta"))
+    expected = pk.annotate_and_score(record)
+    built = []
+    original = PreparedSequence.__init__
+
+    def counting_init(self, *args, **kwargs):
+        built.append(self)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(PreparedSequence, "__init__", counting_init)
+    assert pk.annotate_and_score(record) == expected
+    assert len(built) == 1
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from Bio.Seq import Seq  # noqa: E402
+from Bio.SeqRecord import SeqRecord  # noqa: E402
+
+from plasmidkit import bench  # noqa: E402
+
+DB = {
+    "ori": [{"id": "toy_ori", "motifs": ["GCCCGCCTAATGAGCGGGC"]}],
+    "promoters": [{"id": "toy_promoter", "motifs": ["TTGACAGCTAGCTCAGTCC"]}],
+    "mcs_sites": [{"id": "EcoRI", "sequence": "GAATTC"}],
+    "forbidden_motifs": [{"id": "BsaI", "sequence": "GGTCTC"}],
+}
+
+
+def test_synthetic_plasmids_are_deterministic() -> None:
+    first = bench.synthetic_plasmid(5000, DB, seed=1)
+    assert len(first) == 5000
+    assert first == bench.synthetic_plasmid(5000, DB, seed=1)
+    assert first != bench.synthetic_plasmid(5000, DB, seed=2)
+    # Motifs from the DB are planted in one orientation or the other
+    assert "GCCCGCCTAATGAGCGGGC" in first or "GCCCGCTCATTAGGCGGGC" in first
+
+
+def test_benchmark_record_and_compare() -> None:
+    record = SeqRecord(Seq(bench.synthetic_plasmid(3000, DB)), id="toy")
+    case = bench.benchmark_record(record, DB, ["ori", "promoter", "mcs"], repeat=1)
+    assert set(case["detectors"]) == {"ori", "promoter", "mcs"}
+    assert {"repeats", "windows", "forbidden_motifs"} <= set(case["scoring"])
+    assert case["peak_memory_bytes"] > 0
+
+    baseline = {"cases": [case]}
+    assert bench.compare({"cases": [case]}, baseline) == []
+    slower = dict(case, annotate=case["annotate"] * 2 + 1.0)
+    regressions = bench.compare({"cases": [slower]}, baseline)
+    assert [item["metric"] for item in regressions] == ["annotate"]
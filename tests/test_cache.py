@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from plasmidkit.cache import manager  # noqa: E402
+
+
+def test_get_artifacts_is_memoized() -> None:
+    manager.clear_artifact_cache()
+    first = manager.get_artifacts("engineered-core@1.0.0")
+    assert manager.get_artifacts("engineered-core@1.0.0") is first
+    reloaded = manager.reload_artifacts("engineered-core@1.0.0")
+    assert reloaded is not first
+    assert manager.get_artifacts("engineered-core@1.0.0") is reloaded
+    manager.clear_artifact_cache()
+    assert manager.get_artifacts("engineered-core@1.0.0") is not reloaded
+
+
+def test_compiled_database_matches_json(tmp_path: Path) -> None:
+    from plasmidkit.annotate.detectors import run_detectors
+    from plasmidkit.cache.compiled import CompiledDatabase
+
+    previous = manager.get_cache_dir()
+    manager.set_cache_dir(tmp_path)
+    try:
+        source = manager.get_artifacts("engineered-core@1.0.0")
+        path = manager.compile_artifacts("engineered-core@1.0.0")
+        compiled = manager.get_artifacts("engineered-core@1.0.0")
+        assert isinstance(compiled, CompiledDatabase)
+        assert compiled.path == path
+        assert list(compiled) == list(source)
+
+        sequence = "GAATTCAAGCTTGGATCC" * 20
+        run_detectors(sequence, compiled, ["mcs"])
+        assert set(compiled._groups) == {"mcs_sites"}
+        names = ["ori", "marker", "promoter", "terminator", "mcs"]
+        assert [f.to_dict() for f in run_detectors(sequence, compiled, names)] == [
+            f.to_dict() for f in run_detectors(sequence, source, names)
+        ]
+    finally:
+        manager.set_cache_dir(previous)
+        manager.clear_artifact_cache()
+
+
+def test_result_cache_keys_and_lru_eviction(tmp_path: Path) -> None:
+    from plasmidkit.cache.results import ResultCache, result_key
+
+    key = result_key("acgt\nACGT", "engineered-core@1.0.0", "abc", ["ori"], version="1")
+    assert key == result_key("ACGTACGT", "engineered-core@1.0.0", "abc", ["ori"], version="1")
+    assert key != result_key("ACGTACGT", "engineered-core@1.0.0", "abd", ["ori"], version="1")
+    assert key != result_key("ACGTACGT", "engineered-core@1.0.0", "abc", None, version="1")
+    assert key != result_key("ACGTACGT", "engineered-core@1.0.0", "abc", ["ori"], version="2")
+    model = "model.trn:1024:1700000000"
+    assert key != result_key("ACGTACGT", "engineered-core@1.0.0", "abc", ["ori"], "1", model)
+
+    store = ResultCache(tmp_path / "results.sqlite")
+    value = {"annotations": [{"id": "x" * 2000}], "score": {"total": 50}}
+    store.put("a", value)
+    assert store.get("a") == value
+    store.max_bytes = store.stats()["bytes"] * 2 + 10
+    store.put("b", value)
+    store.get("a")  # "b" is now the least recently read
+    store.put("c", value)
+    assert store.get("b") is None
+    assert store.get("a") == value and store.get("c") == value
+    assert store.stats()["entries"] == 2
+    store.close()
+
+
+def test_result_cache_is_shared_across_threads(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from plasmidkit.cache.results import ResultCache
+
+    store = ResultCache(tmp_path / "results.sqlite")
+
+    def roundtrip(index: int) -> bool:
+        value = {"index": index, "score": {"total": index % 100}}
+        store.put(f"key-{index}", value)
+        store.get(f"key-{index // 2}")  # reads race with other threads' writes
+        return store.get(f"key-{index}") == value
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        assert all(pool.map(roundtrip, range(400)))
+    assert store.stats()["entries"] == 400
+    store.close()
+    assert store.get("key-7") == {"index": 7, "score": {"total": 7}}
+    store.close()
+
+
+def test_annotate_and_score_uses_result_cache(tmp_path: Path) -> None:
+    from plasmidkit import api
+    from plasmidkit.cache.results import ResultCache
+
+    store = ResultCache(tmp_path / "results.sqlite")
+    sequence = "GAATTCAAGCTTGGATCC" * 20
+    first = api.annotate_and_score(sequence, is_sequence=True, cache=store)
+    assert "cached" not in first
+    second = api.annotate_and_score(sequence.lower(), is_sequence=True, cache=store)
+    assert second.pop("cached") is True
+    assert second == first
+    other = api.annotate_and_score(sequence, is_sequence=True, detectors=["mcs"], cache=store)
+    assert other.get("cached") is None
+    assert store.stats()["entries"] == 2
+    store.close()
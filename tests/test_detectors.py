@@ -0,0 +1,619 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from plasmidkit.annotate.detectors import get_detector, run_detectors  # noqa: E402
+from plasmidkit.annotate.detectors.motif_index import SectionSpec, get_motif_index  # noqa: E402
+from plasmidkit.annotate.detectors.utils import find_motifs_fuzzy_tagged  # noqa: E402
+
+SEQUENCE = (
+    "TTGACAGCTAGCTCAGTCCTAGGTATAATGCTAGCGAATTCGGATCCAAGCTTCTGCAGGTCGAC"
+    "AAAAAAAAGCCCGCCTAATGAGCGGGCTTTTTTTTGATATCCCCGGGAAGGAGGTTTAAACCATGG"
+)
+
+DB = {
+    "ori": [{"id": "toy_ori", "motifs": ["GCCCGCCTAATGAGCGGGC", "ACGT"]}],
+    "markers": [{"id": "toy_marker", "motifs": ["GATATCCCCGGGAAGGAGG"]}],
+    "promoters": [
+        {"id": "toy_promoter", "motifs": ["TTGACAGCTAGCTCAGTCC", "CTAGGTATAATGCTAGC"]},
+        {"id": "toy_promoter_rc", "motifs": ["GCTAGCATTATACCTAGG"]},
+    ],
+    "terminators": [{"id": "toy_terminator", "motifs": ["AGCGGGCTTTTTTTTG"]}],
+    "mcs_sites": [{"id": "EcoRI", "sequence": "GAATTC"}, {"id": "BamHI", "sequence": "GGATCC"}],
+}
+
+
+def test_compiled_index_matches_per_entry_search() -> None:
+    index = get_motif_index(DB)
+    assert get_motif_index(DB) is index
+    section = index.section(SectionSpec("promoters", max_mismatches=1))
+    expected = []
+    for entry_idx, entry in enumerate(DB["promoters"]):
+        for hit in find_motifs_fuzzy_tagged(SEQUENCE, entry["motifs"], max_mismatches=1):
+            expected.append((entry_idx,) + hit)
+    expected.sort(key=lambda t: (t[4], -len(t[2]), t[1]))
+    assert section.search(SEQUENCE) == expected
+
+
+def test_motif_detectors_find_toy_features() -> None:
+    features = run_detectors(SEQUENCE, DB, ["ori", "marker", "promoter", "terminator", "mcs"])
+    ids = {feature.id for feature in features}
+    assert {"toy_ori", "toy_marker", "toy_promoter", "toy_terminator", "EcoRI", "BamHI"} <= ids
+    wrapped = SEQUENCE[40:] + SEQUENCE[:40]
+    shifted = run_detectors(wrapped, DB, ["ori", "marker", "promoter", "terminator", "mcs"])
+    assert sorted(f.id for f in shifted) == sorted(f.id for f in features)
+
+
+def test_single_pass_scan_matches_individual_detectors() -> None:
+    names = ["ori", "marker", "promoter", "terminator", "mcs"]
+    combined = run_detectors(SEQUENCE, DB, names)
+    separate = [feature for name in names for feature in get_detector(name)(SEQUENCE, DB)]
+    assert [f.to_dict() for f in combined] == [f.to_dict() for f in separate]
+
+
+def test_instrumentation_records_each_detector_and_scoring_stage() -> None:
+    from Bio.Seq import Seq
+    from Bio.SeqRecord import SeqRecord
+
+    from plasmidkit.instrumentation import Instrumentation
+    from plasmidkit.scoring.calculator import compute_score
+
+    names = ["ori", "marker", "promoter", "terminator", "mcs"]
+    seen = []
+    instrumentation = Instrumentation(callback=seen.append)
+    features = run_detectors(SEQUENCE, DB, names, instrumentation)
+    compute_score(SeqRecord(Seq(SEQUENCE)), features, DB, instrumentation)
+    report = instrumentation.to_dict()
+
+    detectors = {item["name"]: item for item in report["detectors"]}
+    assert list(detectors) == ["motif_scan"] + names
+    assert detectors["motif_scan"]["counters"]["promoters"] >= 1
+    assert sum(detectors[name]["features"] for name in names) == len(features)
+    stages = {item["name"] for item in report["scoring"]}
+    assert stages >= {"repeats", "windows", "forbidden_motifs", "assembly"}
+    assert all(item["length"] == len(SEQUENCE) for item in report["detectors"] + report["scoring"])
+    assert len(seen) == len(instrumentation.timings)
+
+
+def test_prepared_sequence_views_match_plain_strings() -> None:
+    from plasmidkit.annotate.detectors import gc_length, homopolymers, repeats
+    from plasmidkit.annotate.detectors.utils import reverse_complement
+    from plasmidkit.annotate.sequence import prepare
+
+    wrapped = SEQUENCE[70:] + SEQUENCE[:70].lower()
+    prepared = prepare(wrapped)
+    assert prepare(prepared) is prepared
+    assert prepared.reverse_complement == reverse_complement(wrapped)
+    assert prepared.circular_view(5) == wrapped.upper() + wrapped[:5].upper()
+    assert prepared.gc_count(10, 40) == sum(base in "GCgc" for base in wrapped[10:40])
+    for module in (gc_length, homopolymers, repeats):
+        assert module.analyse(prepared) == module.analyse(wrapped)
+    names = ["ori", "marker", "promoter", "terminator", "mcs"]
+    assert [f.to_dict() for f in run_detectors(prepared, DB, names)] == [
+        f.to_dict() for f in run_detectors(wrapped, DB, names)
+    ]
+
+
+def test_orf_detect_many_matches_detect() -> None:
+    from plasmidkit.annotate.detectors import orf_prodigal
+    from plasmidkit.annotate.sequence import prepare
+
+    data_dir = Path(__file__).parent / "data"
+    sequences = [
+        "".join(line.strip() for line in p.read_text().splitlines()[1:])
+        for p in sorted(data_dir.glob("*.fasta"))
+    ]
+    db = {"orf_min_aa": 50, "orf_min_nt": 150}
+    expected = [[f.to_dict() for f in orf_prodigal.detect(seq, db)] for seq in sequences]
+    batched = orf_prodigal.detect_many(sequences, db, threads=2)
+    assert [[f.to_dict() for f in features] for features in batched] == expected
+    assert orf_prodigal.get_gene_finder(150, 11) is orf_prodigal.get_gene_finder(150, 11)
+    # Strings and prepared sequences are encoded alike, so a stray character never shifts genes
+    odd = "é" + sequences[0]
+    assert orf_prodigal.detect(odd, db) == orf_prodigal.detect(prepare(odd), db)
+
+
+def test_orf_single_mode_model_is_trained_once(tmp_path: Path) -> None:
+    import warnings
+
+    from plasmidkit.annotate.detectors import orf_prodigal
+    from plasmidkit.cache import manager
+
+    data_dir = Path(__file__).parent / "data"
+    sequences = [
+        "".join(line.strip() for line in p.read_text().splitlines()[1:])
+        for p in sorted(data_dir.glob("*.fasta"))
+    ]
+    previous = manager.get_cache_dir()
+    manager.set_cache_dir(tmp_path)
+    try:
+        db = {"orf_model": {"mode": "single", "training_sequences": sequences * 2}}
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            features = orf_prodigal.detect(sequences[0], db)
+        models = list((tmp_path / "prodigal").glob("*.trn"))
+        assert len(models) == 1
+        assert all(f.evidence["model"] == models[0].stem for f in features)
+        assert orf_prodigal.model_identity(db).startswith(f"{models[0]}:")
+        assert orf_prodigal.model_identity({}) == ""
+        # The model is resolved once per database: no re-hashing of the training set per record
+        calls = []
+        original = orf_prodigal._content_model_name
+        orf_prodigal._content_model_name = lambda *args: calls.append(args) or original(*args)
+        try:
+            orf_prodigal.detect(sequences[1], db)
+        finally:
+            orf_prodigal._content_model_name = original
+        assert calls == []
+        assert list((tmp_path / "prodigal").glob("*.trn")) == models
+
+        # Another cache directory has its own copy of the model, and finders follow it
+        named = {"orf_model": {"mode": "single", "name": models[0].stem}}
+        finder = orf_prodigal.get_gene_finder(150, 11, models[0].stem)
+        manager.set_cache_dir(tmp_path / "other")
+        with pytest.raises(FileNotFoundError):
+            orf_prodigal.detect(sequences[0], named)
+        orf_prodigal.train_model(sequences * 2, name=models[0].stem)
+        assert orf_prodigal._model_for_db(named, 11)[1].parent == tmp_path / "other" / "prodigal"
+        assert orf_prodigal.get_gene_finder(150, 11, models[0].stem) is not finder
+    finally:
+        manager.set_cache_dir(previous)
+
+
+def test_repeats_vectorized_matches_string_counting() -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import repeats
+
+    rng = random.Random(0)
+    for alphabet in ("ACGT", "AT", "ACGTN"):
+        sequence = "".join(rng.choice(alphabet) for _ in range(400))
+        for k in (4, 8, 12):
+            assert repeats.analyse(sequence, k) == repeats._analyse_strings(sequence, k)
+    # Palindromes are reported at their full length, not capped at k
+    palindrome = "TT" + "GAATTCGAATTC" + "CCGG" + "GAATTCGAATTC" + "AA"
+    assert repeats.analyse(palindrome, 12)["longest_palindrome"] == 32.0
+
+
+def test_long_palindromes_match_centre_expansion(monkeypatch: pytest.MonkeyPatch) -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import repeats
+    from plasmidkit.annotate.detectors.utils import reverse_complement
+
+    rng = random.Random(3)
+    arm = "".join(rng.choice("ACGT") for _ in range(90))
+    backbone = "".join(rng.choice("ACGT") for _ in range(600))
+    # A 180 bp palindrome, an (AT)n run where every other centre is open, and a stray N
+    sequence = backbone[:200] + arm + reverse_complement(arm) + backbone[200:400]
+    sequence += "AT" * 60 + "GN" + backbone[400:]
+    assert repeats.analyse(sequence, 12) == repeats._analyse_strings(sequence, 12)
+    assert repeats.analyse(sequence, 12)["longest_palindrome"] >= 180.0
+    # Hand every centre to the suffix-array path after a step or two
+    for steps in (1, 2):
+        monkeypatch.setattr(repeats, "EXPAND_STEPS", steps)
+        for alphabet in ("ACGT", "AT", "ACGTN"):
+            text = "".join(rng.choice(alphabet) for _ in range(300))
+            assert repeats.analyse(text, 1) == repeats._analyse_strings(text, 1)
+        assert repeats.analyse(sequence, 12) == repeats._analyse_strings(sequence, 12)
+
+
+def _brute_repeats(sequence: str) -> tuple:
+    from plasmidkit.annotate.detectors.utils import reverse_complement
+
+    n = len(sequence)
+    doubled = sequence * 2
+    rc_doubled = reverse_complement(sequence) * 2
+    direct = inverted = 0
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                length = 0
+                while length < n and doubled[i + length] == doubled[j + length]:
+                    length += 1
+                direct = max(direct, length)
+            length = 0
+            while length < n and doubled[i + length] == rc_doubled[j + length]:
+                length += 1
+            inverted = max(inverted, length)
+    return float(direct), float(inverted)
+
+
+def test_find_repeats_matches_brute_force_on_circular_sequences() -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import repeats
+    from plasmidkit.annotate.detectors.utils import reverse_complement
+
+    rng = random.Random(1)
+    for _ in range(100):
+        sequence = "".join(rng.choice("ACGT") for _ in range(rng.randint(2, 40)))
+        result = repeats.find_repeats(sequence, min_length=4)
+        expected = _brute_repeats(sequence)
+        assert (result["longest_direct_repeat"], result["longest_inverted_repeat"]) == expected
+        tripled = sequence * 3
+        for repeat in result["repeats"]:
+            first, second = repeat["positions"]
+            left = tripled[first : first + repeat["length"]]
+            right = tripled[second : second + repeat["length"]]
+            assert left == (right if repeat["type"] == "direct" else reverse_complement(right))
+
+    backbone = "".join(rng.choice("ACGT") for _ in range(3000))
+    cassette = backbone[200:700]
+    # One copy of the cassette straddles the origin; another block also appears inverted
+    sequence = (
+        cassette[250:]
+        + backbone[800:1500]
+        + cassette
+        + reverse_complement(backbone[2000:2300])
+        + backbone[1500:]
+        + cassette[:250]
+    )
+    result = repeats.find_repeats(sequence, min_length=100)
+    assert result["longest_direct_repeat"] >= 500
+    assert result["longest_inverted_repeat"] >= 300
+    assert {r["type"] for r in result["repeats"]} == {"direct", "inverted"}
+
+
+def test_window_metrics_match_naive_slicing() -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import windows
+
+    rng = random.Random(2)
+    sequence = "".join(rng.choice("ACGT") for _ in range(300)) + "A" * 30 + "GC" * 40
+    result = windows.analyse(sequence, window=20, worst=3)
+    doubled = sequence + sequence
+    naive = [sum(base in "GC" for base in doubled[i : i + 20]) / 20 for i in range(len(sequence))]
+    assert result["gc_min"] == round(min(naive), 4)
+    assert result["gc_max"] == round(max(naive), 4)
+    worst = result["worst_gc"][0]
+    assert worst["gc"] == round(naive[worst["start"]], 4)
+    assert abs(worst["gc"] - 0.5) == max(abs(value - 0.5) for value in naive)
+    starts = [w["start"] for w in result["worst_gc"]]
+    assert all(abs(a - b) >= 20 for a in starts for b in starts if a != b)
+    assert result["homopolymer_max"] == 1.0 and result["homopolymer_regions"] == 1
+    assert result["repeat_max"] == 1.0 and result["repeat_regions"] >= 1
+
+
+def test_circular_window_masks_wrap_across_the_origin() -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import windows
+    from plasmidkit.annotate.sequence import prepare
+
+    def run_length(text: str, i: int) -> int:
+        n, length = len(text), 1
+        while length < n and text[(i - length) % n] == text[i]:
+            length += 1
+        ahead = 1
+        while length < n and text[(i + ahead) % n] == text[i]:
+            length, ahead = length + 1, ahead + 1
+        return length
+
+    def repeat_covered(text: str, k: int, window: int) -> list:
+        n = len(text)
+        kmer = [(text + text)[p : p + k] for p in range(n)]
+        covered = [False] * n
+        for p in range(n):
+            if any(base not in "ACGT" for base in kmer[p]):
+                continue
+            near = [q for q in range(n) if q != p and min((q - p) % n, (p - q) % n) < window]
+            if any(kmer[q] == kmer[p] for q in near):
+                for j in range(p, p + k):
+                    covered[j % n] = True
+        return covered
+
+    rng = random.Random(5)
+    for _ in range(40):
+        motif = "".join(rng.choice("ACGT") for _ in range(10))
+        core = "".join(rng.choice("ACGTN") for _ in range(rng.randint(30, 80)))
+        # A homopolymer split across the origin and a repeat straddling it
+        text = "AA" + motif[5:] + core + motif + rng.choice(["", "T"]) + motif[:5] + "AA"
+        prepared = prepare(text)
+        homopolymer = windows._homopolymer_bases(prepared.array, 4, circular=True)
+        assert homopolymer.tolist() == [run_length(text, i) >= 4 for i in range(len(text))]
+        repeat = windows._local_repeat_bases(prepared.codes, 8, 20, circular=True)
+        assert repeat.tolist() == repeat_covered(text, 8, 20)
+        # Circular results do not depend on where the sequence is opened
+        shift = rng.randrange(len(text))
+        keys = ["gc_regions", "homopolymer_max", "homopolymer_regions"]
+        keys += ["repeat_max", "repeat_regions"]
+        whole = windows.analyse(text, window=20)
+        rotated = windows.analyse(text[shift:] + text[:shift], window=20)
+        assert [whole[key] for key in keys] == [rotated[key] for key in keys]
+
+
+def test_incremental_edits_match_full_annotation() -> None:
+    import random
+
+    from plasmidkit.annotate.incremental import Edit, annotate_state, apply_edit
+
+    names = ["ori", "marker", "promoter", "terminator", "mcs"]
+    rng = random.Random(0)
+    state = annotate_state(SEQUENCE, DB, names)
+    # Insert at the origin, delete the last bases, replace a promoter with another copy
+    edits = [Edit(0, 0, "GAATTC"), Edit(len(SEQUENCE) + 3, 3), Edit(40, 20, "TTGACAGCTAGCTCAGTCC")]
+    for step in range(len(edits) + 40):
+        if step < len(edits):
+            edit = edits[step]
+        else:
+            position = rng.randint(0, len(state.sequence))
+            deleted = rng.randint(0, min(8, len(state.sequence) - position))
+            inserted = "".join(rng.choice("ACGT") for _ in range(rng.randint(0, 8)))
+            edit = Edit(position, deleted, inserted)
+        state = apply_edit(state, edit)
+        full = annotate_state(state.sequence, DB, names)
+        assert state.hits == full.hits
+        assert [f.to_dict() for f in state.features] == [f.to_dict() for f in full.features]
+
+
+def test_incremental_edit_shifts_orfs_it_cannot_affect() -> None:
+    import plasmidkit as pk
+
+    state = pk.annotate_incremental(Path(__file__).parent / "data" / "pUC19.fasta")
+    # Downstream of both predicted ORFs, in a region without a long open frame
+    updated = pk.reannotate(state, pk.Edit(2200, 0, "GGATCC"))
+    assert not updated.orfs_recomputed
+    full = pk.annotate_incremental(updated.sequence.text, is_sequence=True)
+    assert [f.to_dict() for f in updated.features] == [f.to_dict() for f in full.features]
+    assert pk.reannotate(state, pk.Edit(700, 3)).orfs_recomputed
+
+
+def test_edit_distance_sections_tolerate_indels() -> None:
+    from plasmidkit.annotate.detectors.utils import find_motifs_edit_tagged
+    from plasmidkit.annotate.incremental import Edit, annotate_state, apply_edit
+
+    motif = DB["ori"][0]["motifs"][0]
+    # Drop one base of the ori motif: no Hamming alignment survives the frame shift
+    deleted = SEQUENCE.replace(motif, motif[:9] + motif[10:])
+    assert "toy_ori" not in {f.id for f in run_detectors(deleted, DB, ["ori"])}
+    edit_db = dict(DB, edit_distance={"ori": 1, "markers": 2})
+    (ori,) = [f for f in run_detectors(deleted, edit_db, ["ori"]) if f.id == "toy_ori"]
+    start = deleted.index(motif[:9])
+    assert (ori.start, ori.end) == (start, start + len(motif) - 1)
+    assert ori.evidence["edit_distance"] == 1 and ori.evidence["cigar"] == "9=1I9="
+
+    (hit,) = find_motifs_edit_tagged(deleted, [motif], max_edits=1)
+    hit_start, hit_end, _motif, strand, distance, cigar = hit
+    assert (hit_start, hit_end, strand, distance, cigar) == (start, ori.end, "+", 1, "9=1I9=")
+    # Exact occurrences are unchanged by the edit-distance mode
+    names = ["ori", "marker", "promoter", "terminator", "mcs"]
+    exact = [f.to_dict() for f in run_detectors(SEQUENCE, DB, names)]
+    with_edits = [f.to_dict() for f in run_detectors(SEQUENCE, edit_db, names)]
+    exact_spans = [(f["id"], f["start"], f["end"]) for f in exact]
+    assert [(f["id"], f["start"], f["end"]) for f in with_edits] == exact_spans
+
+    state = annotate_state(deleted, edit_db, names)
+    for edit in (Edit(start + 4, 0, "T"), Edit(start + 12, 2), Edit(0, 0, "ACGTACGT")):
+        state = apply_edit(state, edit)
+        full = annotate_state(state.sequence, edit_db, names)
+        assert state.hits == full.hits
+        assert [f.to_dict() for f in state.features] == [f.to_dict() for f in full.features]
+
+
+def test_reference_detector_finds_full_length_features() -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import kmers, reference
+    from plasmidkit.annotate.detectors.utils import reverse_complement
+
+    rng = random.Random(5)
+
+    def rand(length: int) -> str:
+        return "".join(rng.choice("ACGT") for _ in range(length))
+
+    def diverge(seq: str, rate: float) -> str:
+        # Random substitutions, plus one insertion and one deletion
+        out = [
+            rng.choice("ACGT".replace(base, "")) if rng.random() < rate else base for base in seq
+        ]
+        out[len(out) // 3] += "A"
+        del out[2 * len(out) // 3]
+        return "".join(out)
+
+    marker, ori = rand(600), rand(300)
+    db = {
+        "markers": [{"id": "toy_gene", "motifs": [marker[:20]], "sequence": marker}],
+        "ori": [
+            {"id": "toy_ori", "motifs": [ori[:20]], "sequence": ori},
+            {"id": "too_short", "sequence": ori[:40]},
+        ],
+    }
+    mutated_marker = diverge(marker, 0.04)
+    background = rand(2000)
+    # Marker on the reverse strand, ori across the origin
+    plasmid = (
+        ori[150:]
+        + background[:700]
+        + reverse_complement(mutated_marker)
+        + background[700:]
+        + ori[:150]
+    )
+    features = run_detectors(plasmid, db, ["reference"])
+    assert [(f.id, f.type, f.strand) for f in features] == [
+        ("toy_gene", "marker", "-"),
+        ("toy_ori", "rep_origin", "+"),
+    ]
+    marker_feature, ori_feature = features
+    assert (ori_feature.start, ori_feature.end) == (len(plasmid) - 150, len(plasmid) + 150)
+    assert ori_feature.evidence["pct_identity"] == 100.0
+    start = 150 + 700
+    assert (marker_feature.start, marker_feature.end) == (start, start + len(mutated_marker))
+    assert 0 < marker_feature.evidence["edit_distance"] <= 0.1 * len(marker)
+    identity = 1 - marker_feature.evidence["edit_distance"] / len(marker)
+    assert marker_feature.confidence == round(identity, 4)
+
+    # Too divergent for the default 90%, found once the database lowers the bar
+    distant = background + diverge(marker, 0.14)
+    assert run_detectors(distant, db, ["reference"]) == []
+    relaxed = dict(db, reference_min_identity=0.8)
+    assert [f.id for f in run_detectors(distant, relaxed, ["reference"])] == ["toy_gene"]
+
+    # Exactly at the threshold: 20 substitutions in 200 bp is 90.0% identity
+    assert reference.edit_budget(200, 0.9) == 20
+    short = marker[:200]
+    sites = sorted(rng.sample(range(10, 190), 21))
+    edge_db = {"markers": [{"id": "edge", "sequence": short}]}
+    for substitutions, expected in ((20, [("edge", 90.0)]), (21, [])):
+        changed = set(sites[:substitutions])
+        copy = "".join(
+            rng.choice("ACGT".replace(b, "")) if i in changed else b for i, b in enumerate(short)
+        )
+        embedded = background[:500] + copy + background[500:1000]
+        features = run_detectors(embedded, edge_db, ["reference"])
+        assert [(f.id, f.evidence["pct_identity"]) for f in features] == expected
+
+    positions, hashes, is_rev = kmers.minimizers(kmers.encode(marker), reference.K, reference.W)
+    rc_marker = kmers.encode(reverse_complement(marker))
+    rc_positions, rc_hashes, rc_rev = kmers.minimizers(rc_marker, reference.K, reference.W)
+    assert sorted(hashes.tolist()) == sorted(rc_hashes.tolist())
+    assert (is_rev != rc_rev[::-1]).all()
+
+
+def test_batch_hamming_verification_matches_brute_force(monkeypatch: pytest.MonkeyPatch) -> None:
+    import random
+
+    from plasmidkit.annotate.detectors import motif_index
+    from plasmidkit.annotate.detectors.motif_index import CompiledMotifs
+    from plasmidkit.annotate.detectors.utils import reverse_complement
+
+    rng = random.Random(9)
+    # Two-letter motifs and sequence: thousands of seed candidates, many from several seeds
+    motifs = ["".join(rng.choice("AT") for _ in range(rng.randint(24, 36))) for _ in range(12)]
+    parts = []
+    for _ in range(30):
+        # Planted copies with up to three substitutions, on either strand
+        copy = list(rng.choice(motifs))
+        for _ in range(rng.randint(0, 3)):
+            copy[rng.randrange(len(copy))] = rng.choice("ACGT")
+        planted = "".join(copy)
+        parts.append("".join(rng.choice("AAATTTC") for _ in range(rng.randint(0, 60))))
+        parts.append(planted if rng.random() < 0.5 else reverse_complement(planted))
+    sequence = "".join(parts)
+    sequence = sequence[15:] + sequence[:15]
+    compiled = CompiledMotifs([motifs[:6], motifs[6:]], max_mismatches=2)
+    space = sequence + sequence[:40]
+    expected = set()
+    for entry_idx, group in enumerate((motifs[:6], motifs[6:])):
+        for motif in dict.fromkeys(group):
+            for strand, pattern in (("+", motif), ("-", reverse_complement(motif))):
+                for start in range(len(sequence)):
+                    window = space[start : start + len(pattern)]
+                    mismatches = sum(a != b for a, b in zip(window, pattern))
+                    if mismatches <= 2:
+                        expected.add((entry_idx, start, motif, strand, mismatches))
+    hits = compiled.search(sequence)
+    assert len(expected) > 20 and len(hits) == len(expected) and set(hits) == expected
+    assert hits == sorted(hits, key=lambda h: (h[4], -len(h[2]), h[1]))
+
+    # Tiny batches, and a long motif that must not widen the short motifs' windows
+    monkeypatch.setattr(motif_index, "VERIFY_CELLS", 100)
+    long_motif = sequence[100:700]
+    compiled = CompiledMotifs([motifs[:6], motifs[6:] + [long_motif]], max_mismatches=2)
+    hits = compiled.search(sequence)
+    assert set(hits) == expected | {(1, 100, long_motif, "+", 0)}
+
+
+def test_edit_distance_search_recalls_planted_copies() -> None:
+    import random
+
+    import edlib
+
+    from plasmidkit.annotate.detectors.utils import find_motifs_edit_tagged, reverse_complement
+
+    rng = random.Random(12)
+
+    def rand(length: int) -> str:
+        return "".join(rng.choice("ACGT") for _ in range(length))
+
+    # Motifs too short for MIN_SEED_LEN seeds at these edit budgets
+    for max_edits, length in ((2, 12), (2, 16), (2, 20), (3, 16), (3, 20), (3, 24)):
+        motifs = [rand(length) for _ in range(4)]
+        parts, planted = [], []
+        offset = 0
+        for _ in range(40):
+            motif = rng.choice(motifs)
+            copy = list(motif)
+            for _ in range(rng.randint(0, max_edits)):
+                i, kind = rng.randrange(len(copy)), rng.choice("sid")
+                if kind == "s":
+                    copy[i] = rng.choice("ACGT")
+                elif kind == "i":
+                    copy.insert(i, rng.choice("ACGT"))
+                elif len(copy) > 1:
+                    del copy[i]
+            strand = rng.choice("+-")
+            text = "".join(copy) if strand == "+" else reverse_complement("".join(copy))
+            gap = rand(rng.randint(20, 60))
+            parts += [gap, text]
+            offset += len(gap)
+            planted.append((motif, strand, offset, offset + len(text)))
+            offset += len(text)
+        sequence = "".join(parts) + rand(30)
+        hits = find_motifs_edit_tagged(sequence, motifs, max_edits=max_edits, circular=False)
+        checked = 0
+        for motif, strand, start, end in planted:
+            pattern = motif if strand == "+" else reverse_complement(motif)
+            lo = max(0, start - max_edits)
+            best = edlib.align(pattern, sequence[lo : end + max_edits], mode="HW")["editDistance"]
+            if best > max_edits:
+                continue
+            checked += 1
+            assert any(
+                h[2] == motif and h[3] == strand and h[0] < end and h[1] > start and h[4] <= best
+                for h in hits
+            ), (max_edits, length, motif, strand, start)
+        assert checked > 30
+
+
+def test_feature_index_queries_match_brute_force() -> None:
+    import random
+
+    from plasmidkit import FeatureIndex
+    from plasmidkit.annotate.intervals import DisjointIntervals
+    from plasmidkit.annotate.types import Feature
+
+    rng = random.Random(4)
+    features = []
+    for i in range(300):
+        start = rng.randint(0, 5000)
+        end = start + rng.choice([rng.randint(1, 30), rng.randint(100, 1500)])
+        kind = rng.choice(["promoter", "CDS", "terminator"])
+        features.append(Feature(type=kind, id=str(i), start=start, end=end))
+    index = FeatureIndex(features)
+    by_start = sorted(features, key=lambda f: (f.start, f.end))
+    terminators = [f for f in features if f.type == "terminator"]
+
+    def distance(feature: Feature, position: int) -> int:
+        if feature.start <= position < feature.end:
+            return 0
+        return max(feature.start - position, position - feature.end)
+
+    for _ in range(200):
+        start = rng.randint(-100, 5200)
+        end = start + rng.randint(1, 300)
+        expected = [f.id for f in by_start if f.start < end and f.end > start]
+        assert [f.id for f in index.overlapping(start, end)] == expected
+        position = rng.randint(-100, 5200)
+        nearest = index.nearest(position, "terminator")
+        assert nearest.type == "terminator"
+        assert distance(nearest, position) == min(distance(f, position) for f in terminators)
+    assert [f.id for f in index.of_type("CDS")] == [f.id for f in by_start if f.type == "CDS"]
+    assert index.nearest(0, "rep_origin") is None
+
+    occupied = DisjointIntervals()
+    kept = []
+    for _ in range(500):
+        start = rng.randint(0, 5000)
+        end = start + rng.randint(1, 40)
+        assert occupied.overlaps(start, end) == any(s < end and start < e for s, e in kept)
+        if not occupied.overlaps(start, end):
+            occupied.add(start, end)
+            kept.append((start, end))
+    assert list(occupied) == sorted(kept)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from Bio.Seq import Seq  # noqa: E402
+from Bio.SeqRecord import SeqRecord  # noqa: E402
+
+from plasmidkit.scoring import rules  # noqa: E402
+from plasmidkit.scoring.calculator import compute_score  # noqa: E402
+
+DB = {
+    "forbidden_motifs": [
+        {"id": "BsaI", "sequence": "GGTCTC"},
+        {"id": "EcoRI", "sequence": "GAATTC"},
+        {"id": "polyA", "sequence": "AAAAA"},
+    ]
+}
+
+
+def test_forbidden_sites_cover_both_strands_and_the_origin() -> None:
+    # BsaI forward and as its reverse complement (GAGACC); EcoRI split across the origin
+    sequence = "ATTC" + "CCCC" + "GGTCTC" + "CCCC" + "GAGACC" + "CCCC" + "AAAAAA" + "CCCC" + "GA"
+    sites = rules.forbidden_sites(sequence, DB)
+    assert sites == {"BsaI": [8, 18], "EcoRI": [38], "polyA": [28, 29]}
+    # Each distinct site is penalised, not just non-overlapping forward hits
+    penalties = rules._forbidden_penalty(sequence, DB)
+    assert (penalties["BsaI"], penalties["EcoRI"], penalties["polyA"]) == (-2.0, -1.0, -2.0)
+    # The score report carries the positions behind those penalties
+    report = compute_score(SeqRecord(Seq(sequence)), [], DB)
+    assert report["forbidden_sites"] == sites
+    assert report["components"]["BsaI"] == -2.0
+
+
+def test_palindromic_forbidden_site_counts_once() -> None:
+    sites = rules.forbidden_sites("CCCCGAATTCCCCC", DB)
+    assert sites == {"EcoRI": [4]}
+    penalties = rules._forbidden_penalty("CCCCGAATTCCCCC", DB)
+    assert penalties["EcoRI"] == -1.0
+
+
+def test_local_windows_feed_score_components() -> None:
+    balanced = "ACGTTGCA" * 50
+    skewed = balanced + "AT" * 40 + balanced
+    components = rules.synthesise_components(SeqRecord(Seq(skewed)), [], DB)
+    assert components["local_gc"] == -1.0
+    assert rules.synthesise_components(SeqRecord(Seq(balanced)), [], DB)["local_gc"] == 0.0
+    # A one-third GC stretch passes the default limits but not stricter DB ones
+    mild = SeqRecord(Seq(balanced + "AACGTT" * 15 + balanced))
+    strict = dict(DB, synthesis_window={"size": 50, "gc_min": 0.45, "gc_max": 0.55})
+    assert rules.synthesise_components(mild, [], DB)["local_gc"] == 0.0
+    assert rules.synthesise_components(mild, [], strict)["local_gc"] < 0.0
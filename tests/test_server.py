@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import http.client
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from plasmidkit import api, server  # noqa: E402
+
+
+def _call(base: str, path: str, payload: object = None):
+    data = None if payload is None else json.dumps(payload).encode("utf8")
+    request = urllib.request.Request(base + path, data=data)
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def test_server_endpoints_match_api() -> None:
+    httpd = server.PlasmidKitServer(("127.0.0.1", 0), jobs=1, queue_size=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        assert _call(base, "/health")["status"] == "ok"
+        sequence = "GAATTCAAGCTTGGATCC" * 20
+        expected = api.annotate_and_score(sequence, is_sequence=True)
+        assert _call(base, "/score", {"sequence": sequence, "id": "sequence"}) == expected
+        fasta = f">one\n{sequence}\n>two\n{sequence[::-1]}\n"
+        batch = _call(base, "/batch", {"record": fasta, "score": False, "detectors": ["mcs"]})
+        assert [result["sequence_id"] for result in batch["results"]] == ["one", "two"]
+        assert "score" not in batch["results"][0]
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _call(base, "/annotate", {"record": fasta})
+        assert error.value.code == 400
+        metrics = _call(base, "/metrics")
+        assert metrics["endpoints"]["batch"]["records"] == 2
+        assert metrics["endpoints"]["annotate"]["errors"] == 1
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_server_rejects_bad_content_length() -> None:
+    httpd = server.PlasmidKitServer(("127.0.0.1", 0), jobs=1, queue_size=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    port = httpd.server_address[1]
+    try:
+        for header, status in (("abc", 400), ("-1", 400), (None, 411)):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            connection.putrequest("POST", "/score")
+            if header is not None:
+                connection.putheader("Content-Length", header)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == status
+            assert "error" in json.loads(response.read())
+            connection.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_server_counts_records_against_capacity() -> None:
+    import time
+    from concurrent.futures import TimeoutError as FutureTimeout
+
+    httpd = server.PlasmidKitServer(("127.0.0.1", 0), jobs=1, queue_size=1, timeout=0.2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    sequence = "GAATTCAAGCTTGGATCC" * 20
+    fasta = f">one\n{sequence}\n>two\n{sequence}\n"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _call(base, "/batch", {"records": [sequence] * 3, "detectors": ["mcs"]})
+        assert error.value.code == 400
+
+        # A timed-out job keeps its slot until it really finishes on the worker
+        with pytest.raises(FutureTimeout):
+            httpd.run([(time.sleep, 1.5)])
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _call(base, "/batch", {"record": fasta, "detectors": ["mcs"]})
+        assert error.value.code == 503
+        assert error.value.headers["Retry-After"] == "1"
+
+        # Once full, requests are turned away before their body is read
+        with pytest.raises(FutureTimeout):
+            httpd.run([(time.sleep, 1.5)])
+        connection = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=10)
+        connection.putrequest("POST", "/score")
+        connection.putheader("Content-Length", "1000")
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 503
+        assert response.getheader("Connection") == "close"
+        connection.close()
+
+        deadline = time.monotonic() + 10
+        while httpd._pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+        httpd.request_timeout = 30
+        batch = _call(base, "/batch", {"record": fasta, "score": False, "detectors": ["mcs"]})
+        assert len(batch["results"]) == 2
+        assert _call(base, "/metrics")["rejected"] == 2
+    finally:
+        httpd.shutdown()
+        httpd.server_close()